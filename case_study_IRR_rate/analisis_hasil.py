@@ -1,4 +1,25 @@
+"""
+Analisis Hasil Kalkulator Pensiun (PPIP) dari Spreadsheet Vertex42.
+
+Mode interaktif (default): asumsi dan hasil Excel diketik satu per satu.
+Mode batch: banyak skenario dibaca dari file CSV/Excel, faktor anuitas
+dihitung sendiri dari tabel mortalita, dan IRR semua skenario dihitung
+sekaligus:
+
+    python analisis_hasil.py --batch skenario_contoh.csv --output hasil.csv
+
+Kolom wajib  : gaji_awal, usia_awal, usia_pensiun, kenaikan_gaji (%), balance
+Kolom opsional: gender ('m'/'f', default m), tabel (default tmi_4),
+               imbal_hasil (% untuk faktor anuitas, default 6),
+               faktor_anuitas (jika diisi, dipakai apa adanya)
+"""
+
+import argparse
 import math
+import sys
+from pathlib import Path
+
+KOLOM_WAJIB = ["gaji_awal", "usia_awal", "usia_pensiun", "kenaikan_gaji", "balance"]
 
 def dapatkan_input_integer(prompt):
     """Fungsi helper untuk meminta input ANGKA BULAT (menghapus titik/koma)."""
@@ -101,5 +122,97 @@ def main():
     print("=" * 50)
     print("Analisis Selesai.")
 
+# ==============================================================================
+# MODE BATCH
+# ==============================================================================
+
+def baca_skenario(path):
+    """Membaca file skenario (.csv atau .xlsx) dan memeriksa kolom wajib."""
+    import pandas as pd
+
+    path = Path(path)
+    if path.suffix.lower() in (".xlsx", ".xls"):
+        df = pd.read_excel(path)
+    else:
+        df = pd.read_csv(path)
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    kurang = [k for k in KOLOM_WAJIB if k not in df.columns]
+    if kurang:
+        raise ValueError(f"Kolom wajib tidak ditemukan di {path.name}: {', '.join(kurang)}")
+    return df
+
+
+def hitung_irr_batch(df, tabel_default="tmi_4", imbal_hasil_default=6.0):
+    """
+    Menghitung IRR semua skenario dalam satu kali jalan (tanpa loop per baris).
+
+    Persentase (kenaikan_gaji, imbal_hasil) ditulis seperti pada mode interaktif
+    (6 = 6%). Mengembalikan salinan DataFrame dengan kolom hasil tambahan.
+    """
+    from pensiun.inverse import balance_replacement_ratio
+
+    def kolom(nama, default):
+        return df[nama].fillna(default).to_numpy() if nama in df else [default] * len(df)
+
+    faktor = df["faktor_anuitas"].to_numpy(dtype=float) if "faktor_anuitas" in df else None
+
+    hasil = balance_replacement_ratio(
+        balance=df["balance"].to_numpy(dtype=float),
+        start_wage=df["gaji_awal"].to_numpy(dtype=float),
+        start_age=df["usia_awal"].to_numpy(dtype=int),
+        retirement_age=df["usia_pensiun"].to_numpy(dtype=int),
+        salary_increase_rate=df["kenaikan_gaji"].to_numpy(dtype=float) / 100,
+        annuity_factor=faktor,
+        annuity_rate=[float(v) / 100 for v in kolom("imbal_hasil", imbal_hasil_default)],
+        gender=[str(v).strip().lower() for v in kolom("gender", "m")],
+        table=[str(v).strip() for v in kolom("tabel", tabel_default)],
+    )
+
+    keluaran = df.copy()
+    keluaran["gaji_terakhir"] = hasil["final_wage"]
+    keluaran["faktor_anuitas"] = hasil["annuity_factor"]
+    keluaran["manfaat_bulanan"] = hasil["monthly_pension"]
+    keluaran["irr_persen"] = hasil["replacement_ratio"] * 100
+    return keluaran
+
+
+def main_batch(path, output=None, tabel="tmi_4", imbal_hasil=6.0):
+    df = baca_skenario(path)
+    hasil = hitung_irr_batch(df, tabel, imbal_hasil)
+
+    print("=" * 78)
+    print(f"ANALISIS HASIL BATCH: {len(hasil)} skenario dari {Path(path).name}")
+    print("=" * 78)
+    print(f"{'#':>4} | {'Usia':>7} | {'Gaji Terakhir':>15} | {'Balance':>17} | {'ä_x':>8} | {'IRR':>7}")
+    print("-" * 78)
+    for no, baris in enumerate(hasil.itertuples(index=False), start=1):
+        print(f"{no:>4} | {baris.usia_awal:>3}-{baris.usia_pensiun:<3} | {baris.gaji_terakhir:>15,.0f} | "
+              f"{baris.balance:>17,.0f} | {baris.faktor_anuitas:>8.4f} | {baris.irr_persen:>6.2f}%")
+    print("-" * 78)
+    print(f"Skenario di bawah 40% : {(hasil['irr_persen'] < 40).sum()} dari {len(hasil)}")
+
+    if output:
+        hasil.to_csv(output, index=False)
+        print(f"✅ Hasil disimpan ke {output}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Analisis IRR dari hasil spreadsheet Vertex42.")
+    parser.add_argument("--batch", help="File skenario .csv/.xlsx (tanpa ini: mode interaktif)")
+    parser.add_argument("--output", help="Simpan hasil batch ke file CSV")
+    parser.add_argument("--tabel", default="tmi_4", help="Tabel mortalita default (tmi_4, gam_71, gam_83)")
+    parser.add_argument("--imbal-hasil", type=float, default=6.0,
+                        help="Bunga faktor anuitas default dalam persen (misal: 6)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    if args.batch:
+        try:
+            main_batch(args.batch, args.output, args.tabel, args.imbal_hasil)
+        except (KeyError, ValueError, FileNotFoundError) as e:
+            print(f"❌ GAGAL: {e}")
+            sys.exit(1)
+    else:
+        main()
\ No newline at end of file
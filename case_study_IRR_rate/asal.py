@@ -7,7 +7,6 @@ Projected Unit Credit (PUC).
 """
 
 import pandas as pd
-import numpy_financial as npf
 
 # ==============================================================================
 # ASUMSI UTAMA - HARAP DISESUAIKAN DENGAN PROYEK BARU ANDA
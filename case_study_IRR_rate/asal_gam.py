@@ -6,7 +6,6 @@ GAM 71 Male & Female, sesuai asumsi di Slide 15.
 """
 
 import pandas as pd
-import numpy_financial as npf
 
 # ==============================================================================
 # ASUMSI UTAMA - HARAP DISESUAIKAN DENGAN PROYEK BARU ANDA
@@ -8,8 +8,11 @@ Skrip ini menghitung iuran bulanan DPLK yang diperlukan untuk mencapai target
 IRR dengan memperhitungkan manfaat dari JHT, Uang Pesangon (UUCK), dan JP.
 """
 
+import sys
+
 import pandas as pd
-import numpy_financial as npf
+
+from pensiun import finmath
 
 # ==============================================================================
 # TAHAP 1: INISIALISASI & ASUMSI
@@ -41,17 +44,17 @@ imbal_hasil_bulanan = (1 + imbal_hasil_investasi_pa)**(1 / 12) - 1
 # ==============================================================================
 # TAHAP 2: MEMUAT DATA MORTALITA
 # ==============================================================================
-try:
-    nama_file_mortalita = f'data/tmi_4_{gender}.csv'
+def muat_tabel_mortalita(gender_char):
+    """
+    Memuat tabel mortalita TMI 4 sesuai gender.
+
+    Dipanggil saat skrip dijalankan (bukan saat di-import) sehingga fungsi-fungsi
+    di bawah bisa di-import dari modul lain tanpa efek samping.
+    """
+    nama_file_mortalita = f'data/tmi_4_{gender_char}.csv'
     tabel_mortalita = pd.read_csv(nama_file_mortalita)
     tabel_mortalita.set_index('usia', inplace=True)
-    print(f"✅ Berhasil memuat tabel mortalita: {nama_file_mortalita}")
-except FileNotFoundError:
-    print(f"❌ GAGAL: File {nama_file_mortalita} tidak ditemukan.")
-    exit()
-except KeyError:
-    print(f"❌ GAGAL: Kolom 'usia' tidak ditemukan di {nama_file_mortalita}.")
-    exit()
+    return tabel_mortalita
 
 
 # ==============================================================================
@@ -60,7 +63,7 @@ except KeyError:
 
 def hitung_gaji_akhir(gaji_awal, kenaikan_pa, tahun):
     """Menghitung proyeksi gaji di akhir masa kerja."""
-    return npf.fv(kenaikan_pa, tahun, 0, -gaji_awal)
+    return finmath.fv(kenaikan_pa, tahun, 0, -gaji_awal)
 
 
 def hitung_akumulasi_jht(gaji_awal, kenaikan_gaji, imbal_hasil, masa_kerja_thn, iuran_rate):
@@ -176,6 +179,17 @@ def hitung_pv_manfaat_jp(gaji_akhir_bln, tabel_mortalita_df):
 # TAHAP 4: EKSEKUSI PERHITUNGAN UTAMA
 # ==============================================================================
 if __name__ == "__main__":
+    nama_file_mortalita = f'data/tmi_4_{gender}.csv'
+    try:
+        tabel_mortalita = muat_tabel_mortalita(gender)
+        print(f"✅ Berhasil memuat tabel mortalita: {nama_file_mortalita}")
+    except FileNotFoundError:
+        print(f"❌ GAGAL: File {nama_file_mortalita} tidak ditemukan.")
+        sys.exit(1)
+    except KeyError:
+        print(f"❌ GAGAL: Kolom 'usia' tidak ditemukan di {nama_file_mortalita}.")
+        sys.exit(1)
+
     print("\n--- KALKULATOR PENSIUN TERBARU---")
 
     # 1. Hitung Gaji Akhir & Target Pensiun
@@ -231,7 +245,7 @@ if __name__ == "__main__":
         # 5. Hitung Kebutuhan Dana DPLK dan Iuran Bulanannya
         kebutuhan_dana_dplk_lump_sum = gap_pensiun_bulanan * faktor_anuitas_55 * 12
         
-        iuran_dplk_bulanan = -npf.pmt(
+        iuran_dplk_bulanan = -finmath.pmt(
             rate=imbal_hasil_bulanan,
             nper=masa_kerja * 12,
             pv=0,
@@ -1,8 +1,9 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 
+from pensiun.valuation import asset_projection
+
 # --- CONFIG ---
 st.set_page_config(page_title="Forensik Aktuaria Dana Pensiun", layout="wide")
 
@@ -27,51 +28,30 @@ st.sidebar.caption(f"Iuran: 3% | Diskon: 5.7% | Survivor: 50%")
 
 # --- CALCULATION LOGIC ---
 def calculate_projection(start_w, s, i, n):
-    data = []
-    curr_w = start_w
-    accum_asset = 0
-    
-    contribution_rate = 0.03
-    
-    for t in range(1, n + 1):
-        # 1. Iuran tahun ini
-        cont = curr_w * 12 * contribution_rate
-        
-        # 2. Pengembangan Aset
-        accum_asset = (accum_asset + cont) * (1 + i)
-        
-        data.append({
-            "Tahun": t,
-            "Gaji Bulanan": curr_w,
-            "Total Aset": accum_asset
-        })
-        
-        # Gaji naik tahun depan
-        curr_w *= (1 + s)
-        
-    return pd.DataFrame(data)
+    # Structured array (year, wage, contribution, asset): tanpa list dict / DataFrame per tahun
+    return asset_projection(start_w, n, s, i, contribution_rate=0.03)
 
 # Run Calc
-df = calculate_projection(start_wage, s_rate, i_rate, years)
+proj = calculate_projection(start_wage, s_rate, i_rate, years)
 
 # Liabilitas Logic (Approximate to match the 561M Target)
 # Kita gunakan annuity factor implisit dari hasil reverse engineering sebelumnya
-avg_wage = df["Gaji Bulanan"].mean()
+avg_wage = proj["wage"].mean()
 annual_benefit = 0.01 * years * avg_wage * 12
 implied_annuity_factor = 14.32 # Kalibrasi hasil reverse engineer
 total_liability = annual_benefit * implied_annuity_factor
 
-gap = df["Total Aset"].iloc[-1] - total_liability
+gap = proj["asset"][-1] - total_liability
 
 # --- DASHBOARD LAYOUT ---
 
 # 1. Metrics Row
 col1, col2, col3, col4 = st.columns(4)
 with col1:
-    st.metric("Gaji Akhir (Nominal)", f"Rp {df['Gaji Bulanan'].iloc[-1]:,.0f}", 
-              delta=f"{df['Gaji Bulanan'].iloc[-1]/start_wage:.1f}x Lipat")
+    st.metric("Gaji Akhir (Nominal)", f"Rp {proj['wage'][-1]:,.0f}", 
+              delta=f"{proj['wage'][-1]/start_wage:.1f}x Lipat")
 with col2:
-    st.metric("Total Aset (Tabungan)", f"Rp {df['Total Aset'].iloc[-1]:,.0f}")
+    st.metric("Total Aset (Tabungan)", f"Rp {proj['asset'][-1]:,.0f}")
 with col3:
     st.metric("Total Liabilitas (Janji)", f"Rp {total_liability:,.0f}", 
               help="Dihitung menggunakan asumsi Joint Life Reversionary 50%")
@@ -91,14 +71,14 @@ with c1:
     
     # Plot Gaji (Left Axis)
     fig.add_trace(go.Scatter(
-        x=df["Tahun"], y=df["Gaji Bulanan"],
+        x=proj["year"], y=proj["wage"],
         name="Gaji Bulanan (Nominal)",
         line=dict(color='firebrick', width=3)
     ))
     
     # Plot Aset (Right Axis)
     fig.add_trace(go.Scatter(
-        x=df["Tahun"], y=df["Total Aset"],
+        x=proj["year"], y=proj["asset"],
         name="Akumulasi Aset",
         line=dict(color='royalblue', width=3, dash='dot'),
         yaxis="y2"
@@ -97,5 +97,6 @@ class ActuarialCalculator:
         print("Karena Spread Negatif, Liabilitas 'berlari' lebih cepat daripada Aset.")
 
 # Run
-calc = ActuarialCalculator("data/tmi_4_m.csv", "data/tmi_4_f.csv")
-calc.run_valuation()
\ No newline at end of file
+if __name__ == "__main__":
+    calc = ActuarialCalculator("data/tmi_4_m.csv", "data/tmi_4_f.csv")
+    calc.run_valuation()
\ No newline at end of file
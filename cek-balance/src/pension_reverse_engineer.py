@@ -1,11 +1,15 @@
 import pandas as pd
 import numpy as np
-from scipy.optimize import brentq 
+
+from pensiun.solver import WarmStartSolver
 
 class PensionReverseEngineer:
     def __init__(self, tmi_male_path, tmi_female_path):
         self.tmi_m = self._load_data(tmi_male_path)
         self.tmi_f = self._load_data(tmi_female_path)
+        # Solver warm-start: kalibrasi berikutnya mulai dari akar skenario terdekat
+        self.salary_solver = WarmStartSolver(0.0, 0.15)
+        self.return_solver = WarmStartSolver(0.0, 0.20)
 
     def _load_data(self, path):
         # (Sama seperti sebelumnya, handling load data)
@@ -115,11 +119,12 @@ class PensionReverseEngineer:
             return calc - target_liability
             
         # Cari salary increase (s) antara 0% sampai 15%
-        try:
-            implied_salary_inc = brentq(liab_error, 0.0, 0.15)
-        except ValueError:
+        fase1 = self.salary_solver.solve(liab_error, key=(target_liability, start_wage, years))
+        if not fase1.converged:
             print("Gagal menemukan Salary Increase yang pas. Cek range discount rate.")
+            print(f"({fase1.message}; {fase1.nfev} evaluasi)")
             return None
+        implied_salary_inc = fase1.root
 
         print(f"\n[PHASE 1] Found Salary Increase!")
         print(f"-> Agar Liabilitas {target_liability:,.0f} dengan Diskon {fixed_discount:.1%}:")
@@ -133,11 +138,12 @@ class PensionReverseEngineer:
             calc = self.calculate_asset(start_wage, years, implied_salary_inc, i_ret)
             return calc - target_asset
             
-        try:
-            implied_invest_ret = brentq(asset_error, 0.0, 0.20)
-        except ValueError:
+        fase2 = self.return_solver.solve(asset_error, key=(target_asset, start_wage, years, implied_salary_inc))
+        if not fase2.converged:
             print("Gagal menemukan Invest Return yang pas.")
+            print(f"({fase2.message}; {fase2.nfev} evaluasi)")
             return None
+        implied_invest_ret = fase2.root
             
         print(f"\n[PHASE 2] Found Investment Return!")
         print(f"-> Agar Aset {target_asset:,.0f} dengan Salary Inc {implied_salary_inc:.2%}:")
@@ -150,12 +156,14 @@ class PensionReverseEngineer:
         
         status = "✅ LOGIS (Invest > Salary)" if spread > 0 else "⚠️ ANEH (Invest < Salary)"
         print(f"Status Model: {status}")
+        print(f"Evaluasi Fungsi  : {fase1.nfev} (salary) + {fase2.nfev} (invest)")
         
         return {
             "salary_inc": implied_salary_inc,
             "invest_ret": implied_invest_ret,
             "discount_rate": fixed_discount,
-            "spread": spread
+            "spread": spread,
+            "nfev": fase1.nfev + fase2.nfev,
         }
 
 if __name__ == "__main__":
@@ -1,7 +1,8 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
+from pensiun.valuation import asset_projection
+
 class PensionVisualizer:
     def __init__(self):
         pass
@@ -20,33 +21,13 @@ class PensionVisualizer:
         contribution_rate = 0.03  # 3%
         
         # --- GENERATE DATA SERIES ---
-        data = []
-        current_wage = start_wage
-        accumulated_asset = 0
-        
-        for t in range(1, years + 1):
-            # 1. Iuran Masuk (3% dari Gaji Setahun)
-            annual_cont = current_wage * 12 * contribution_rate
-            
-            # 2. Pengembangan Aset (Aset Tahun Lalu + Iuran Baru) * Return
-            # Asumsi simplifikasi: Iuran masuk di awal/tengah, bunga full setahun
-            accumulated_asset = (accumulated_asset + annual_cont) * (1 + invest_ret_rate)
-            
-            data.append({
-                "Tahun": t,
-                "Gaji_Bulanan": current_wage,
-                "Iuran_Tahunan": annual_cont,
-                "Total_Aset": accumulated_asset
-            })
-            
-            # Gaji naik untuk tahun depan
-            current_wage *= (1 + salary_inc_rate)
-            
-        df = pd.DataFrame(data)
+        # Structured array (year, wage, contribution, asset) menggantikan list dict + DataFrame.
+        # Iuran masuk di awal tahun, bunga full setahun: aset = (aset + iuran) * (1 + i)
+        proj = asset_projection(start_wage, years, salary_inc_rate, invest_ret_rate, contribution_rate)
         
         # --- HITUNG LIABILITAS (FINAL) ---
         # Rata-rata Gaji Nominal (Basis Manfaat)
-        avg_wage = df["Gaji_Bulanan"].mean()
+        avg_wage = proj["wage"].mean()
         
         # Manfaat Pensiun per Bulan (Rumus 1% x Masa Kerja x Rata2)
         monthly_benefit = 0.01 * years * avg_wage
@@ -57,18 +38,18 @@ class PensionVisualizer:
         annuity_factor = 561_752_000 / (monthly_benefit * 12)
         total_liability = (monthly_benefit * 12) * annuity_factor
         
-        gap = df["Total_Aset"].iloc[-1] - total_liability
+        gap = proj["asset"][-1] - total_liability
 
         # --- PRINT REPORT ---
         print("\n=== PEMBUKTIAN LOGIKA 'ANEH' ===")
         print(f"Asumsi Salary Growth : {salary_inc_rate:.2%}")
         print(f"Asumsi Invest Return : {invest_ret_rate:.2%}")
         print("-" * 40)
-        print(f"Gaji Awal (Tahun 1)  : Rp {df['Gaji_Bulanan'].iloc[0]:,.0f}")
-        print(f"Gaji Akhir (Tahun 32): Rp {df['Gaji_Bulanan'].iloc[-1]:,.0f}")
-        print(f"   -> Gaji naik {df['Gaji_Bulanan'].iloc[-1]/df['Gaji_Bulanan'].iloc[0]:.1f} kali lipat!")
+        print(f"Gaji Awal (Tahun 1)  : Rp {proj['wage'][0]:,.0f}")
+        print(f"Gaji Akhir (Tahun 32): Rp {proj['wage'][-1]:,.0f}")
+        print(f"   -> Gaji naik {proj['wage'][-1]/proj['wage'][0]:.1f} kali lipat!")
         print("-" * 40)
-        print(f"Total Aset Terkumpul : Rp {df['Total_Aset'].iloc[-1]:,.0f}")
+        print(f"Total Aset Terkumpul : Rp {proj['asset'][-1]:,.0f}")
         print(f"   -> (Target BKF: 249 Juta) -> MATCH ✅")
         print("-" * 40)
         print(f"Rata-rata Gaji       : Rp {avg_wage:,.0f}")
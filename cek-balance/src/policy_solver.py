@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
-from scipy.optimize import brentq
+
+from pensiun.solver import WarmStartSolver
 
 class PolicySolver:
     def __init__(self):
@@ -14,6 +15,9 @@ class PolicySolver:
         self.target_contribution = 0.09  # Iuran 9%
         self.target_accrual = 0.015      # Manfaat 1.5%
 
+        # Solver warm-start untuk rangkaian skenario kebijakan (range 6% - 10%)
+        self.solver = WarmStartSolver(0.06, 0.10)
+
     def calculate_balance(self, i_rate):
         # 1. Hitung Liabilitas (Tetap, tidak dipengaruhi investasi)
         wages = [self.start_wage * ((1 + self.s_rate) ** t) for t in range(self.years)]
@@ -39,8 +43,11 @@ class PolicySolver:
         
         # Cari i_rate yang membuat Asset - Liability = 0
         # Kita cari di range 6% sampai 10%
-        try:
-            implied_roi = brentq(self.calculate_balance, 0.06, 0.10)
+        key = (self.target_contribution, self.target_accrual, self.s_rate,
+               self.start_wage, self.years, self.annuity_factor)
+        hasil = self.solver.solve(self.calculate_balance, key=key)
+        if hasil.converged:
+            implied_roi = hasil.root
             
             print("-" * 40)
             print(f"Investasi Lama (Slide 17)     : 6.53%")
@@ -51,9 +58,12 @@ class PolicySolver:
             print(f"KESIMPULAN:")
             print(f"Pemerintah hanya perlu menaikkan kinerja investasi sebesar +{diff*100:.2f}%")
             print(f"dari 6.53% menjadi {implied_roi*100:.2f}% agar angka 9% menjadi valid.")
+            print(f"(Konvergen dalam {hasil.nfev} evaluasi fungsi)")
+            return implied_roi
             
-        except ValueError:
-            print("Gagal menemukan solusi dalam range wajar.")
+        print("Gagal menemukan solusi dalam range wajar.")
+        print(f"({hasil.message}; {hasil.nfev} evaluasi)")
+        return None
 
 if __name__ == "__main__":
     solver = PolicySolver()
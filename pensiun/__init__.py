@@ -0,0 +1,9 @@
+"""
+Mesin perhitungan aktuaria bersama untuk repositori teori-dana-pensiun.
+
+Paket ini memuat versi tervektorisasi dari perhitungan yang ada di
+`case_study_IRR_rate/` (anuitas, iuran DPLK) dan `cek-balance/src/`
+(valuasi JP Slide 17). Modul sengaja TIDAK di-import di sini agar
+`import pensiun` tetap ringan; import modul yang dibutuhkan secara langsung,
+misal `from pensiun.annuity import annuity_due`.
+"""
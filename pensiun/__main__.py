@@ -0,0 +1,5 @@
+import sys
+
+from pensiun.cli import main
+
+sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+Kalkulator Anuitas Hidup Tervektorisasi.
+
+Versi batch dari `hitung_faktor_anuitas` (kalkulator2.py) dan
+`hitung_faktor_anuitas_temporer` (asal.py). Alih-alih looping per orang dan
+per tahun dengan `DataFrame.loc`, semua faktor dihitung lewat kolom komutasi:
+
+    D_x = v^x * l_x
+    N_x = D_x + D_{x+1} + ... (sampai akhir tabel)
+    ä_x      = N_x / D_x
+    ä_x:n|   = (N_x - N_{x+n}) / D_x
+
+Kolom D dan N dibuat sekali per tingkat bunga unik, lalu setiap peserta cukup
+mengambil (gather) baris yang sesuai. Jika `rates` berupa `YieldCurve`,
+matriks jumlah kumulatif SUM_{t<k} DF(t) * l_{x+t} dibuat sekali per
+(kurva, tabel) dan disimpan di cache kurva.
+"""
+
+import numpy as np
+
+from pensiun import instrument
+from pensiun.curve import YieldCurve
+from pensiun.mortality import load_table
+
+# Jumlah tingkat bunga unik yang diproses sekaligus (membatasi memori matriks N)
+UKURAN_CHUNK_BUNGA = 4096
+
+
+def commutation(lx_by_age, rates):
+    """
+    Menghitung kolom komutasi D dan N untuk beberapa tingkat bunga sekaligus.
+
+    Args:
+        lx_by_age (np.ndarray): l_x per usia (lihat `MortalityTable.lx_by_age`)
+        rates (np.ndarray): tingkat bunga unik, shape (U,)
+
+    Returns:
+        tuple: (D, N) masing-masing shape (U, jumlah_usia)
+    """
+    rates = np.asarray(rates, dtype=float)
+    usia = np.arange(len(lx_by_age))
+    lx = np.nan_to_num(lx_by_age, nan=0.0)
+    D = lx[None, :] * (1 + rates[:, None]) ** (-usia[None, :])
+    N = np.cumsum(D[:, ::-1], axis=1)[:, ::-1]
+    return D, N
+
+
+def _annuity_due_table(table, ages, rates, durations=None):
+    """ä_x atau ä_x:n| untuk satu tabel; `ages`, `rates`, `durations` sudah broadcast."""
+    lx_by_age = table.lx_by_age
+    batas = len(lx_by_age) - 1
+
+    if np.any(ages < table.min_age) or np.any(ages > table.max_age):
+        raise ValueError(
+            f"Usia harus di antara {table.min_age} dan {table.max_age} untuk tabel {table.label}."
+        )
+
+    if durations is None:
+        ujung = np.full(ages.shape, batas)
+    else:
+        ujung = np.minimum(ages + durations, batas)
+
+    unik, inv = np.unique(rates, return_inverse=True)
+    inv = inv.reshape(ages.shape)
+    hasil = np.empty(ages.shape)
+
+    instrument.count("annuity.commutation_rates", len(unik))
+    for awal in range(0, len(unik), UKURAN_CHUNK_BUNGA):
+        D, N = commutation(lx_by_age, unik[awal:awal + UKURAN_CHUNK_BUNGA])
+        mask = (inv >= awal) & (inv < awal + UKURAN_CHUNK_BUNGA)
+        baris = inv[mask] - awal
+        x = ages[mask]
+        hasil[mask] = (N[baris, x] - N[baris, ujung[mask]]) / D[baris, x]
+
+    return hasil
+
+
+def _curve_matrix(table, curve):
+    """C[x, k] = SUM_{t<k} DF(t) * l_{x+t} / l_x untuk semua usia x (sekali per kurva & tabel)."""
+    def bangun():
+        lx = np.nan_to_num(table.lx_by_age, nan=0.0)
+        n = len(lx)
+        t = np.arange(n)
+        idx = np.minimum(np.arange(n)[:, None] + t[None, :], n - 1)
+        suku = curve.discount_factors[:n][None, :] * lx[idx]
+        C = np.zeros((n, n + 1))
+        np.cumsum(suku, axis=1, out=C[:, 1:])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return C / lx[:, None]
+
+    return curve.cached(("annuity", table.name, table.gender), bangun)
+
+
+def _annuity_due_curve(table, ages, curve, durations=None):
+    """Versi `_annuity_due_table` dengan diskonto kurva: cukup gather dari matriks cache."""
+    batas = len(table.lx_by_age) - 1
+    if np.any(ages < table.min_age) or np.any(ages > table.max_age):
+        raise ValueError(
+            f"Usia harus di antara {table.min_age} dan {table.max_age} untuk tabel {table.label}."
+        )
+    ujung = np.full(ages.shape, batas) if durations is None else np.minimum(ages + durations, batas)
+    return _curve_matrix(table, curve)[ages, ujung - ages]
+
+
+@instrument.timed("annuity.annuity_due")
+def annuity_due(ages, rates, gender="m", table="tmi_4", durations=None, frequency=1):
+    """
+    Faktor anuitas hidup awal untuk banyak peserta sekaligus.
+
+    Semua argumen boleh skalar atau array dan akan di-broadcast. `gender` dan
+    `table` boleh berupa array string; peserta dikelompokkan per tabel.
+
+    Args:
+        ages (array-like of int): Usia awal (x)
+        rates (array-like of float | YieldCurve): Tingkat bunga/diskonto per
+            tahun, atau satu kurva imbal hasil untuk semua peserta
+        gender (str | array-like): 'm' atau 'f'
+        table (str | array-like): Nama tabel terdaftar (lihat mortality.TABEL_MORTALITA)
+        durations (array-like of int | None): n untuk ä_x:n|; None = seumur hidup
+        frequency (int): Pembayaran per tahun; koreksi Woolhouse (m-1)/(2m)
+
+    Returns:
+        np.ndarray (atau float jika semua input skalar)
+    """
+    kurva = rates if isinstance(rates, YieldCurve) else None
+    ages = np.asarray(ages)
+    rates = np.asarray(0.0 if kurva else rates, dtype=float)
+    gender = np.asarray(gender)
+    table = np.asarray(table)
+    arrays = [ages, rates, gender, table]
+    if durations is not None:
+        arrays.append(np.asarray(durations))
+    arrays = np.broadcast_arrays(*arrays)
+    ages, rates, gender, table = arrays[0].astype(int), arrays[1], arrays[2], arrays[3]
+    durations = arrays[4].astype(int) if durations is not None else None
+
+    instrument.count("annuity.items", ages.size)
+    hasil = np.empty(ages.shape)
+    kunci = np.char.add(np.char.add(table.astype(str), "|"), gender.astype(str))
+    for k in np.unique(kunci):
+        nama, g = str(k).split("|")
+        mask = kunci == k
+        durasi = None if durations is None else durations[mask]
+        if kurva:
+            hasil[mask] = _annuity_due_curve(load_table(nama, g), ages[mask], kurva, durasi)
+        else:
+            hasil[mask] = _annuity_due_table(load_table(nama, g), ages[mask], rates[mask], durasi)
+
+    if frequency != 1:
+        koreksi = (frequency - 1) / (2 * frequency)
+        if durations is None:
+            hasil -= koreksi
+        else:
+            # ä^(m)_x:n| ≈ ä_x:n| - (m-1)/(2m) * (1 - nEx)
+            nEx = pure_endowment(ages, kurva or rates, durations, gender, table)
+            hasil -= koreksi * (1 - nEx)
+
+    return hasil if hasil.ndim else float(hasil)
+
+
+def pure_endowment(ages, rates, durations, gender="m", table="tmi_4"):
+    """nEx = v^n * l_{x+n} / l_x (peluang hidup n tahun yang didiskonto; `rates` boleh YieldCurve)."""
+    kurva = rates if isinstance(rates, YieldCurve) else None
+    ages, rates, durations, gender, table = np.broadcast_arrays(
+        np.asarray(ages), np.asarray(0.0 if kurva else rates, dtype=float), np.asarray(durations),
+        np.asarray(gender), np.asarray(table),
+    )
+    hasil = np.empty(ages.shape)
+    kunci = np.char.add(np.char.add(table.astype(str), "|"), gender.astype(str))
+    for k in np.unique(kunci):
+        nama, g = str(k).split("|")
+        mask = kunci == k
+        lx = load_table(nama, g).lx_by_age
+        x = ages[mask].astype(int)
+        ujung = np.minimum(x + durations[mask].astype(int), len(lx) - 1)
+        diskonto = kurva.df(ujung - x) if kurva else (1 + rates[mask]) ** (-(ujung - x))
+        hasil[mask] = lx[ujung] / lx[x] * diskonto
+    return hasil if hasil.ndim else float(hasil)
+
+
+# ==============================================================================
+# ANUITAS GABUNGAN (PESERTA + PASANGAN)
+# ==============================================================================
+
+# Koreksi Woolhouse untuk pembayaran bulanan: ä^(12) ≈ ä - 11/24
+KOREKSI_BULANAN = 11 / 24
+UKURAN_CHUNK_PASANGAN = 8192
+
+
+@instrument.timed("annuity.joint_life_factors")
+def joint_life_factors(age_x, age_y, rates, benefit_growth=0.0, gender_x="m", gender_y="f",
+                       table="tmi_4"):
+    """
+    Faktor ax, ay dan axy (anuitas tahunan awal) untuk banyak pasangan sekaligus.
+
+    Versi batch dari `calculate_annuity_factors_raw` (pension_reverse_engineer.py)
+    dan bagian tpx di `calculate_joint_life_annuity` (pension_validator.py):
+    kedua tabel dipotong pada panjang sisa yang terpendek, dan diskonto memakai
+    rasio (1 + g) / (1 + i) untuk manfaat yang diindeksasi.
+
+    Returns:
+        tuple: (ax, ay, axy) masing-masing np.ndarray
+    """
+    ax, ay, axy = joint_life_moments(age_x, age_y, rates, benefit_growth, gender_x, gender_y, table)
+    if ax.ndim == 1:
+        return float(ax[0]), float(ay[0]), float(axy[0])
+    return ax[0], ay[0], axy[0]
+
+
+def joint_life_moments(age_x, age_y, rates, benefit_growth=0.0, gender_x="m", gender_y="f",
+                       table="tmi_4", order=0):
+    """
+    Momen SUM_t t^k * v^t * tpx (dan tpy, tpxy) untuk k = 0 .. order.
+
+    Momen ke-0 adalah faktor anuitas; momen ke-1 dan ke-2 memberi turunan
+    analitik terhadap bunga dan indeksasi (lihat `pensiun.sensitivity`),
+    dihitung dalam satu pass yang sama dengan nilai faktornya. Jika `rates`
+    berupa `YieldCurve`, v^t diganti DF(t) kurva (momen k >= 1 tidak lagi
+    berarti turunan).
+
+    Returns:
+        tuple: (ax, ay, axy) masing-masing shape (order + 1,) + shape input
+    """
+    kurva = rates if isinstance(rates, YieldCurve) else None
+    tabel_x = load_table(table, gender_x)
+    tabel_y = load_table(table, gender_y)
+    age_x, age_y, rates, benefit_growth = np.broadcast_arrays(
+        np.asarray(age_x).astype(int), np.asarray(age_y).astype(int),
+        np.asarray(0.0 if kurva else rates, dtype=float), np.asarray(benefit_growth, dtype=float),
+    )
+    for usia, tabel in ((age_x, tabel_x), (age_y, tabel_y)):
+        if np.any(usia < tabel.min_age) or np.any(usia > tabel.max_age):
+            raise ValueError(
+                f"Usia harus di antara {tabel.min_age} dan {tabel.max_age} untuk tabel {tabel.label}."
+            )
+
+    instrument.count("annuity.joint_items", age_x.size)
+    lx_x = np.nan_to_num(tabel_x.lx_by_age, nan=0.0)
+    lx_y = np.nan_to_num(tabel_y.lx_by_age, nan=0.0)
+    panjang = np.minimum(tabel_x.max_age - age_x, tabel_y.max_age - age_y) + 1
+    T = int(panjang.max()) if panjang.size else 0
+    t = np.arange(T)
+
+    bentuk = (order + 1,) + age_x.shape
+    ax, ay, axy = np.empty(bentuk), np.empty(bentuk), np.empty(bentuk)
+    x, y, i, g, L = (a.reshape(-1) for a in (age_x, age_y, rates, benefit_growth, panjang))
+    out_x, out_y, out_xy = (a.reshape(order + 1, -1) for a in (ax, ay, axy))
+
+    for awal in range(0, x.size, UKURAN_CHUNK_PASANGAN):
+        s = slice(awal, awal + UKURAN_CHUNK_PASANGAN)
+        aktif = t[None, :] < L[s, None]
+        idx_x = np.minimum(x[s, None] + t[None, :], len(lx_x) - 1)
+        idx_y = np.minimum(y[s, None] + t[None, :], len(lx_y) - 1)
+        tpx = np.where(aktif, lx_x[idx_x] / lx_x[x[s], None], 0.0)
+        tpy = np.where(aktif, lx_y[idx_y] / lx_y[y[s], None], 0.0)
+        if kurva:
+            bobot = kurva.discount_factors[:T][None, :] * (1 + g[s, None]) ** t[None, :]
+        else:
+            bobot = ((1 + g[s, None]) / (1 + i[s, None])) ** t[None, :]
+        for k in range(order + 1):
+            out_x[k, s] = np.sum(bobot * tpx, axis=1)
+            out_y[k, s] = np.sum(bobot * tpy, axis=1)
+            out_xy[k, s] = np.sum(bobot * tpx * tpy, axis=1)
+            bobot = bobot * t[None, :]
+
+    return ax, ay, axy
+
+
+def last_survivor_annuity(age_x, age_y, rates, benefit_growth=0.0, table="tmi_4"):
+    """
+    Anuitas last survivor bulanan: ä_x + ä_y - ä_xy - 11/24.
+
+    Setara `PensionValidator.calculate_joint_life_annuity`.
+    """
+    ax, ay, axy = joint_life_factors(age_x, age_y, rates, benefit_growth, table=table)
+    return ax + ay - axy - KOREKSI_BULANAN
+
+
+def reversionary_annuity(age_x, age_y, rates, survivor_pct=0.5, benefit_growth=0.0, table="tmi_4"):
+    """
+    Anuitas peserta + reversioner janda: (ä_x - 11/24) + pct * (ä_y - ä_xy).
+
+    Setara rumus di `PensionReverseEngineer.calculate_liability` dan
+    `ActuarialCalculator.calculate_annuity`.
+    """
+    ax, ay, axy = joint_life_factors(age_x, age_y, rates, benefit_growth, table=table)
+    return (ax - KOREKSI_BULANAN) + survivor_pct * (ay - axy)
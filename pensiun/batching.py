@@ -0,0 +1,210 @@
+"""
+Micro-batching untuk Query Anuitas & Iuran DPLK.
+
+Saat banyak pemanggil (form web, aplikasi Streamlit, alat quoting agen)
+meminta hasil untuk SATU orang secara bersamaan, setiap permintaan biasanya
+menjadi satu perhitungan skalar. `MicroBatcher` mengumpulkan permintaan yang
+datang dalam jendela waktu singkat, menjalankannya sebagai satu batch numpy,
+lalu membagikan hasilnya kembali ke masing-masing pemanggil.
+
+Contoh:
+    with annuity_batcher(max_batch_size=512, max_wait_ms=2) as quote:
+        faktor = quote(ages=55, rates=0.06, gender="m")      # blocking
+        future = quote.submit(ages=60, rates=0.06)           # non-blocking
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+_STOP = object()
+
+
+def _kunci_statis(nilai):
+    """Kunci hashable untuk nilai argumen `group_by` (list/array -> dtype, shape & isi)."""
+    try:
+        hash(nilai)
+        return nilai
+    except TypeError:
+        pass
+    arr = np.asarray(nilai)
+    if arr.dtype == object:
+        raise TypeError(f"Nilai argumen group_by tidak bisa dijadikan kunci grup: {nilai!r}")
+    return ("array", arr.dtype.str, arr.shape, arr.tobytes())
+
+
+class MicroBatcher:
+    """
+    Mengumpulkan permintaan skalar menjadi satu panggilan fungsi tervektorisasi.
+
+    Args:
+        fn (callable): Fungsi batch; menerima keyword argument berupa array dan
+            mengembalikan array (satu nilai per baris) atau dict array.
+        max_batch_size (int): Batas jumlah permintaan per batch.
+        max_wait_ms (float): Waktu tunggu maksimum sejak permintaan pertama
+            masuk sebelum batch dijalankan (mengendalikan latensi p99).
+        group_by (tuple): Nama argumen yang tidak di-stack menjadi array
+            (misal `durations=None` atau `frequency`). Permintaan dengan nilai
+            berbeda dijalankan sebagai batch terpisah; list/array dikelompokkan
+            menurut isinya.
+
+    Error saat pengelompokan, eksekusi, atau pembagian hasil jatuh ke future
+    pemiliknya. Jika worker berhenti, permintaan yang masih antre digagalkan
+    dan `submit` berikutnya ditolak.
+    """
+
+    def __init__(self, fn, max_batch_size=256, max_wait_ms=2.0, group_by=()):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size minimal 1.")
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.group_by = tuple(group_by)
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {"requests": 0, "batches": 0, "max_batch": 0}
+        self._worker = threading.Thread(target=self._run, name="pensiun-microbatch", daemon=True)
+        self._worker.start()
+
+    # --- API pemanggil ---
+
+    def submit(self, **kwargs):
+        """Mengirim satu permintaan; mengembalikan `concurrent.futures.Future`."""
+        kunci = tuple((nama, _kunci_statis(kwargs[nama])) for nama in self.group_by if nama in kwargs)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher sudah ditutup.")
+            future = Future()
+            self._queue.put((kwargs, future, kunci))
+        return future
+
+    def __call__(self, **kwargs):
+        """Versi blocking dari `submit`."""
+        return self.submit(**kwargs).result()
+
+    def close(self):
+        """Menjalankan sisa antrean lalu menghentikan worker."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Worker ---
+
+    def _collect(self):
+        """Mengambil satu batch dari antrean; None jika batcher dihentikan."""
+        item = self._queue.get()
+        if item is _STOP:
+            return None
+        batch = [item]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            sisa = deadline - time.perf_counter()
+            if sisa <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=sisa)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Kembalikan penanda berhenti agar loop berikutnya selesai
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        try:
+            while True:
+                batch = self._collect()
+                if batch is None:
+                    return
+                self.stats["requests"] += len(batch)
+                self.stats["batches"] += 1
+                self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+                try:
+                    grup = {}
+                    for kwargs, future, kunci in batch:
+                        grup.setdefault(kunci, []).append((kwargs, future))
+                    for anggota in grup.values():
+                        statis = {nama: anggota[0][0][nama] for nama in self.group_by if nama in anggota[0][0]}
+                        self._execute(statis, anggota)
+                except Exception as e:
+                    # Error tak terduga di worker: jatuhkan ke future batch ini, worker tetap hidup
+                    for _, future, _ in batch:
+                        if not future.done():
+                            future.set_exception(e)
+        finally:
+            self._tutup_worker()
+
+    def _tutup_worker(self):
+        """Worker berhenti: tolak submit baru dan gagalkan permintaan yang masih antre."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP and not item[1].done():
+                item[1].set_exception(RuntimeError("Worker MicroBatcher berhenti sebelum permintaan dijalankan."))
+
+    def _execute(self, statis, anggota):
+        try:
+            nama_array = [k for k in anggota[0][0] if k not in self.group_by]
+            for kwargs, _ in anggota[1:]:
+                if {k for k in kwargs if k not in self.group_by} != set(nama_array):
+                    raise TypeError("Semua permintaan dalam satu grup harus memakai argumen yang sama.")
+            arrays = {k: np.asarray([kwargs[k] for kwargs, _ in anggota]) for k in nama_array}
+            hasil = self.fn(**statis, **arrays)
+        except Exception as e:
+            if len(anggota) > 1:
+                # Satu input tidak valid jangan sampai menggagalkan seluruh batch:
+                # jalankan ulang satu per satu agar error hanya jatuh ke pemiliknya.
+                for item in anggota:
+                    self._execute(statis, [item])
+            else:
+                anggota[0][1].set_exception(e)
+            return
+
+        for idx, (_, future) in enumerate(anggota):
+            try:
+                if isinstance(hasil, dict):
+                    nilai = {k: np.asarray(v)[idx].item() for k, v in hasil.items()}
+                else:
+                    nilai = np.asarray(hasil)[idx].item()
+            except Exception as e:
+                # Bentuk hasil tidak sesuai jumlah permintaan: error ke pemiliknya saja
+                future.set_exception(e)
+            else:
+                future.set_result(nilai)
+
+
+# ==============================================================================
+# BATCHER SIAP PAKAI
+# ==============================================================================
+
+def annuity_batcher(max_batch_size=256, max_wait_ms=2.0):
+    """Batcher untuk query ä_x (`pensiun.annuity.annuity_due`)."""
+    from pensiun.annuity import annuity_due
+
+    return MicroBatcher(annuity_due, max_batch_size, max_wait_ms, group_by=("durations", "frequency"))
+
+
+def dplk_batcher(max_batch_size=256, max_wait_ms=2.0):
+    """Batcher untuk query iuran DPLK (`pensiun.dplk.dplk_contribution`)."""
+    from pensiun.dplk import dplk_contribution
+
+    return MicroBatcher(dplk_contribution, max_batch_size, max_wait_ms, group_by=("include_jp", "tax_regulation"))
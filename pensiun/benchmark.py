@@ -0,0 +1,379 @@
+"""
+Benchmark Kernel Aktuaria (versi loop lama vs mesin `pensiun`).
+
+Setiap workload punya ukuran tetap dan seed tetap sehingga hasilnya bisa
+dibandingkan antar commit:
+
+  - query tunggal      : satu ä_x, satu anuitas joint life, satu solve
+  - batch 10^5 peserta : ä_x, last survivor, ax/ay/axy
+  - grid 10^4 skenario : simulate_jp_deficit, solve_assumptions,
+                         solve_required_return
+
+Yang dicatat per workload: waktu (terbaik dari beberapa ulangan), memori
+puncak (tracemalloc), throughput, dan speedup terhadap versi loop aslinya
+(`kalkulator2.hitung_faktor_anuitas`, `PensionValidator`,
+`PensionReverseEngineer`, `PolicySolver`). Versi loop terlalu lambat untuk
+dijalankan penuh, jadi diukur pada sampel kecil lalu diekstrapolasi per item.
+Kedua solver dimuat dari salinan beku versi `brentq` asli di
+`benchmarks/legacy/` (skrip di cek-balance/src/ kini memakai warm-start yang
+menyimpan state antar-panggilan, sehingga tidak bisa menjadi baseline).
+
+    python -m pensiun.benchmark                       # jalankan semua
+    python -m pensiun.benchmark --save                # simpan baseline JSON
+    python -m pensiun.benchmark --compare             # bandingkan dengan baseline
+    python -m pensiun.benchmark --quick --only annuity_batch
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+AKAR_REPO = Path(__file__).resolve().parent.parent
+BASELINE_JSON = AKAR_REPO / "benchmarks" / "baseline.json"
+
+# Workload dianggap regresi jika lebih lambat dari baseline sebesar faktor ini
+AMBANG_REGRESI = 1.5
+SEED = 20250301
+
+
+# ==============================================================================
+# IMPLEMENTASI LAMA (dimuat langsung dari file skripnya)
+# ==============================================================================
+
+def _muat_modul(nama, path):
+    spec = importlib.util.spec_from_file_location(nama, path)
+    modul = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modul)
+    return modul
+
+
+@lru_cache(maxsize=None)
+def legacy():
+    """Modul & objek versi loop: kalkulator2, PensionValidator, PensionReverseEngineer, PolicySolver."""
+    import pandas as pd
+
+    from pensiun.mortality import path_tabel
+
+    src = AKAR_REPO / "cek-balance" / "src"
+    beku = AKAR_REPO / "benchmarks" / "legacy"
+    kalkulator2 = _muat_modul("_bench_kalkulator2", AKAR_REPO / "case_study_IRR_rate" / "kalkulator2.py")
+    validator = _muat_modul("_bench_validator", src / "pension_validator.py")
+    reverse = _muat_modul("_bench_reverse", beku / "pension_reverse_engineer.py")
+    policy = _muat_modul("_bench_policy", beku / "policy_solver.py")
+
+    path_m, path_f = path_tabel("tmi_4", "m"), path_tabel("tmi_4", "f")
+    return {
+        "kalkulator2": kalkulator2,
+        "df": {g: pd.read_csv(path_tabel("tmi_4", g)).set_index("usia") for g in ("m", "f")},
+        "validator": validator.PensionValidator(path_m, path_f),
+        "reverse": reverse.PensionReverseEngineer(path_m, path_f),
+        "policy": policy.PolicySolver(),
+    }
+
+
+# ==============================================================================
+# WORKLOAD
+# ==============================================================================
+# Setiap workload: fungsi(skala) -> dict berisi
+#   items      : jumlah perhitungan (peserta / sel skenario)
+#   fast       : callable tanpa argumen (mesin pensiun)
+#   loop       : callable(k) satu item versi lama, atau None
+#   loop_items : jumlah sampel item versi lama yang diukur
+
+WORKLOADS = {}
+
+
+def workload(fn):
+    WORKLOADS[fn.__name__] = fn
+    return fn
+
+
+def _rng():
+    return np.random.default_rng(SEED)
+
+
+@workload
+def annuity_single(skala):
+    from pensiun.annuity import annuity_due
+
+    lama = legacy()
+    return {
+        "items": 1,
+        "fast": lambda: annuity_due(55, 0.06),
+        "loop": lambda k: lama["kalkulator2"].hitung_faktor_anuitas(55, lama["df"]["m"], 0.06),
+        "loop_items": 5,
+    }
+
+
+@workload
+def annuity_batch(skala):
+    from pensiun.annuity import annuity_due
+
+    n = int(100_000 * skala)
+    rng = _rng()
+    usia = rng.integers(20, 81, n)
+    bunga = np.round(rng.uniform(0.03, 0.08, n) / 0.0025) * 0.0025
+    gender = rng.choice(["m", "f"], n)
+    lama = legacy()
+    return {
+        "items": n,
+        "fast": lambda: annuity_due(usia, bunga, gender),
+        "loop": lambda k: lama["kalkulator2"].hitung_faktor_anuitas(
+            int(usia[k]), lama["df"][gender[k]], bunga[k]
+        ),
+        "loop_items": 50,
+    }
+
+
+@workload
+def joint_life_single(skala):
+    from pensiun.annuity import last_survivor_annuity
+
+    lama = legacy()
+    return {
+        "items": 1,
+        "fast": lambda: last_survivor_annuity(56, 51, 0.055, 0.02),
+        "loop": lambda k: lama["validator"].calculate_joint_life_annuity(56, 51, 0.055, 0.02),
+        "loop_items": 20,
+    }
+
+
+def _pasangan(n):
+    rng = _rng()
+    usia_x = rng.integers(50, 71, n)
+    usia_y = usia_x - rng.integers(0, 11, n)
+    bunga = rng.uniform(0.04, 0.08, n)
+    indeksasi = rng.uniform(0.0, 0.03, n)
+    return usia_x, usia_y, bunga, indeksasi
+
+
+@workload
+def joint_life_batch(skala):
+    from pensiun.annuity import last_survivor_annuity
+
+    n = int(100_000 * skala)
+    x, y, i, g = _pasangan(n)
+    lama = legacy()
+    return {
+        "items": n,
+        "fast": lambda: last_survivor_annuity(x, y, i, g),
+        "loop": lambda k: lama["validator"].calculate_joint_life_annuity(int(x[k]), int(y[k]), i[k], g[k]),
+        "loop_items": 50,
+    }
+
+
+@workload
+def annuity_factors_raw_batch(skala):
+    from pensiun.annuity import joint_life_factors
+
+    n = int(100_000 * skala)
+    x, y, i, g = _pasangan(n)
+    lama = legacy()
+    return {
+        "items": n,
+        "fast": lambda: joint_life_factors(x, y, i, g),
+        "loop": lambda k: lama["reverse"].calculate_annuity_factors_raw(int(x[k]), int(y[k]), i[k], g[k]),
+        "loop_items": 50,
+    }
+
+
+def _grid(a, b, n):
+    sisi = int(round(np.sqrt(n)))
+    ga, gb = np.meshgrid(np.linspace(*a, sisi), np.linspace(*b, sisi), indexing="ij")
+    return ga.ravel(), gb.ravel()
+
+
+@workload
+def jp_deficit_grid(skala):
+    from pensiun.valuation import simulate_jp_deficit
+
+    s, i = _grid((0.03, 0.10), (0.04, 0.10), int(10_000 * skala))
+    lama = legacy()
+    return {
+        "items": s.size,
+        "fast": lambda: simulate_jp_deficit(2_500_000, 32, s, i, 0.055, 0.02, 56, 5),
+        "loop": lambda k: lama["validator"].simulate_jp_deficit(2_500_000, 32, s[k], i[k], 0.055, 0.02, 56, 5),
+        "loop_items": 20,
+    }
+
+
+@workload
+def solve_assumptions_grid(skala):
+    from pensiun.valuation import implied_assumptions
+
+    aset, liab = _grid((200e6, 300e6), (450e6, 650e6), int(10_000 * skala))
+    lama = legacy()
+
+    def satu(k):
+        with contextlib.redirect_stdout(io.StringIO()):
+            lama["reverse"].solve_assumptions(aset[k], liab[k])
+
+    return {
+        "items": aset.size,
+        "fast": lambda: implied_assumptions(aset, liab),
+        "loop": satu,
+        "loop_items": 5,
+    }
+
+
+@workload
+def required_return_grid(skala):
+    from pensiun.valuation import implied_return
+
+    iuran, accrual = _grid((0.07, 0.12), (0.01, 0.02), int(10_000 * skala))
+    solver = legacy()["policy"]
+
+    def satu(k):
+        solver.target_contribution, solver.target_accrual = iuran[k], accrual[k]
+        with contextlib.redirect_stdout(io.StringIO()):
+            solver.solve_required_return()
+
+    return {
+        "items": iuran.size,
+        "fast": lambda: implied_return(iuran, accrual),
+        "loop": satu,
+        "loop_items": 20,
+    }
+
+
+# ==============================================================================
+# PENGUKURAN
+# ==============================================================================
+
+def _waktu_terbaik(fn, ulang):
+    terbaik = float("inf")
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fn()
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+    return terbaik
+
+
+def _memori_puncak(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_workload(nama, skala=1.0, ulang=3, dengan_loop=True):
+    """Menjalankan satu workload; mengembalikan dict metrik."""
+    w = WORKLOADS[nama](skala)
+    w["fast"]()  # pemanasan: cache tabel & import
+    waktu = _waktu_terbaik(w["fast"], ulang)
+    hasil = {
+        "items": w["items"],
+        "seconds": waktu,
+        "peak_bytes": _memori_puncak(w["fast"]),
+        "throughput": w["items"] / waktu if waktu > 0 else float("inf"),
+    }
+    if dengan_loop and w.get("loop") is not None:
+        sampel = min(w["loop_items"], w["items"])
+        w["loop"](0)
+        mulai = time.perf_counter()
+        for k in range(sampel):
+            w["loop"](k)
+        per_item = (time.perf_counter() - mulai) / sampel
+        hasil["loop_seconds_est"] = per_item * w["items"]
+        hasil["speedup"] = hasil["loop_seconds_est"] / waktu if waktu > 0 else float("inf")
+    return hasil
+
+
+def run_all(nama=None, skala=1.0, ulang=3, dengan_loop=True):
+    nama = nama or list(WORKLOADS)
+    return {n: run_workload(n, skala, ulang, dengan_loop) for n in nama}
+
+
+def _meta(skala):
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.platform(),
+        "scale": skala,
+    }
+
+
+def save_baseline(hasil, path=BASELINE_JSON, skala=1.0):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": _meta(skala), "results": hasil}, f, indent=2)
+    return path
+
+
+def compare(hasil, path=BASELINE_JSON, ambang=AMBANG_REGRESI, skala=1.0):
+    """
+    Membandingkan waktu dengan baseline JSON (harus dibuat dengan skala yang sama).
+
+    Returns:
+        dict: {nama: rasio waktu sekarang / baseline} dan daftar regresi.
+    """
+    with open(path, encoding="utf-8") as f:
+        isi = json.load(f)
+    if isi["meta"]["scale"] != skala:
+        raise ValueError(f"Baseline {path} dibuat dengan skala {isi['meta']['scale']}, bukan {skala} "
+                         "(samakan opsi --quick).")
+    baseline = isi["results"]
+    rasio = {n: r["seconds"] / baseline[n]["seconds"] for n, r in hasil.items() if n in baseline}
+    return {"ratio": rasio, "regressions": [n for n, v in rasio.items() if v > ambang]}
+
+
+def print_report(hasil, perbandingan=None):
+    print(f"{'Workload':<26} | {'Item':>7} | {'Waktu (ms)':>10} | {'Memori (MB)':>11} | "
+          f"{'Item/detik':>12} | {'Speedup':>9} | {'vs baseline':>11}")
+    print("-" * 105)
+    for nama, r in hasil.items():
+        speedup = f"{r['speedup']:>8,.0f}x" if "speedup" in r else f"{'-':>9}"
+        banding = "-"
+        if perbandingan and nama in perbandingan["ratio"]:
+            banding = f"{perbandingan['ratio'][nama]:.2f}x"
+            if nama in perbandingan["regressions"]:
+                banding += " ❌"
+        print(f"{nama:<26} | {r['items']:>7,} | {r['seconds'] * 1000:>10.3f} | "
+              f"{r['peak_bytes'] / 1e6:>11.2f} | {r['throughput']:>12,.0f} | {speedup} | {banding:>11}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark kernel aktuaria pensiun.")
+    parser.add_argument("--only", nargs="+", choices=list(WORKLOADS), help="Jalankan workload tertentu saja")
+    parser.add_argument("--quick", action="store_true", help="Ukuran workload 1/10 (untuk cek cepat)")
+    parser.add_argument("--repeat", type=int, default=3, help="Ulangan pengukuran (diambil terbaik)")
+    parser.add_argument("--no-loop", action="store_true", help="Lewati pengukuran versi loop lama")
+    parser.add_argument("--save", nargs="?", const=str(BASELINE_JSON), help="Simpan hasil sebagai baseline")
+    parser.add_argument("--compare", nargs="?", const=str(BASELINE_JSON), help="Bandingkan dengan baseline")
+    parser.add_argument("--threshold", type=float, default=AMBANG_REGRESI,
+                        help="Rasio waktu terhadap baseline yang dianggap regresi")
+    args = parser.parse_args(argv)
+
+    skala = 0.1 if args.quick else 1.0
+    hasil = run_all(args.only, skala, args.repeat, not args.no_loop)
+    try:
+        perbandingan = compare(hasil, args.compare, args.threshold, skala) if args.compare else None
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ GAGAL membaca baseline: {e}", file=sys.stderr)
+        return 2
+    print_report(hasil, perbandingan)
+    if args.save:
+        print(f"\n✅ Baseline disimpan ke {save_baseline(hasil, args.save, skala)}")
+    if perbandingan and perbandingan["regressions"]:
+        print(f"\n❌ Regresi (> {args.threshold}x baseline): {', '.join(perbandingan['regressions'])}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""
+Matriks Arus Kas Manfaat Harapan untuk ALM & Pencocokan Durasi.
+
+Liabilitas di repositori ini hanya satu angka PV (`liability_pv`,
+`total_liability`). Untuk asset-liability management dibutuhkan pembayaran
+manfaat harapan per tahun ke depan untuk seluruh kepesertaan, baik dengan
+mortalita deterministik maupun stokastik. Modul ini membangun matriks
+
+    CF[t, skenario] = pembayaran manfaat harapan di awal tahun ke-t
+
+tanpa loop per peserta, lewat konvolusi per kelompok usia:
+
+  1. Manfaat tahunan peserta dijumlahkan ke ember (gender, usia, tunda d)
+     dengan `np.bincount` (d = tahun sampai manfaat mulai: 0 untuk pensiunan,
+     usia pensiun - usia untuk peserta aktif).
+  2. Per usia, ember di-cumsum sepanjang d: B[x, t] = SUM_{d<=t} B[x, d]
+     (manfaat yang sudah berjalan di tahun t), termasuk indeksasi manfaat.
+  3. CF[t, s] = SUM_{g,x} B_g[x, t] * tpx_g[s, x, t]   (satu einsum)
+
+Biayanya O(usia x tahun x skenario), tidak bergantung jumlah peserta.
+Mortalita stokastik memakai pengali q_x per tahun kalender
+(`mortality_shocks`: random walk lognormal dengan tren perbaikan), sehingga
+tpx[s, x, t] = PROD_{u<t} (1 - q_{x+u} * M[s, u]).
+
+`CashflowMatrix` menghitung PV, durasi Macaulay & termodifikasi, serta
+key-rate duration langsung dari matriks, dengan bunga datar atau
+`pensiun.curve.YieldCurve` (konvensi sama dengan `YieldCurve.pv`).
+
+    cf = expected_cashflows(usia, gender, manfaat_tahunan, deferral=tunda)
+    cf.pv(0.057), cf.macaulay_duration(0.057), cf.key_rate_durations(kurva)
+"""
+
+import numpy as np
+
+from pensiun.mortality import GENDER, load_table
+
+# Titik key-rate bawaan (tahun) & besar geseran untuk selisih pusat
+KEY_TENOR_BAWAAN = (1, 2, 5, 10, 15, 20, 30)
+GESER_KRD = 1e-4
+
+# Jumlah skenario mortalita per blok (membatasi memori tpx[s, usia, t])
+UKURAN_CHUNK_SKENARIO = 128
+
+
+def _zero_rates(rates, T):
+    """Zero rate per tahun t = 0..T-1 dari bunga datar atau `YieldCurve`."""
+    if hasattr(rates, "zero_rate"):
+        return rates.zero_rate(np.arange(T, dtype=float))
+    return np.full(T, float(rates))
+
+
+def mortality_shocks(n_scenarios, years, sigma=0.05, trend=0.0, seed=2025):
+    """
+    Pengali q_x per (skenario, tahun kalender): log M_t = log M_{t-1} - trend + sigma * eps.
+
+    `trend` > 0 = perbaikan mortalita tahunan (misal 0.01 = q turun ~1% per tahun).
+    M[:, 0] = 1 (tahun berjalan sudah diketahui).
+    """
+    rng = np.random.default_rng(seed)
+    langkah = -trend + sigma * rng.standard_normal((n_scenarios, years - 1))
+    return np.exp(np.hstack([np.zeros((n_scenarios, 1)), np.cumsum(langkah, axis=1)]))
+
+
+def bucket_benefits(ages, genders, annual_benefit, deferral=0, benefit_growth=0.0, table="tmi_4"):
+    """
+    Menjumlahkan manfaat tahunan ke ember (usia, tunda) per gender.
+
+    Manfaat yang mulai di tahun d dinyatakan dalam nilai tahun 0 dengan
+    membagi (1 + benefit_growth)^d, sehingga indeksasi cukup dikalikan
+    kembali per tahun kalender.
+
+    Returns:
+        dict gender -> array (usia, tunda)
+    """
+    ages, genders, manfaat, tunda = (np.asarray(a).reshape(-1) for a in np.broadcast_arrays(
+        np.asarray(ages), np.asarray(genders), np.asarray(annual_benefit, dtype=float), np.asarray(deferral)))
+    tunda = tunda.astype(int)
+    if np.any(tunda < 0):
+        raise ValueError("deferral tidak boleh negatif.")
+    bobot = manfaat / (1 + benefit_growth) ** tunda
+    D = int(tunda.max()) + 1 if tunda.size else 1
+    ember = {}
+    for g in GENDER:
+        pilih = genders == g
+        tabel = load_table(table, g)
+        A = len(tabel.lx_by_age)
+        if np.any(ages[pilih] < tabel.min_age) or np.any(ages[pilih] > tabel.max_age):
+            raise ValueError(f"Usia harus di antara {tabel.min_age} dan {tabel.max_age} untuk tabel {tabel.label}.")
+        kunci = ages[pilih].astype(int) * D + tunda[pilih]
+        ember[g] = np.bincount(kunci, weights=bobot[pilih], minlength=A * D).reshape(A, D)
+    tidak_dikenal = set(np.unique(genders)) - set(GENDER)
+    if tidak_dikenal:
+        raise KeyError(f"Gender tidak dikenal: {', '.join(map(str, tidak_dikenal))}")
+    return ember
+
+
+def _survival_blok(lx_by_age, q_by_age, T, pengali=None):
+    """tpx[s, x, t] untuk semua usia x; tanpa pengali = deterministik (s = 1)."""
+    A = len(lx_by_age)
+    idx = np.minimum(np.arange(A)[:, None] + np.arange(T)[None, :], A - 1)
+    if pengali is None:
+        lx = np.nan_to_num(lx_by_age, nan=0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.nan_to_num(lx[idx] / lx[:, None], nan=0.0)[None]
+    q = q_by_age[idx]                                              # (x, t)
+    hidup = 1 - np.minimum(q[None] * pengali[:, None, :T], 1.0)    # (s, x, t)
+    p = np.ones(hidup.shape)
+    np.cumprod(hidup[..., :-1], axis=-1, out=p[..., 1:])
+    return p
+
+
+def expected_cashflows(ages, genders, annual_benefit, deferral=0, benefit_growth=0.0, table="tmi_4",
+                       years=None, shocks=None):
+    """
+    Matriks pembayaran manfaat harapan (tahun x skenario) untuk seluruh kepesertaan.
+
+    Args:
+        ages, genders, annual_benefit (array-like): Per peserta (manfaat tahunan awal).
+        deferral (array-like): Tahun sampai manfaat mulai dibayar (0 = pensiunan).
+        benefit_growth (float): Indeksasi manfaat per tahun setelah mulai.
+        years (int): Horizon proyeksi (bawaan: sampai ujung tabel).
+        shocks (np.ndarray): Pengali q_x (skenario, tahun) dari `mortality_shocks`;
+            None = satu skenario deterministik.
+
+    Returns:
+        CashflowMatrix
+    """
+    ember = bucket_benefits(ages, genders, annual_benefit, deferral, benefit_growth, table)
+    tabel = {g: load_table(table, g) for g in GENDER}
+    T = years or max(len(t.lx_by_age) for t in tabel.values())
+    S = 1 if shocks is None else len(shocks)
+    if shocks is not None and shocks.shape[1] < T:
+        raise ValueError(f"shocks hanya {shocks.shape[1]} tahun, horizon {T} tahun.")
+    t = np.arange(T)
+    indeks = (1 + benefit_growth) ** t
+
+    cf = np.zeros((T, S))
+    for g in GENDER:
+        B = ember[g]
+        if not B.any():
+            continue
+        # Konvolusi tunda: manfaat berjalan di tahun t = SUM_{d<=t} B[x, d]
+        D = B.shape[1]
+        berjalan = np.cumsum(B, axis=1)[:, np.minimum(t, D - 1)] * indeks   # (x, t)
+        aktif = np.flatnonzero(berjalan.any(axis=1))
+        lx, q = tabel[g].lx_by_age, np.zeros(len(tabel[g].lx_by_age))
+        q[tabel[g].min_age:tabel[g].max_age + 1] = tabel[g].qx
+        q[-1] = 1.0
+        for awal in range(0, S, UKURAN_CHUNK_SKENARIO):
+            pengali = None if shocks is None else shocks[awal:awal + UKURAN_CHUNK_SKENARIO]
+            p = _survival_blok(lx, q, T, pengali)[:, aktif]
+            cf[:, awal:awal + p.shape[0]] += np.einsum("xt,sxt->ts", berjalan[aktif], p)
+    return CashflowMatrix(cf)
+
+
+class CashflowMatrix:
+    """
+    Matriks arus kas `values` shape (tahun, skenario), pembayaran di awal tahun t = 0, 1, ...
+
+    Semua analitik mengembalikan satu nilai per skenario.
+    """
+
+    def __init__(self, values):
+        self.values = values
+
+    def __repr__(self):
+        T, S = self.values.shape
+        return f"CashflowMatrix({T} tahun x {S:,} skenario)"
+
+    @property
+    def years(self):
+        return self.values.shape[0]
+
+    def mean(self):
+        """Arus kas harapan rata-rata antar skenario per tahun."""
+        return self.values.mean(axis=1)
+
+    def percentile(self, q):
+        """Persentil arus kas per tahun antar skenario."""
+        return np.percentile(self.values, q, axis=1)
+
+    def _diskonto(self, rates, geser=0.0):
+        """DF(t) dan waktu t; `geser` boleh skalar atau array per tahun (key-rate)."""
+        t = np.arange(self.years, dtype=float)
+        z = _zero_rates(rates, self.years) + geser
+        return (1 + z) ** (-t), t, z
+
+    def pv(self, rates):
+        df, _, _ = self._diskonto(rates)
+        return df @ self.values
+
+    def macaulay_duration(self, rates):
+        """SUM t * CF_t * DF_t / PV."""
+        df, t, _ = self._diskonto(rates)
+        return (t * df) @ self.values / (df @ self.values)
+
+    def modified_duration(self, rates):
+        """-(1/PV) dPV/dz untuk geseran paralel zero rate: SUM t * CF_t * DF_t / (1 + z_t) / PV."""
+        df, t, z = self._diskonto(rates)
+        return (t * df / (1 + z)) @ self.values / (df @ self.values)
+
+    def key_rate_durations(self, rates, key_tenors=KEY_TENOR_BAWAAN, bump=GESER_KRD):
+        """
+        Key-rate duration per tenor kunci (selisih pusat ±`bump`).
+
+        Geseran tiap tenor kunci berbentuk segitiga di antara tenor kunci
+        tetangga dan datar di luar tenor pertama/terakhir, sehingga jumlah
+        semua KRD = durasi termodifikasi.
+
+        Returns:
+            dict tenor -> array durasi per skenario
+        """
+        kunci = np.asarray(key_tenors, dtype=float)
+        t = np.arange(self.years, dtype=float)
+        pv0 = self.pv(rates)
+        hasil = {}
+        for k, tenor in enumerate(kunci):
+            bobot = np.interp(t, kunci, np.eye(len(kunci))[k])
+            naik, _, _ = self._diskonto(rates, bump * bobot)
+            turun, _, _ = self._diskonto(rates, -bump * bobot)
+            hasil[int(tenor)] = -(naik @ self.values - turun @ self.values) / (2 * bump * pv0)
+        return hasil
+
+
+# ==============================================================================
+# DEMO: KEPESERTAAN CAMPURAN PENSIUNAN & AKTIF
+# ==============================================================================
+if __name__ == "__main__":
+    import time
+
+    from pensiun.annuity import annuity_due
+    from pensiun.curve import YieldCurve
+
+    # Cek satu pensiunan: PV arus kas = manfaat x ä_x (anuitas tahunan awal)
+    satu = expected_cashflows(60, "m", 12_000_000)
+    assert np.isclose(satu.pv(0.057)[0], 12_000_000 * annuity_due(60, 0.057, "m"))
+    tunda = expected_cashflows(40, "f", 1.0, deferral=16)
+    assert np.isclose(tunda.pv(0.057)[0], annuity_due(40, 0.057, "f") - annuity_due(40, 0.057, "f", durations=16))
+
+    N = 500_000
+    rng = np.random.default_rng(47)
+    usia = rng.integers(25, 80, N)
+    gender = rng.choice(["m", "f"], N)
+    pensiun = usia >= 56
+    manfaat = np.where(pensiun, rng.lognormal(np.log(30e6), 0.4, N), rng.lognormal(np.log(40e6), 0.5, N))
+    tunda = np.where(pensiun, 0, 56 - usia)
+
+    mulai = time.perf_counter()
+    cf = expected_cashflows(usia, gender, manfaat, tunda, benefit_growth=0.02)
+    t_det = time.perf_counter() - mulai
+    mulai = time.perf_counter()
+    cf_stok = expected_cashflows(usia, gender, manfaat, tunda, benefit_growth=0.02,
+                                 shocks=mortality_shocks(1000, cf.years, sigma=0.03, trend=0.01))
+    t_stok = time.perf_counter() - mulai
+
+    kurva = YieldCurve.from_csv()
+    print(f"{N:,} peserta -> {cf} dalam {t_det * 1e3:.0f} ms; stokastik {cf_stok} dalam {t_stok:.2f} dtk\n")
+    print(f"{'Tahun':>5} | {'Deterministik':>18} | {'Stokastik P5':>18} | {'P50':>18} | {'P95':>18}")
+    p5, p50, p95 = cf_stok.percentile([5, 50, 95])
+    for t in (0, 1, 5, 10, 20, 30, 40, 50):
+        print(f"{t:>5} | {cf.values[t, 0] / 1e9:>16,.1f} M | {p5[t] / 1e9:>16,.1f} M | "
+              f"{p50[t] / 1e9:>16,.1f} M | {p95[t] / 1e9:>16,.1f} M")
+
+    for judul, r in (("Datar 5.7%", 0.057), (kurva.name, kurva)):
+        print(f"\n{judul}: PV Rp {cf.pv(r)[0] / 1e12:,.3f} T | Macaulay {cf.macaulay_duration(r)[0]:.2f} | "
+              f"termodifikasi {cf.modified_duration(r)[0]:.2f}")
+        krd = cf.key_rate_durations(r)
+        print("  KRD: " + ", ".join(f"{k} thn {v[0]:.2f}" for k, v in krd.items())
+              + f" (jumlah {sum(v[0] for v in krd.values()):.2f})")
+    pv = cf_stok.pv(kurva)
+    print(f"\nPV stokastik (kurva): rata-rata Rp {pv.mean() / 1e12:,.3f} T, P95 Rp {np.percentile(pv, 95) / 1e12:,.3f} T")
@@ -0,0 +1,378 @@
+"""
+Command Line Interface `pensiun`.
+
+Contoh (jalankan dari akar repositori):
+    python -m pensiun annuity --usia 55 --bunga 0.06
+    python -m pensiun dplk --gaji-awal 8000000 --usia-awal 40 --usia-pensiun 55
+    python -m pensiun budget --iuran-dplk 2000000 --gaji-awal 8000000
+    python -m pensiun value --kenaikan-gaji 0.075 --return-investasi 0.07
+    python -m pensiun balance --iuran 0.09 --accrual 0.015
+    python -m pensiun solve return
+    python -m pensiun grid
+    python -m pensiun compare --jenis temporary --usia 28 --durasi 37 --bunga 0.07
+    python -m pensiun stress --kombinasi 2
+
+Setiap subcommand meng-import numpy/scipy/pandas HANYA di dalam handler-nya,
+dan tabel mortalita baru dibaca saat perintah membutuhkannya. Query anuitas
+tunggal dihitung dengan Python murni sehingga start-up tetap puluhan milidetik.
+"""
+
+import argparse
+import sys
+
+GARIS = "=" * 60
+
+
+# ==============================================================================
+# HANDLER SUBCOMMAND
+# ==============================================================================
+
+def _cmd_annuity(args):
+    from pensiun.mortality import load_table
+
+    if len(args.usia) == 1 and len(args.bunga) == 1:
+        # Jalur cepat: satu faktor, tanpa numpy
+        tabel = load_table(args.tabel, args.gender)
+        usia, bunga = args.usia[0], args.bunga[0]
+        if not tabel.min_age <= usia <= tabel.max_age:
+            raise ValueError(f"Usia harus di antara {tabel.min_age} dan {tabel.max_age} untuk tabel {tabel.label}.")
+        hasil = tabel.annuity_due(usia, bunga, args.durasi)
+        if args.frekuensi != 1:
+            koreksi = (args.frekuensi - 1) / (2 * args.frekuensi)
+            if args.durasi is None:
+                hasil -= koreksi
+            else:
+                nEx = tabel.lx_at(usia + args.durasi) / tabel.lx_at(usia) / (1 + bunga) ** args.durasi
+                hasil -= koreksi * (1 - nEx)
+        notasi = f"ä_{usia}" if args.durasi is None else f"ä_{usia}:{args.durasi}|"
+        print(f"{tabel.label} | {notasi} @ {bunga * 100:.2f}% = {hasil:.4f}")
+        return
+
+    import numpy as np
+
+    from pensiun.annuity import annuity_due
+
+    usia = np.array(args.usia)
+    bunga = np.array(args.bunga)
+    grid = annuity_due(usia[:, None], bunga[None, :], args.gender, args.tabel, args.durasi, args.frekuensi)
+    print(f"{'Usia':>6} | " + " | ".join(f"{b * 100:>7.2f}%" for b in bunga))
+    print("-" * (9 + 11 * len(bunga)))
+    for x, baris in zip(usia, grid):
+        print(f"{x:>6} | " + " | ".join(f"{v:>8.4f}" for v in baris))
+
+
+def _cmd_dplk(args):
+    from pensiun.dplk import dplk_contribution
+
+    r = dplk_contribution(
+        args.gaji_awal, args.usia_awal, args.usia_pensiun, args.kenaikan_gaji, args.imbal_hasil,
+        args.target_irr, args.gender, args.tabel, include_jp=not args.tanpa_jp,
+        tax_regulation=args.pajak, npwp=not args.tanpa_npwp,
+    )
+    print(GARIS)
+    print(f" KALKULATOR IURAN DPLK (Usia {args.usia_awal} -> {args.usia_pensiun})")
+    print(GARIS)
+    print(f" Gaji terakhir per bulan   : Rp {r['final_wage']:,.0f}")
+    print(f" Target pensiun per bulan  : Rp {r['target_pension']:,.0f}")
+    print(f" Akumulasi Dana JHT        : Rp {r['jht']:,.0f}")
+    print(f" Uang Pesangon (UUCK)      : Rp {r['pesangon']:,.0f}")
+    print(f" PV Manfaat JP             : Rp {r['pv_jp']:,.0f}")
+    if args.pajak:
+        print(f" PPh 21 final ({args.pajak})  : Rp {r['tax']:,.0f}")
+    print(f" {f'Faktor Anuitas (ä_{args.usia_pensiun})':<26}: {r['annuity_factor']:.4f}")
+    print(f" Estimasi Pensiun Bulanan  : Rp {r['existing_pension']:,.0f}")
+    print(f" Kekurangan (GAP)          : Rp {r['gap']:,.0f}")
+    print(GARIS)
+    print(f" IURAN DPLK BULANAN        : Rp {r['dplk_contribution']:,.0f}")
+
+
+def _cmd_budget(args):
+    import math
+
+    from pensiun.inverse import replacement_ratio, required_return, retirement_age
+
+    umum = dict(salary_increase_rate=args.kenaikan_gaji, gender=args.gender, table=args.tabel,
+                include_jp=not args.tanpa_jp)
+    r = replacement_ratio(args.iuran_dplk, args.gaji_awal, args.usia_awal, args.usia_pensiun,
+                          invest_return_rate=args.imbal_hasil, **umum)
+    usia = retirement_age(args.iuran_dplk, args.gaji_awal, args.usia_awal, args.target_irr,
+                          invest_return_rate=args.imbal_hasil, **umum)
+    imbal = required_return(args.iuran_dplk, args.gaji_awal, args.usia_awal, args.usia_pensiun,
+                            args.target_irr, **umum)
+    print(GARIS)
+    print(f" ANGGARAN IURAN DPLK Rp {args.iuran_dplk:,.0f} / bulan")
+    print(GARIS)
+    print(f" Dana DPLK di usia {args.usia_pensiun}      : Rp {r['dplk_fund']:,.0f}")
+    print(f" Pensiun Bulanan Total     : Rp {r['monthly_pension']:,.0f}")
+    print(f" IRR yang Tercapai         : {r['replacement_ratio']:.2%}")
+    print(GARIS)
+    print(f" Untuk target IRR {args.target_irr:.0%}:")
+    teks_usia = "tidak tercapai" if math.isnan(usia) else f"{usia:.0f} tahun"
+    teks_imbal = "di luar 0% - 20%" if math.isnan(imbal) else f"{imbal:.2%} per tahun"
+    print(f" Usia pensiun minimum      : {teks_usia}")
+    print(f" Imbal hasil dibutuhkan    : {teks_imbal}")
+
+
+def _cmd_value(args):
+    from pensiun.valuation import simulate_jp_deficit
+
+    r = simulate_jp_deficit(
+        args.gaji_awal, args.masa_kerja, args.kenaikan_gaji, args.return_investasi, args.diskonto,
+        args.indeksasi, args.usia_pensiun, args.beda_usia, table=args.tabel,
+    )
+    print(GARIS)
+    print(" VALUASI ASET vs LIABILITAS (Joint Life Last Survivor)")
+    print(GARIS)
+    print(f" Rata-rata Gaji        : Rp {r['avg_wage']:,.0f}")
+    print(f" Manfaat/Bulan Awal    : Rp {r['monthly_benefit']:,.0f}")
+    print(f" Faktor Anuitas (Joint): {r['annuity_factor']:.4f}")
+    print(f" Total Aset            : Rp {r['asset']:,.0f}")
+    print(f" Total Liabilitas (PV) : Rp {r['liability']:,.0f}")
+    print(f" Gap (Unfunded)        : Rp {r['gap']:,.0f}")
+    print(f" Funding Ratio         : {r['funding_ratio']:.1f}%")
+
+
+def _cmd_balance(args):
+    from pensiun.valuation import actuarial_balance
+
+    r = actuarial_balance(args.iuran, args.accrual, salary_increase_rate=args.kenaikan_gaji,
+                          invest_return_rate=args.return_investasi)
+    print(f" Total Aset            : Rp {r['asset']:,.0f}")
+    print(f" Total Liabilitas      : Rp {r['liability']:,.0f}")
+    print(f" Surplus / (Defisit)   : Rp {r['gap']:,.0f}")
+    print(f" Funding Ratio         : {r['funding_ratio']:.1f}%")
+    print(f" Iuran Wajar           : {r['required_contribution']:.2f}%")
+
+
+def _cmd_solve(args):
+    from pensiun.solver import WarmStartSolver
+
+    if args.target == "return":
+        from pensiun.valuation import policy_balance
+
+        def selisih(i_rate):
+            return policy_balance(i_rate, args.iuran, args.accrual, salary_increase_rate=args.kenaikan_gaji)
+
+        hasil = WarmStartSolver(args.batas_bawah, args.batas_atas).solve(selisih)
+        if not hasil.converged:
+            print("Gagal menemukan solusi dalam range wajar.")
+            return 1
+        print(f"Return investasi agar iuran {args.iuran:.2%} cukup untuk manfaat {args.accrual:.2%}: "
+              f"{hasil.root:.2%} ({hasil.nfev} evaluasi)")
+        return 0
+
+    from pensiun.valuation import accumulated_asset, reversionary_liability
+
+    def liab_error(s_inc):
+        return reversionary_liability(2_500_000, 32, s_inc, 0.057) - args.target_liabilitas
+
+    fase1 = WarmStartSolver(0.0, 0.15).solve(liab_error)
+    fase2 = fase1.converged and WarmStartSolver(0.0, 0.20).solve(
+        lambda i: accumulated_asset(2_500_000, 32, fase1.root, i) - args.target_aset)
+    if not (fase2 and fase2.converged):
+        print("Gagal menemukan asumsi yang pas. Cek target aset/liabilitas.")
+        return 1
+    s_inc, i_ret = fase1.root, fase2.root
+    print(f"Implied Salary Increase    = {s_inc:.2%}")
+    print(f"Implied Investment Return  = {i_ret:.2%}")
+    print(f"Spread (Invest - Salary)   = {i_ret - s_inc:.2%}")
+    return 0
+
+
+def _cmd_grid(args):
+    from pensiun.grid import GRID_BAWAAN, build, load_or_build
+
+    path = args.output or GRID_BAWAAN
+    grid = build(path) if args.paksa else load_or_build(path)
+    print(f"{grid}")
+    print(f" File        : {path}")
+    print(f" Galat maks  : ä_x {grid.error_bound['single']:.1e} | gabungan {grid.error_bound['joint']:.1e}")
+
+
+def _cmd_compare(args):
+    from pensiun.compare import compare
+
+    hasil = compare(args.jenis, args.usia, args.bunga, args.durasi, args.frekuensi,
+                    spouse_age_diff=args.beda_usia)
+    print(GARIS)
+    print(f" PERBANDINGAN TABEL MORTALITA: {args.jenis}"
+          + (f" (n = {args.durasi})" if args.durasi is not None else ""))
+    print(GARIS)
+    hasil.print_matrix(base=args.acuan)
+
+
+def _cmd_stress(args):
+    from pensiun.stress import KATALOG_CONTOH, load_catalogue, run_stresses, with_combinations
+
+    katalog = load_catalogue(args.katalog or KATALOG_CONTOH)
+    if args.kombinasi > 1:
+        katalog = with_combinations(katalog, args.kombinasi)
+    hasil = run_stresses(katalog, {
+        "start_wage": args.gaji_awal, "years_of_service": args.masa_kerja,
+        "salary_increase_rate": args.kenaikan_gaji, "invest_return_rate": args.return_investasi,
+        "discount_rate": args.diskonto, "benefit_indexation": args.indeksasi,
+        "retirement_age": args.usia_pensiun, "spouse_age_diff": args.beda_usia,
+    }, table=args.tabel)
+    print(GARIS)
+    print(f" UJI STRES: {len(hasil)} skenario")
+    print(GARIS)
+    hasil.print_matrix()
+    if args.output:
+        hasil.save_csv(args.output)
+        print(f"\nMatriks stres disimpan ke {args.output}")
+
+
+def _cmd_reconcile(args):
+    from pensiun.excel import (DASHBOARD_XLSX, MORTALITY_XLSX, print_report, reconcile_dashboard,
+                               reconcile_mortality)
+
+    laporan = (reconcile_dashboard(args.dashboard or DASHBOARD_XLSX)
+               + reconcile_mortality(args.mortalita or MORTALITY_XLSX))
+    return 1 if print_report(laporan) else 0
+
+
+# ==============================================================================
+# PARSER
+# ==============================================================================
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="pensiun", description="Kalkulator aktuaria dana pensiun.")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="Jalankan di bawah cProfile; tulis FILE (.prof) dan FILE.txt (terurut)")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Catat latensi/counter/cache per tahap dan cetak ke stderr")
+    parser.add_argument("--instrument-out", metavar="JSON", help="Simpan laporan instrumentasi ke JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("annuity", help="Faktor anuitas hidup ä_x / ä_x:n|")
+    p.add_argument("--usia", type=int, nargs="+", required=True)
+    p.add_argument("--bunga", type=float, nargs="+", default=[0.06])
+    p.add_argument("--gender", choices=["m", "f"], default="m")
+    p.add_argument("--tabel", default="tmi_4")
+    p.add_argument("--durasi", type=int, default=None, help="n untuk anuitas temporer")
+    p.add_argument("--frekuensi", type=int, default=1, help="Pembayaran per tahun (12 = bulanan)")
+    p.set_defaults(handler=_cmd_annuity)
+
+    p = sub.add_parser("dplk", help="Iuran DPLK untuk target IRR (alur kalkulator2.py)")
+    p.add_argument("--gaji-awal", type=float, default=8_000_000)
+    p.add_argument("--usia-awal", type=int, default=40)
+    p.add_argument("--usia-pensiun", type=int, default=55)
+    p.add_argument("--kenaikan-gaji", type=float, default=0.05)
+    p.add_argument("--imbal-hasil", type=float, default=0.06)
+    p.add_argument("--target-irr", type=float, default=0.80)
+    p.add_argument("--gender", choices=["m", "f"], default="m")
+    p.add_argument("--tabel", default="tmi_4")
+    p.add_argument("--tanpa-jp", action="store_true", help="Abaikan manfaat JP")
+    p.add_argument("--pajak", default=None, help="Regulasi PPh 21 final atas JHT & pesangon (misal pp68_2009)")
+    p.add_argument("--tanpa-npwp", action="store_true", help="Tarif pajak 20%% lebih tinggi (tanpa NPWP)")
+    p.set_defaults(handler=_cmd_dplk)
+
+    p = sub.add_parser("budget", help="Solver invers: IRR, usia pensiun & imbal hasil dari iuran DPLK")
+    p.add_argument("--iuran-dplk", type=float, required=True, help="Iuran DPLK per bulan (Rp)")
+    p.add_argument("--gaji-awal", type=float, default=8_000_000)
+    p.add_argument("--usia-awal", type=int, default=40)
+    p.add_argument("--usia-pensiun", type=int, default=55)
+    p.add_argument("--kenaikan-gaji", type=float, default=0.05)
+    p.add_argument("--imbal-hasil", type=float, default=0.06)
+    p.add_argument("--target-irr", type=float, default=0.80)
+    p.add_argument("--gender", choices=["m", "f"], default="m")
+    p.add_argument("--tabel", default="tmi_4")
+    p.add_argument("--tanpa-jp", action="store_true", help="Abaikan manfaat JP")
+    p.set_defaults(handler=_cmd_budget)
+
+    p = sub.add_parser("value", help="Valuasi aset vs liabilitas JP (PensionValidator)")
+    p.add_argument("--gaji-awal", type=float, default=2_500_000)
+    p.add_argument("--masa-kerja", type=int, default=32)
+    p.add_argument("--kenaikan-gaji", type=float, default=0.075)
+    p.add_argument("--return-investasi", type=float, default=0.07)
+    p.add_argument("--diskonto", type=float, default=0.055)
+    p.add_argument("--indeksasi", type=float, default=0.02)
+    p.add_argument("--usia-pensiun", type=int, default=56)
+    p.add_argument("--beda-usia", type=int, default=5, help="Selisih usia pasangan (lebih muda)")
+    p.add_argument("--tabel", default="tmi_4")
+    p.set_defaults(handler=_cmd_value)
+
+    p = sub.add_parser("balance", help="Neraca equilibrium iuran vs accrual rate")
+    p.add_argument("--iuran", type=float, default=0.03)
+    p.add_argument("--accrual", type=float, default=0.01)
+    p.add_argument("--kenaikan-gaji", type=float, default=0.0787)
+    p.add_argument("--return-investasi", type=float, default=0.0653)
+    p.set_defaults(handler=_cmd_balance)
+
+    p = sub.add_parser("solve", help="Cari asumsi implisit (return investasi / reverse engineering)")
+    p.add_argument("target", choices=["return", "assumptions"])
+    p.add_argument("--iuran", type=float, default=0.09)
+    p.add_argument("--accrual", type=float, default=0.015)
+    p.add_argument("--kenaikan-gaji", type=float, default=0.0787)
+    p.add_argument("--batas-bawah", type=float, default=0.06)
+    p.add_argument("--batas-atas", type=float, default=0.10)
+    p.add_argument("--target-aset", type=float, default=249_783_000)
+    p.add_argument("--target-liabilitas", type=float, default=561_752_000)
+    p.set_defaults(handler=_cmd_solve)
+
+    p = sub.add_parser("grid", help="Bangun grid faktor anuitas pra-hitung untuk kuotasi instan")
+    p.add_argument("--output", default=None, help="Default: ~/.cache/pensiun/annuity_grid.npz (PENSIUN_GRID)")
+    p.add_argument("--paksa", action="store_true", help="Bangun ulang walaupun grid masih cocok")
+    p.set_defaults(handler=_cmd_grid)
+
+    p = sub.add_parser("compare", help="Bandingkan TMI 4, GAM 71 & GAM 83 dalam satu matriks")
+    p.add_argument("--jenis", default="whole",
+                   choices=["whole", "temporary", "deferred", "endowment", "last_survivor", "reversionary"])
+    p.add_argument("--usia", type=int, nargs="+", required=True)
+    p.add_argument("--bunga", type=float, nargs="+", default=[0.06])
+    p.add_argument("--durasi", type=int, default=None, help="n untuk temporary/deferred/endowment")
+    p.add_argument("--frekuensi", type=int, default=1, help="Pembayaran per tahun (12 = bulanan)")
+    p.add_argument("--beda-usia", type=int, default=3, help="Pasangan lebih muda sekian tahun (jenis gabungan)")
+    p.add_argument("--acuan", default="tmi_4", help="Tabel acuan untuk selisih relatif")
+    p.set_defaults(handler=_cmd_compare)
+
+    p = sub.add_parser("stress", help="Uji stres katalog (diskonto, gaji, longevity, return) -> matriks stres")
+    p.add_argument("--katalog", default=None, help="CSV katalog stres (bawaan: katalog contoh)")
+    p.add_argument("--kombinasi", type=int, default=1, help="Tambahkan kombinasi sampai sekian stres tunggal")
+    p.add_argument("--gaji-awal", type=float, default=2_500_000)
+    p.add_argument("--masa-kerja", type=int, default=32)
+    p.add_argument("--kenaikan-gaji", type=float, default=0.0787)
+    p.add_argument("--return-investasi", type=float, default=0.0653)
+    p.add_argument("--diskonto", type=float, default=0.057)
+    p.add_argument("--indeksasi", type=float, default=0.0)
+    p.add_argument("--usia-pensiun", type=int, default=56)
+    p.add_argument("--beda-usia", type=int, default=3)
+    p.add_argument("--tabel", default="tmi_4")
+    p.add_argument("--output", default=None, help="Simpan matriks stres ke CSV")
+    p.set_defaults(handler=_cmd_stress)
+
+    p = sub.add_parser("reconcile", help="Cocokkan Dashboard.xlsx & mortality_table.xlsx dengan mesin Python")
+    p.add_argument("--dashboard", default=None, help="Default: case_study_IRR_rate/Dashboard.xlsx")
+    p.add_argument("--mortalita", default=None, help="Default: file_mortality_table/mortality_table.xlsx")
+    p.set_defaults(handler=_cmd_reconcile)
+
+    return parser
+
+
+def _jalankan(args):
+    if not args.profile:
+        return args.handler(args)
+    from pensiun.instrument import profile
+
+    with profile(args.profile):
+        hasil = args.handler(args)
+    print(f"Profil disimpan ke {args.profile} dan {args.profile}.txt", file=sys.stderr)
+    return hasil
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.instrument or args.instrument_out:
+        from pensiun import instrument
+
+        instrument.enable()
+    try:
+        return _jalankan(args) or 0
+    except (KeyError, ValueError, FileNotFoundError) as e:
+        print(f"❌ GAGAL: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.instrument:
+            instrument.print_report(file=sys.stderr)
+        if args.instrument_out:
+            instrument.export(args.instrument_out)
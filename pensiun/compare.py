@@ -0,0 +1,213 @@
+"""
+Mode Perbandingan Tabel Mortalita (TMI 4, GAM 71, GAM 83) dalam Satu Pass.
+
+`asal.py` (TMI 4) dan `asal_gam.py` (GAM 71) adalah salinan yang hampir
+sama: masing-masing menghitung satu anuitas temporer untuk satu tabel, gender
+demi gender, sambil mencetak. GAM 83 ada di `data/` tetapi belum dipakai.
+Di sini semua tabel terdaftar ditumpuk menjadi satu array
+(tabel x gender x usia) dan setiap jenis anuitas dihitung untuk semua tabel,
+gender, usia dan asumsi bunga dalam SATU evaluasi tervektorisasi:
+
+    nilai[tabel, gender, usia, bunga] = SUM_t bobot_t(n) * v_t(bunga) * p[tabel, gender, usia, t]
+
+Jenis (`JENIS`): whole (ä_x), temporary (ä_x:n|), deferred (n|ä_x),
+endowment (nEx), last_survivor & reversionary (peserta pria + pasangan
+wanita, konvensi `pensiun.annuity`). Hasilnya `ComparisonMatrix` yang bisa
+dicetak sebagai matriks perbandingan, termasuk selisih relatif terhadap
+tabel acuan, yang dipakai untuk memilih basis valuasi.
+
+    python -m pensiun compare --jenis temporary --usia 28 --durasi 37 --bunga 0.07 0.085
+"""
+
+import numpy as np
+
+from pensiun.mortality import GENDER, TABEL_MORTALITA, load_table
+
+JENIS = ("whole", "temporary", "deferred", "endowment", "last_survivor", "reversionary")
+JENIS_GABUNGAN = ("last_survivor", "reversionary")
+
+
+def stacked_lx(tables=None):
+    """l_x semua tabel: array (tabel, gender, usia) dengan nol di luar rentang tabel."""
+    tables = list(tables or TABEL_MORTALITA)
+    A = max(len(load_table(n, g).lx_by_age) for n in tables for g in GENDER)
+    lx = np.zeros((len(tables), len(GENDER), A))
+    for a, nama in enumerate(tables):
+        for b, g in enumerate(GENDER):
+            l = np.nan_to_num(load_table(nama, g).lx_by_age, nan=0.0)
+            lx[a, b, :len(l)] = l
+    return lx
+
+
+def _survival(lx, ages, T):
+    """p[..., usia, t] = l_{x+t} / l_x dari lx (..., A); nol setelah ujung tabel."""
+    idx = np.minimum(ages[:, None] + np.arange(T)[None, :], lx.shape[-1] - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = lx[..., idx] / lx[..., ages, None]
+    return np.nan_to_num(p, nan=0.0)
+
+
+class ComparisonMatrix:
+    """Hasil perbandingan: `values` shape (tabel, gender, usia, bunga) beserta label sumbunya."""
+
+    def __init__(self, kind, values, tables, genders, ages, rates, durations=None):
+        self.kind = kind
+        self.values = values
+        self.tables = list(tables)
+        self.genders = list(genders)
+        self.ages = np.asarray(ages)
+        self.rates = np.asarray(rates)
+        self.durations = durations
+
+    def __repr__(self):
+        return f"ComparisonMatrix({self.kind}, shape={self.values.shape})"
+
+    def get(self, table, gender=None):
+        """Slice (usia, bunga) untuk satu tabel & gender."""
+        return self.values[self.tables.index(table), self.genders.index(gender or self.genders[0])]
+
+    def relative_to(self, table):
+        """Selisih relatif setiap tabel terhadap tabel acuan (gender yang sama)."""
+        acuan = self.values[self.tables.index(table)]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.values / acuan[None] - 1
+
+    def to_frame(self):
+        """DataFrame panjang (tabel, gender, usia, bunga, nilai); pandas di-import saat dipakai."""
+        import pandas as pd
+
+        t, g, a, r = np.meshgrid(self.tables, self.genders, self.ages, self.rates, indexing="ij")
+        return pd.DataFrame({"table": t.ravel(), "gender": g.ravel(), "age": a.ravel(), "rate": r.ravel(),
+                             "value": self.values.ravel()})
+
+    def print_matrix(self, base=None):
+        """Matriks: baris (usia, bunga), kolom (tabel, gender); opsional selisih vs `base`."""
+        kolom = [(a, b) for a in range(len(self.tables)) for b in range(len(self.genders))]
+        judul = [f"{TABEL_MORTALITA.get(self.tables[a], self.tables[a])} {self.genders[b].upper()}" for a, b in kolom]
+        relatif = self.relative_to(base) if base else None
+        print(f"{'Usia':>5} | {'Bunga':>6} | " + " | ".join(f"{j:>12}" for j in judul))
+        print("-" * (17 + 15 * len(kolom)))
+        for i, x in enumerate(self.ages):
+            for j, r in enumerate(self.rates):
+                sel = []
+                for a, b in kolom:
+                    teks = f"{self.values[a, b, i, j]:.4f}"
+                    if relatif is not None and self.tables[a] != base:
+                        teks += f" {relatif[a, b, i, j]:+.1%}"
+                    sel.append(f"{teks:>12}")
+                print(f"{x:>5} | {r:>6.2%} | " + " | ".join(sel))
+
+
+def compare(kind="whole", ages=(55,), rates=(0.06,), durations=None, frequency=1, tables=None,
+            spouse_age_diff=3, survivor_pct=0.5, benefit_growth=0.0):
+    """
+    Menghitung satu jenis anuitas untuk semua tabel x gender x usia x bunga sekaligus.
+
+    Args:
+        kind (str): Salah satu `JENIS`.
+        ages, rates (array-like): Sumbu usia dan bunga matriks.
+        durations (int): n untuk temporary/deferred/endowment.
+        frequency (int): Pembayaran per tahun (koreksi Woolhouse seperti `annuity_due`),
+            juga untuk jenis gabungan; frequency=12 menyamai `last_survivor_annuity`
+            dan `reversionary_annuity` yang selalu bulanan.
+        spouse_age_diff (int): Pasangan lebih muda sekian tahun (jenis gabungan).
+        benefit_growth (float): Indeksasi manfaat (jenis gabungan).
+
+    Returns:
+        ComparisonMatrix
+    """
+    if kind not in JENIS:
+        raise KeyError(f"Jenis '{kind}' tidak dikenal. Pilihan: {', '.join(JENIS)}")
+    if kind in ("temporary", "deferred", "endowment") and durations is None:
+        raise ValueError(f"Jenis '{kind}' membutuhkan durasi (n).")
+    tables = list(tables or TABEL_MORTALITA)
+    ages = np.atleast_1d(np.asarray(ages, dtype=int))
+    rates = np.atleast_1d(np.asarray(rates, dtype=float))
+    lx = stacked_lx(tables)
+    T = lx.shape[-1]
+    t = np.arange(T)
+
+    for nama in tables:
+        for g in GENDER:
+            tabel = load_table(nama, g)
+            usia_cek = ages if kind not in JENIS_GABUNGAN or g == "m" else ages - spouse_age_diff
+            if np.any(usia_cek < tabel.min_age) or np.any(usia_cek > tabel.max_age):
+                raise ValueError(f"Usia harus di antara {tabel.min_age} dan {tabel.max_age} "
+                                 f"untuk tabel {tabel.label}.")
+
+    if kind in JENIS_GABUNGAN:
+        v = ((1 + benefit_growth) / (1 + rates[:, None])) ** t[None, :]
+        px = _survival(lx[:, 0], ages, T)                    # (tabel, usia, t)
+        py = _survival(lx[:, 1], ages - spouse_age_diff, T)
+        # Konvensi joint_life_factors: ax dan ay dipotong pada sisa umur tabel yang terpendek
+        hidup = (px > 0) & (py > 0) | (t == 0)
+        panjang = hidup.cumprod(axis=-1).sum(axis=-1, keepdims=True)
+        aktif = t < panjang
+        ax, ay, axy = (np.einsum("kat,rt->kar", np.where(aktif, p, 0.0), v) for p in (px, py, px * py))
+        # Koreksi Woolhouse ax + ay - axy menyisakan satu (m-1)/(2m); pada ay - axy saling hapus
+        koreksi = (frequency - 1) / (2 * frequency)
+        if kind == "last_survivor":
+            nilai = ax + ay - axy - koreksi
+        else:
+            nilai = (ax - koreksi) + survivor_pct * (ay - axy)
+        return ComparisonMatrix(kind, nilai[:, None], tables, ["m+f"], ages, rates)
+
+    p = _survival(lx, ages, T)                               # (tabel, gender, usia, t)
+    v = (1 + rates[:, None]) ** (-t[None, :].astype(float))  # (bunga, t)
+    n = T if durations is None else int(durations)
+    if kind == "endowment":
+        nilai = np.broadcast_to(p[..., min(n, T - 1), None] * v[None, None, None, :, min(n, T - 1)],
+                                p.shape[:-1] + (len(rates),)).copy()
+        return ComparisonMatrix(kind, nilai, tables, GENDER, ages, rates, durations)
+
+    bobot = {"whole": t >= 0, "temporary": t < n, "deferred": t >= n}[kind]
+    nilai = np.einsum("kgat,rt->kgar", p * bobot, v)
+    if frequency != 1:
+        koreksi = (frequency - 1) / (2 * frequency)
+        nEx = p[..., min(n, T - 1), None] * v[:, min(n, T - 1)]
+        if kind == "whole":
+            nilai -= koreksi
+        elif kind == "temporary":
+            nilai -= koreksi * (1 - nEx)
+        else:
+            nilai -= koreksi * nEx
+    return ComparisonMatrix(kind, nilai, tables, GENDER, ages, rates, durations)
+
+
+# ==============================================================================
+# DEMO: SKENARIO asal.py & asal_gam.py DALAM SATU PANGGILAN
+# ==============================================================================
+if __name__ == "__main__":
+    import time
+
+    from pensiun.annuity import annuity_due, last_survivor_annuity
+
+    hasil = compare("temporary", ages=[28], rates=[0.07], durations=37)
+    print("ä_28:37| @ 7% (asal.py: TMI 4, asal_gam.py: GAM 71) + GAM 83:\n")
+    hasil.print_matrix(base="tmi_4")
+
+    print("\nä_x bulanan, beberapa usia & bunga:\n")
+    compare("whole", ages=[55, 60], rates=[0.05, 0.07], frequency=12).print_matrix(base="tmi_4")
+
+    print("\nLast survivor bulanan (pasangan 3 tahun lebih muda):\n")
+    gabungan = compare("last_survivor", ages=[56], rates=[0.057], frequency=12)
+    gabungan.print_matrix(base="tmi_4")
+
+    # Cek terhadap mesin per tabel & waktu untuk matriks besar
+    usia = np.arange(20, 91)
+    bunga = np.linspace(0.03, 0.10, 29)
+    mulai = time.perf_counter()
+    besar = compare("temporary", usia, bunga, durations=20, frequency=12)
+    t_satu = time.perf_counter() - mulai
+    mulai = time.perf_counter()
+    for a, nama in enumerate(besar.tables):
+        for b, g in enumerate(GENDER):
+            acuan = annuity_due(usia[:, None], bunga[None, :], g, nama, 20, 12)
+            assert np.allclose(besar.values[a, b], acuan, atol=1e-10)
+    t_per_tabel = time.perf_counter() - mulai
+    ls = last_survivor_annuity(56, 53, 0.057, table="gam_83")
+    assert np.isclose(gabungan.get("gam_83")[0, 0], ls, atol=1e-10)
+    tahunan = compare("last_survivor", ages=[56], rates=[0.057], frequency=1)
+    assert np.allclose(tahunan.values - gabungan.values, 11 / 24)
+    print(f"\nMatriks {besar.values.shape}: satu pass {t_satu * 1e3:.1f} ms vs per tabel/gender "
+          f"{t_per_tabel * 1e3:.1f} ms (hasil identik)")
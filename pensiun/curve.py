@@ -0,0 +1,158 @@
+"""
+Kurva Imbal Hasil (Term Structure) untuk Diskonto.
+
+Semua anuitas di repo ini (`hitung_faktor_anuitas`, fungsi joint life,
+faktor `(1/(1+i))**t`) memakai satu tingkat bunga datar, padahal diskonto
+5.7% di `ActuarialScratchpad` dimaksudkan sebagai yield SBN tenor panjang.
+`YieldCurve` menyimpan kurva zero-rate (misal kurva SBN dari file lokal) dan:
+
+  - menghitung vektor faktor diskonto DF(t), t = 0 .. HORIZON-1, SEKALI per kurva
+  - menyimpan cache per kurva untuk matriks anuitas per tabel mortalita
+    (dipakai `pensiun.annuity`), sehingga valuasi batch dengan kurva cukup
+    gather dari array, sama cepatnya dengan bunga datar
+
+Objek `YieldCurve` bisa diberikan di mana pun argumen `rates`/`discount_rate`
+diterima oleh `annuity_due`, `pure_endowment`, `joint_life_factors`,
+`last_survivor_annuity`, `reversionary_annuity`, `simulate_jp_deficit` dan
+`reversionary_liability`.
+
+Konvensi: zero rate majemuk tahunan, DF(t) = (1 + z(t))^-t; z diinterpolasi
+linear antar tenor dan datar di luar tenor pertama/terakhir.
+
+Format file CSV (yield desimal):
+
+    tenor,yield
+    1,0.0620
+    10,0.0695
+"""
+
+import csv
+from pathlib import Path
+
+import numpy as np
+
+from pensiun.mortality import DATA_DIR
+
+# Panjang vektor DF: cukup untuk usia 0 sampai ujung tabel mortalita (+ slot ekstra)
+HORIZON = 130
+
+# Contoh kurva SBN (angka ilustrasi, bukan kutipan resmi)
+KURVA_CONTOH = DATA_DIR / "kurva_sbn_contoh.csv"
+
+
+class YieldCurve:
+    """
+    Kurva zero-rate dengan vektor faktor diskonto yang dihitung sekali.
+
+    Args:
+        tenors (array-like): Tenor dalam tahun, naik tegas.
+        zero_rates (array-like): Zero rate majemuk tahunan per tenor.
+        name (str): Label untuk laporan.
+    """
+
+    def __init__(self, tenors, zero_rates, name="kurva"):
+        tenors = np.asarray(tenors, dtype=float)
+        zero_rates = np.asarray(zero_rates, dtype=float)
+        if tenors.ndim != 1 or tenors.shape != zero_rates.shape or tenors.size == 0:
+            raise ValueError("tenors dan zero_rates harus array 1 dimensi dengan panjang sama.")
+        if np.any(np.diff(tenors) <= 0):
+            raise ValueError("Tenor harus naik tegas.")
+        self.tenors = tenors
+        self.zero_rates = zero_rates
+        self.name = name
+        t = np.arange(HORIZON, dtype=float)
+        self.discount_factors = (1 + self.zero_rate(t)) ** (-t)
+        self.discount_factors.setflags(write=False)
+        self._cache = {}
+
+    @classmethod
+    def flat(cls, rate):
+        """Kurva datar (setara bunga tunggal `rate`)."""
+        return cls([1.0], [rate], name=f"datar {rate:.2%}")
+
+    @classmethod
+    def from_discount_factors(cls, discount_factors, name="kurva"):
+        """Kurva dari vektor DF(t) yang sudah ada (misal di shared memory), tanpa salinan."""
+        kurva = cls.__new__(cls)
+        t = np.arange(1, len(discount_factors))
+        kurva.tenors = t.astype(float)
+        kurva.zero_rates = np.asarray(discount_factors[1:]) ** (-1 / t) - 1
+        kurva.name = name
+        kurva.discount_factors = discount_factors
+        kurva._cache = {}
+        return kurva
+
+    @classmethod
+    def from_csv(cls, path=KURVA_CONTOH, name=None):
+        """Membaca kurva dari CSV dengan kolom 'tenor' dan 'yield' (desimal)."""
+        path = Path(path)
+        with open(path, newline="") as f:
+            baris = [(float(r["tenor"]), float(r["yield"])) for r in csv.DictReader(f)]
+        baris.sort()
+        return cls([b[0] for b in baris], [b[1] for b in baris], name=name or path.stem)
+
+    def __repr__(self):
+        return f"YieldCurve({self.name!r}, {len(self.tenors)} tenor)"
+
+    def zero_rate(self, t):
+        return np.interp(t, self.tenors, self.zero_rates)
+
+    def shift(self, spread, name=None):
+        """Kurva baru dengan pergeseran paralel `spread` (misal 0.01 = +100 bp)."""
+        return YieldCurve(self.tenors, self.zero_rates + spread, name or f"{self.name} {spread:+.2%}")
+
+    def df(self, t):
+        """Faktor diskonto untuk tahun bulat t (array-like)."""
+        return self.discount_factors[np.asarray(t, dtype=int)]
+
+    def pv(self, cashflows):
+        """
+        PV arus kas tahunan (awal tahun, t = 0, 1, ...) pada sumbu terakhir.
+
+        Args:
+            cashflows (array-like): shape (..., T), T <= HORIZON.
+        """
+        cashflows = np.asarray(cashflows, dtype=float)
+        return cashflows @ self.discount_factors[:cashflows.shape[-1]]
+
+    def cached(self, key, builder):
+        """Hasil `builder()` yang disimpan per kurva (misal matriks anuitas per tabel)."""
+        if key not in self._cache:
+            self._cache[key] = builder()
+        return self._cache[key]
+
+
+# ==============================================================================
+# BENCHMARK: BUNGA DATAR vs KURVA
+# ==============================================================================
+if __name__ == "__main__":
+    import time
+
+    from pensiun.annuity import annuity_due, last_survivor_annuity
+    from pensiun.curve import YieldCurve  # kelas yang sama dengan yang dicek `pensiun.annuity`
+
+    kurva = YieldCurve.from_csv()
+    print(f"{kurva}: DF(10) = {kurva.df(10):.6f}, DF(30) = {kurva.df(30):.6f}")
+
+    datar = YieldCurve.flat(0.057)
+    usia = np.arange(20, 100)
+    beda = np.max(np.abs(annuity_due(usia, datar) - annuity_due(usia, 0.057)))
+    print(f"Kurva datar 5.7% vs bunga 5.7%: selisih maks ä_x = {beda:.1e}")
+
+    rng = np.random.default_rng(36)
+    N = 100_000
+    x = rng.integers(40, 70, N)
+    bunga = np.full(N, 0.057)
+    annuity_due(x[:10], kurva), annuity_due(x[:10], bunga[:10])  # pemanasan cache
+
+    print(f"\n{'Workload':<30} | {'Datar (ms)':>10} | {'Kurva (ms)':>10}")
+    for nama, fungsi, n in (
+        ("annuity_due", lambda r: annuity_due(x, r), N),
+        ("last_survivor_annuity", lambda r: last_survivor_annuity(x[:10_000], x[:10_000] - 3, r), 10_000),
+    ):
+        waktu = []
+        for r in (bunga[:n], kurva):
+            mulai = time.perf_counter()
+            fungsi(r)
+            waktu.append((time.perf_counter() - mulai) * 1e3)
+        print(f"{nama + f' ({n:,})':<30} | {waktu[0]:>10.1f} | {waktu[1]:>10.1f}")
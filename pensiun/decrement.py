@@ -0,0 +1,280 @@
+"""
+Tabel Layanan Multi-Decrement (Meninggal, Mengundurkan Diri, Cacat, Pensiun).
+
+Proyeksi di repositori ini menganggap pekerja selalu bertahan sampai masa
+kerja penuh (32 atau 15 tahun) dan mortalita baru berperan setelah pensiun.
+Untuk dana pensiun riil, keluar karena mengundurkan diri dan cacat sebelum
+pensiun justru mendominasi arus kas. Modul ini menggabungkan q_x tabel
+mortalita dengan tingkat pengunduran diri dan cacat menjadi tabel layanan:
+
+    q'(d) = q_x tabel mortalita, q'(w) = skala pengunduran diri,
+    q'(i) = faktor x q_x (praktik umum: cacat 10% TMI)
+
+Tingkat independen q' diubah menjadi probabilitas dependen dengan asumsi
+UDD per decrement, misal untuk tiga decrement:
+
+    q(d) = q'(d) * [1 - (q'(w) + q'(i)) / 2 + q'(w) * q'(i) / 3]
+
+Pensiun dianggap terjadi di awal tahun usia: q(r) = 1 pada usia pensiun
+normal (opsional tingkat pensiun dini sebelumnya), dan decrement lain
+bekerja pada sisa (1 - q(r)). Hasilnya disimpan per usia sebagai l^τ_x
+(kelangsungan dalam layanan kumulatif), satu tabel per gender, sehingga
+
+    tpx^τ = l^τ_{x+t} / l^τ_x
+
+cukup satu gather seperti `MortalityTable.lx_by_age`. `ServiceTable`
+kompatibel dengan mesin komutasi `pensiun.annuity`, jadi anuitas layanan
+ä^τ_x:n| (PV iuran normal PUC) memakai jalur tervektorisasi yang sama.
+
+    layanan = service_table("tmi_4", "m", retirement_age=56)
+    layanan.survival(25, 31)              # tpx^τ, t = 0..30
+    layanan.retirement_probability(25)    # peluang mencapai usia pensiun dalam layanan
+    simulate_jp_deficit(..., service=layanan)
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from pensiun.mortality import GENDER, TABEL_MORTALITA, load_table
+from pensiun.salary import SalaryScale
+
+DECREMENT = ("death", "withdrawal", "disability", "retirement")
+
+# Asumsi bawaan (gaya laporan aktuaria PSAK 24): mengundurkan diri 5% sampai
+# usia 30 lalu turun linear ke 0% pada usia 55; cacat 10% dari q_x mortalita.
+ASUMSI_BAWAAN = {
+    "withdrawal_rate": 0.05,
+    "withdrawal_flat_until": 30,
+    "withdrawal_zero_age": 55,
+    "disability_factor": 0.10,
+}
+
+
+def withdrawal_scale(ages, rate=0.05, flat_until=30, zero_age=55):
+    """Tingkat pengunduran diri per usia: datar `rate` s.d. `flat_until`, linear ke 0 pada `zero_age`."""
+    ages = np.asarray(ages, dtype=float)
+    if zero_age <= flat_until:
+        return np.where(ages <= flat_until, rate, 0.0)
+    return rate * np.clip((zero_age - ages) / (zero_age - flat_until), 0.0, 1.0)
+
+
+def _dependen(q_indep):
+    """
+    Probabilitas dependen dari tingkat independen (UDD per decrement).
+
+    q(j) = q'(j) * INT_0^1 PROD_{k != j} (1 - s q'(k)) ds, dihitung lewat
+    koefisien polinomial hasil kali (berlaku untuk jumlah decrement berapa pun).
+    """
+    hasil = []
+    for j, qj in enumerate(q_indep):
+        # Koefisien polinomial dalam s: mulai dari 1, kalikan (1 - s q'(k))
+        koef = [np.ones_like(qj)]
+        for k, qk in enumerate(q_indep):
+            if k == j:
+                continue
+            baru = [koef[0]] + [koef[m] - qk * koef[m - 1] for m in range(1, len(koef))] + [-qk * koef[-1]]
+            koef = baru
+        integral = sum(c / (m + 1) for m, c in enumerate(koef))
+        hasil.append(qj * integral)
+    return hasil
+
+
+class ServiceTable:
+    """
+    Tabel layanan satu gender: probabilitas dependen per decrement & l^τ per usia.
+
+    Semua array diindeks langsung dengan usia (indeks 0 = usia 0), format sama
+    dengan `MortalityTable.lx_by_age`: NaN di bawah usia awal, l^τ = 0 setelah
+    usia pensiun normal.
+
+    Attributes:
+        q (dict): decrement -> q^(j)_x per usia.
+        q_tau (np.ndarray): Total probabilitas keluar dari layanan per usia.
+        lx_by_age (np.ndarray): l^τ_x (radix 1 pada usia awal tabel).
+    """
+
+    def __init__(self, name, gender, retirement_age, q, lx_by_age, min_age):
+        self.name = name
+        self.gender = gender
+        self.retirement_age = retirement_age
+        self.q = q
+        self.q_tau = sum(q.values())
+        self.lx_by_age = lx_by_age
+        self.min_age = min_age
+        self.max_age = retirement_age
+
+    @property
+    def label(self):
+        return f"Layanan {TABEL_MORTALITA.get(self.name, self.name)} {self.gender.upper()} (NPA {self.retirement_age})"
+
+    def __repr__(self):
+        return f"ServiceTable({self.label})"
+
+    def _cek(self, ages):
+        ages = np.asarray(ages)
+        if np.any(ages < self.min_age) or np.any(ages > self.max_age):
+            raise ValueError(f"Usia harus di antara {self.min_age} dan {self.max_age} untuk {self.label}.")
+        return ages
+
+    def _gather(self, ages, T):
+        """Indeks usia x+t (dibatasi ujung array) untuk t = 0..T-1, shape ages.shape + (T,)."""
+        return np.minimum(np.asarray(ages)[..., None] + np.arange(T), len(self.lx_by_age) - 1)
+
+    def in_service(self, ages, to_ages):
+        """Peluang masih dalam layanan dari usia `ages` sampai usia `to_ages`."""
+        ages = self._cek(ages)
+        ke = np.minimum(np.asarray(to_ages), len(self.lx_by_age) - 1)
+        hasil = self.lx_by_age[ke] / self.lx_by_age[ages]
+        return hasil if np.ndim(hasil) else float(hasil)
+
+    def survival(self, ages, T):
+        """tpx^τ untuk t = 0..T-1, shape ages.shape + (T,)."""
+        ages = self._cek(ages)
+        return self.lx_by_age[self._gather(ages, T)] / self.lx_by_age[ages][..., None]
+
+    def decrement_probabilities(self, ages, T):
+        """t|q^(j)_x = tpx^τ * q^(j)_{x+t} per decrement, shape ages.shape + (T,)."""
+        p = self.survival(ages, T)
+        idx = self._gather(ages, T)
+        return {j: p * self.q[j][idx] for j in DECREMENT}
+
+    def retirement_probability(self, ages):
+        """Peluang peserta usia `ages` mencapai usia pensiun normal dalam layanan."""
+        return self.in_service(ages, self.retirement_age)
+
+    def annuity_due(self, ages, rates, durations=None):
+        """Anuitas layanan ä^τ_x:n| (sampai usia pensiun bila `durations` None) lewat kolom komutasi."""
+        from pensiun.annuity import _annuity_due_table
+
+        ages, rates = np.broadcast_arrays(np.asarray(ages, dtype=int), np.asarray(rates, dtype=float))
+        n = None if durations is None else np.broadcast_to(np.asarray(durations, dtype=int), ages.shape)
+        hasil = _annuity_due_table(self, ages, rates, n)
+        return hasil if hasil.ndim else float(hasil)
+
+    def accumulation_factor(self, ages, years, salary_increase_rate, invest_return_rate):
+        """
+        Faktor akumulasi iuran harapan: SUM_t (1+s)^t * tpx^τ * (1+i)^(n-1-t), t = 0..n-1.
+
+        Pengganti `growing_annuity_fv(s, i, n)` bila iuran hanya masuk selama
+        peserta masih dalam layanan. Ini iuran bruto, termasuk iuran peserta
+        yang kemudian keluar; `simulate_jp_deficit` mengurangkan dana yang
+        dikembalikan kepada mereka. Semua argumen di-broadcast;
+        `salary_increase_rate` boleh berupa `pensiun.salary.SalaryScale`.
+        """
+        ages, years = self._cek(ages), np.asarray(years)
+        if isinstance(salary_increase_rate, SalaryScale):
+            T = int(years.max()) if years.size else 0
+            return salary_increase_rate.accumulation_factor(ages, years, invest_return_rate,
+                                                            survival=self.survival(ages, T))
+        s = np.asarray(salary_increase_rate, dtype=float)
+        i = np.asarray(invest_return_rate, dtype=float)
+        T = int(years.max()) if years.size else 0
+        p = self.survival(ages, T)
+        if ages.ndim == 0 and years.ndim == 0:
+            # Satu usia masuk & masa kerja: polinomial dalam (1+s)/(1+i), dievaluasi dengan Horner
+            rasio = (1 + s) / (1 + i)
+            hasil = np.zeros(rasio.shape)
+            for t in range(T - 1, -1, -1):
+                hasil = hasil * rasio + p[t]
+            hasil = hasil * (1 + i) ** (years - 1)
+            return hasil if hasil.ndim else float(hasil)
+        # Loop per tahun (T <= ~40) dengan faktor bergulir: memori O(jumlah skenario), tanpa pangkat per tahun
+        hasil = np.zeros(np.broadcast_shapes(ages.shape, years.shape, s.shape, i.shape))
+        gaji, bunga = np.ones_like(s), (1 + i) ** (years - 1)
+        for t in range(T):
+            hasil += gaji * bunga * np.where(t < years, p[..., t], 0.0)
+            gaji = gaji * (1 + s)
+            bunga = bunga / (1 + i)
+        return hasil if hasil.ndim else float(hasil)
+
+
+def build_service_table(table="tmi_4", gender="m", retirement_age=56, withdrawal_rate=0.05,
+                        withdrawal_flat_until=30, withdrawal_zero_age=55, disability_factor=0.10,
+                        early_retirement=None):
+    """
+    Membangun `ServiceTable` dari tabel mortalita terdaftar.
+
+    Args:
+        withdrawal_rate, withdrawal_flat_until, withdrawal_zero_age: skala `withdrawal_scale`.
+        disability_factor (float): q'(cacat) = faktor x q_x mortalita.
+        early_retirement (tuple): Pasangan (usia, tingkat) pensiun dini sebelum usia pensiun normal.
+    """
+    mortalita = load_table(table, gender)
+    if not mortalita.min_age < retirement_age <= mortalita.max_age:
+        raise ValueError(f"Usia pensiun harus di antara {mortalita.min_age + 1} dan {mortalita.max_age}.")
+    A = mortalita.max_age + 2
+    usia = np.arange(A)
+    q_mati = np.zeros(A)
+    q_mati[mortalita.min_age:mortalita.max_age + 1] = mortalita.qx
+    q_keluar = withdrawal_scale(usia, withdrawal_rate, withdrawal_flat_until, withdrawal_zero_age)
+    q_cacat = disability_factor * q_mati
+
+    q_pensiun = np.zeros(A)
+    for x, laju in (early_retirement or ()):
+        if not mortalita.min_age <= x < retirement_age:
+            raise ValueError(f"Usia pensiun dini {x} harus di bawah usia pensiun normal {retirement_age}.")
+        q_pensiun[x] = laju
+    q_pensiun[retirement_age:] = 1.0
+
+    sisa = 1 - q_pensiun
+    q = dict(zip(DECREMENT[:3], (sisa * qj for qj in _dependen([q_mati, q_keluar, q_cacat]))))
+    q["retirement"] = q_pensiun
+    p_tau = sisa * (1 - q_mati) * (1 - q_keluar) * (1 - q_cacat)
+
+    lx = np.full(A, np.nan)
+    lx[mortalita.min_age:] = np.concatenate(([1.0], np.cumprod(p_tau[mortalita.min_age:-1])))
+    return ServiceTable(table, gender, retirement_age, q, lx, mortalita.min_age)
+
+
+@lru_cache(maxsize=None)
+def service_table(table="tmi_4", gender="m", retirement_age=56, **assumptions):
+    """`build_service_table` dengan cache per proses (kunci: tabel, gender, usia pensiun, asumsi)."""
+    return build_service_table(table, gender, retirement_age, **{**ASUMSI_BAWAAN, **assumptions})
+
+
+def service_tables(table="tmi_4", retirement_age=56, **assumptions):
+    """Tabel layanan untuk semua gender: dict gender -> `ServiceTable`."""
+    return {g: service_table(table, g, retirement_age, **assumptions) for g in GENDER}
+
+
+# ==============================================================================
+# DEMO: DECREMENT PESERTA AKTIF SAMPAI PENSIUN
+# ==============================================================================
+if __name__ == "__main__":
+    import time
+
+    from pensiun.annuity import annuity_due
+    from pensiun.valuation import simulate_jp_deficit
+
+    for g, layanan in service_tables("tmi_4", 56).items():
+        print(f"--- {layanan.label} ---")
+        print(f"{'Usia':>5} | {'q(mati)':>9} | {'q(keluar)':>9} | {'q(cacat)':>9} | {'l^τ':>8}")
+        for x in (20, 25, 30, 40, 50, 55, 56):
+            print(f"{x:>5} | {layanan.q['death'][x]:>9.5f} | {layanan.q['withdrawal'][x]:>9.5f} | "
+                  f"{layanan.q['disability'][x]:>9.5f} | {layanan.lx_by_age[x]:>8.5f}")
+        peluang = layanan.decrement_probabilities(25, 32)
+        total = {j: v.sum() for j, v in peluang.items()}
+        print("Masuk usia 25, nasib peserta: " + ", ".join(f"{j} {v:.1%}" for j, v in total.items()))
+        print(f"ä^τ_25 (sampai 56) @ 5.7% = {layanan.annuity_due(25, 0.057):.4f} "
+              f"vs ä_25:31| mortalita saja = {annuity_due(25, 0.057, g, durations=31):.4f}\n")
+
+    layanan = service_table("tmi_4", "m", 56)
+    tanpa = simulate_jp_deficit(2_500_000, 32, 0.0787, 0.0653, 0.057)
+    dengan = simulate_jp_deficit(2_500_000, 32, 0.0787, 0.0653, 0.057, service=layanan)
+    print("JP Slide 17 per peserta baru (usia 24, masa kerja 32):")
+    for k in ("asset", "liability", "funding_ratio"):
+        print(f"  {k:<14}: tanpa decrement {tanpa[k]:>16,.2f} | dengan decrement {dengan[k]:>16,.2f}")
+    print(f"  {'exit_benefit':<14}: dana dikembalikan ke peserta keluar (nilai di usia pensiun) "
+          f"{dengan['exit_benefit']:>16,.2f}")
+
+    N = 1_000_000
+    rng = np.random.default_rng(45)
+    s, i = rng.uniform(0.03, 0.10, N), rng.uniform(0.04, 0.09, N)
+    mulai = time.perf_counter()
+    simulate_jp_deficit(2_500_000, 32, s, i, 0.057)
+    t_tanpa = time.perf_counter() - mulai
+    mulai = time.perf_counter()
+    simulate_jp_deficit(2_500_000, 32, s, i, 0.057, service=layanan)
+    print(f"\n{N:,} skenario: tanpa decrement {t_tanpa:.2f} dtk, dengan decrement "
+          f"{time.perf_counter() - mulai:.2f} dtk")
@@ -0,0 +1,241 @@
+"""
+Kalkulator Iuran DPLK Tervektorisasi.
+
+Versi batch dari alur `kalkulator2.py` (JHT + Pesangon UUCK + PV Jaminan
+Pensiun -> gap terhadap target IRR -> iuran DPLK bulanan). Semua input boleh
+berupa array sehingga ribuan peserta dihitung dalam satu kali panggil tanpa
+looping per orang. `dplk_contribution_paths` memakai jalur skenario ESG
+(`pensiun.esg`). Dengan `tax_regulation` (misal "pp68_2009"), JHT dan
+pesangon dikurangi PPh 21 final (`pensiun.tax`) sebelum dihitung gap-nya.
+"""
+
+import numpy as np
+
+from pensiun import finmath
+from pensiun.annuity import annuity_due
+from pensiun.salary import SalaryScale
+from pensiun.tax import benefit_taxes
+
+# ==============================================================================
+# ASUMSI PROGRAM (sama dengan TAHAP 1 di kalkulator2.py)
+# ==============================================================================
+IURAN_JHT_TOTAL = 0.057  # 5.7% (Perusahaan + Pekerja)
+USIA_PENSIUN_JP = 60
+USIA_MULAI_IURAN_JP = 25
+BATAS_ATAS_MANFAAT_JP = 4_792_300
+
+# PP 35/2021 Pasal 40 (sheet 'Referensi' di Dashboard.xlsx)
+# Uang Pesangon: masa kerja < 1 thn = 1 bln, ..., >= 8 thn = 9 bln
+BATAS_UP_TAHUN = np.array([1, 2, 3, 4, 5, 6, 7, 8])
+FAKTOR_UP_BULAN = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9])
+# Uang Penghargaan Masa Kerja: < 3 thn = 0, 3-6 = 2, ..., >= 24 = 10
+BATAS_UPMK_TAHUN = np.array([3, 6, 9, 12, 15, 18, 21, 24])
+FAKTOR_UPMK_BULAN = np.array([0, 2, 3, 4, 5, 6, 7, 8, 10])
+PENGALI_UP_PENSIUN = 1.75
+PERSEN_UPH = 0.15
+
+
+# ==============================================================================
+# KOMPONEN MANFAAT
+# ==============================================================================
+
+def final_wage(start_wage, salary_increase_rate, years):
+    """Gaji bulanan di akhir masa kerja: W * (1 + s)^n."""
+    return np.asarray(start_wage, dtype=float) * (1 + np.asarray(salary_increase_rate)) ** np.asarray(years)
+
+
+def jht_balance(start_wage, salary_increase_rate, invest_return_rate, years, contribution_rate=IURAN_JHT_TOTAL):
+    """
+    Saldo JHT di usia pensiun dalam bentuk tertutup.
+
+    Setara dengan `hitung_akumulasi_jht` (iterasi per tahun):
+        SUM_t c * 12W * (1+s)^t * (1+i)^(n-1-t)
+        = c * 12W * ((1+i)^n - (1+s)^n) / (i - s)      jika i != s
+        = c * 12W * n * (1+i)^(n-1)                     jika i == s
+    """
+    iuran_awal = np.asarray(start_wage, dtype=float) * 12 * contribution_rate
+    return iuran_awal * finmath.growing_annuity_fv(salary_increase_rate, invest_return_rate, years)
+
+
+def pesangon_uuck(final_monthly_wage, years_of_service):
+    """
+    Total pesangon pensiun sesuai PP 35/2021 (UP 1.75x + UPMK + UPH 15%).
+
+    Sama dengan `hitung_pesangon_uuck` di kalkulator2.py, tetapi faktor bulan
+    diambil lewat `np.searchsorted` sehingga berlaku untuk array masa kerja.
+    """
+    masa_kerja = np.asarray(years_of_service, dtype=float)
+    up_bulan = FAKTOR_UP_BULAN[np.searchsorted(BATAS_UP_TAHUN, masa_kerja, side="right")]
+    upmk_bulan = FAKTOR_UPMK_BULAN[np.searchsorted(BATAS_UPMK_TAHUN, masa_kerja, side="right")]
+    up_pensiun_bulan = PENGALI_UP_PENSIUN * up_bulan
+    total_faktor_pengali = (up_pensiun_bulan + upmk_bulan) * (1 + PERSEN_UPH)
+    return total_faktor_pengali * np.asarray(final_monthly_wage, dtype=float)
+
+
+def pv_jp_benefit(final_monthly_wage, retirement_age, invest_return_rate, gender="m", table="tmi_4",
+                  jp_retirement_age=USIA_PENSIUN_JP, jp_start_age=USIA_MULAI_IURAN_JP,
+                  jp_benefit_cap=BATAS_ATAS_MANFAAT_JP):
+    """
+    PV manfaat Jaminan Pensiun di usia pensiun (logika `hitung_pv_manfaat_jp`).
+
+    Jika pensiun DPLK setelah usia JP (misal grid `inverse.retirement_age`
+    sampai 70), JP sudah dibayar sejak `jp_retirement_age`: yang tersisa
+    dinilai sebagai anuitas di usia pensiun sebenarnya, tanpa diskonto maju.
+
+    Returns:
+        tuple: (pv_jp, manfaat_jp_bulanan, faktor_anuitas_jp)
+    """
+    masa_iuran_bulan = (jp_retirement_age - jp_start_age) * 12
+    manfaat_bulanan_raw = 0.01 * masa_iuran_bulan * np.asarray(final_monthly_wage, dtype=float)
+    manfaat_jp_bulanan = np.minimum(manfaat_bulanan_raw, jp_benefit_cap)
+
+    usia_mulai_jp = np.maximum(jp_retirement_age, np.asarray(retirement_age))
+    faktor_anuitas_jp = annuity_due(usia_mulai_jp, invest_return_rate, gender, table)
+    nilai_lump_sum = manfaat_jp_bulanan * 12 * faktor_anuitas_jp
+    periode_diskonto = usia_mulai_jp - np.asarray(retirement_age)
+    pv_jp = nilai_lump_sum / (1 + np.asarray(invest_return_rate)) ** periode_diskonto
+    return pv_jp, manfaat_jp_bulanan, faktor_anuitas_jp
+
+
+def _pajak(jht, pesangon, tax_regulation, npwp):
+    """PPh 21 final JHT + pesangon; nol bila `tax_regulation` None (perilaku bruto lama)."""
+    if tax_regulation is None:
+        return np.zeros(np.broadcast_shapes(np.shape(jht), np.shape(pesangon)))
+    return benefit_taxes(jht, pesangon, tax_regulation, npwp)["tax"]
+
+
+# ==============================================================================
+# ALUR UTAMA
+# ==============================================================================
+
+def existing_benefits(start_wage, start_age, retirement_age, salary_increase_rate=0.05,
+                      invest_return_rate=0.06, gender="m", table="tmi_4", include_jp=True,
+                      tax_regulation=None, npwp=True):
+    """
+    Tahap 1-3 kalkulator2.py: dana JHT + Pesangon + PV JP dan pensiun bulanannya.
+
+    Dipakai bersama oleh `dplk_contribution` dan solver invers (`pensiun.inverse`).
+    `salary_increase_rate` boleh berupa `pensiun.salary.SalaryScale` (usia masuk = `start_age`).
+    `tax_regulation` (nama regulasi di `pensiun.tax.REGULASI`) membuat `total_fund`
+    neto PPh 21 final atas JHT & pesangon; PV JP tetap bruto (dibayar bulanan).
+    """
+    start_wage = np.asarray(start_wage, dtype=float)
+    masa_kerja = np.asarray(retirement_age) - np.asarray(start_age)
+    i = np.asarray(invest_return_rate, dtype=float)
+
+    if isinstance(salary_increase_rate, SalaryScale):
+        gaji_akhir = salary_increase_rate.final_wage(start_wage, start_age, masa_kerja)
+        jht = (start_wage * 12 * IURAN_JHT_TOTAL
+               * salary_increase_rate.accumulation_factor(start_age, masa_kerja, i))
+    else:
+        gaji_akhir = final_wage(start_wage, salary_increase_rate, masa_kerja)
+        jht = jht_balance(start_wage, salary_increase_rate, i, masa_kerja)
+    pesangon = pesangon_uuck(gaji_akhir, masa_kerja)
+    if include_jp:
+        pv_jp, _, _ = pv_jp_benefit(gaji_akhir, retirement_age, i, gender, table)
+    else:
+        pv_jp = np.zeros_like(gaji_akhir)
+    pajak = _pajak(jht, pesangon, tax_regulation, npwp)
+    total_dana = jht + pesangon + pv_jp - pajak
+
+    faktor_anuitas = annuity_due(retirement_age, i, gender, table)
+    return {
+        "final_wage": gaji_akhir,
+        "jht": jht,
+        "pesangon": pesangon,
+        "pv_jp": pv_jp,
+        "tax": pajak,
+        "total_fund": total_dana,
+        "annuity_factor": faktor_anuitas,
+        "existing_pension": total_dana / (faktor_anuitas * 12),
+    }
+
+
+def dplk_contribution(start_wage, start_age, retirement_age, salary_increase_rate=0.05,
+                      invest_return_rate=0.06, target_irr=0.80, gender="m", table="tmi_4",
+                      include_jp=True, tax_regulation=None, npwp=True):
+    """
+    Iuran DPLK bulanan yang dibutuhkan untuk mencapai target IRR, per peserta.
+
+    Semua argumen boleh skalar atau array (di-broadcast). Hasil berupa dict
+    array dengan tahapan yang sama seperti laporan kalkulator2.py. Dengan
+    `tax_regulation`, dana yang ada dihitung neto pajak sehingga gap dan iuran
+    DPLK naik; pajak dihitung tervektorisasi untuk semua peserta sekaligus.
+    """
+    masa_kerja = np.asarray(retirement_age) - np.asarray(start_age)
+    i = np.asarray(invest_return_rate, dtype=float)
+
+    # 1-3. Gaji akhir, manfaat yang sudah ada (JHT, Pesangon, JP) & pensiun bulanannya
+    ada = existing_benefits(start_wage, start_age, retirement_age, salary_increase_rate, i, gender,
+                            table, include_jp, tax_regulation, npwp)
+    gaji_akhir = ada["final_wage"]
+    target_pensiun = gaji_akhir * target_irr
+    faktor_anuitas = ada["annuity_factor"]
+    manfaat_existing = ada["existing_pension"]
+
+    # 4. Gap & 5. kebutuhan dana DPLK -> iuran bulanan (PMT dengan pv = 0)
+    gap = target_pensiun - manfaat_existing
+    kebutuhan_dana = np.maximum(gap, 0) * faktor_anuitas * 12
+    r = (1 + i) ** (1 / 12) - 1
+    iuran = -finmath.pmt(r, masa_kerja * 12, 0.0, kebutuhan_dana)
+
+    return {
+        "final_wage": gaji_akhir,
+        "target_pension": target_pensiun,
+        "jht": ada["jht"],
+        "pesangon": ada["pesangon"],
+        "pv_jp": ada["pv_jp"],
+        "tax": ada["tax"],
+        "total_fund": ada["total_fund"],
+        "annuity_factor": faktor_anuitas,
+        "existing_pension": manfaat_existing,
+        "gap": gap,
+        "dplk_fund": kebutuhan_dana,
+        "dplk_contribution": iuran,
+    }
+
+
+def dplk_contribution_paths(scenarios, start_wage, start_age, retirement_age, target_irr=0.80, gender="m",
+                            table="tmi_4", include_jp=True, tax_regulation=None, npwp=True):
+    """
+    `dplk_contribution` dengan jalur gaji & return dari `pensiun.esg.ScenarioSet`.
+
+    Akumulasi JHT, gaji akhir dan iuran DPLK mengikuti jalur tiap skenario;
+    konversi anuitas dan diskonto JP memakai rata-rata geometrik return jalur
+    selama masa kerja (sama dengan `invest_return_rate` untuk jalur konstan).
+    """
+    masa_kerja = np.asarray(retirement_age) - np.asarray(start_age)
+    start_wage = np.asarray(start_wage, dtype=float)
+    i = scenarios.mean_return(masa_kerja)
+
+    gaji_akhir = scenarios.final_wage(start_wage, masa_kerja)
+    jht = start_wage * 12 * IURAN_JHT_TOTAL * scenarios.accumulation_factor(masa_kerja)
+    pesangon = pesangon_uuck(gaji_akhir, masa_kerja)
+    if include_jp:
+        pv_jp, _, _ = pv_jp_benefit(gaji_akhir, retirement_age, i, gender, table)
+    else:
+        pv_jp = np.zeros_like(gaji_akhir)
+    pajak = _pajak(jht, pesangon, tax_regulation, npwp)
+    total_dana = jht + pesangon + pv_jp - pajak
+    faktor_anuitas = annuity_due(retirement_age, i, gender, table)
+    manfaat_existing = total_dana / (faktor_anuitas * 12)
+
+    target_pensiun = gaji_akhir * target_irr
+    gap = target_pensiun - manfaat_existing
+    kebutuhan_dana = np.maximum(gap, 0) * faktor_anuitas * 12
+    iuran = kebutuhan_dana / scenarios.level_contribution_fv(masa_kerja)
+
+    return {
+        "final_wage": gaji_akhir,
+        "target_pension": target_pensiun,
+        "jht": jht,
+        "pesangon": pesangon,
+        "pv_jp": pv_jp,
+        "tax": pajak,
+        "total_fund": total_dana,
+        "annuity_factor": faktor_anuitas,
+        "existing_pension": manfaat_existing,
+        "gap": gap,
+        "dplk_fund": kebutuhan_dana,
+        "dplk_contribution": iuran,
+    }
@@ -0,0 +1,323 @@
+"""
+Economic Scenario Generator (ESG) dengan Output yang Bisa Dipakai Ulang.
+
+Run stokastik & sensitivitas selama ini membangkitkan ulang jalur kenaikan
+gaji / return investasi / inflasi yang sama setiap kali dijalankan. Modul ini
+membangkitkan satu set skenario SEKALI, menyimpannya sebagai:
+
+    <nama>.npy    array float32 shape (3, skenario, tahun): salary, return, inflation
+    <nama>.json   metadata: model, seed, parameter, shape, dtype
+
+File .npy dibuka dengan memory map, sehingga `simulate_jp_deficit_paths`,
+`actuarial_balance_paths` (pensiun.valuation) dan `dplk_contribution_paths`
+(pensiun.dplk) membaca jalur yang sama dari disk tanpa menyalinnya. Hasil
+antar model tetap sebanding karena semua model memakai set skenario yang sama.
+
+Konvensi waktu sama dengan mesin deterministik: tahun ke-t memakai kenaikan
+gaji s_t dan return i_t. Dengan model "constant", semua fungsi *_paths
+memberikan hasil yang sama dengan versi bunga tunggalnya.
+
+    python -m pensiun.esg    # bangkitkan contoh, cek kesetaraan & waktu pakai ulang
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+VARIABEL = ("salary", "return", "inflation")
+VERSI_FORMAT = 1
+UKURAN_CHUNK_SKENARIO = 65_536
+# Blok skenario untuk prefix product/sum (float64) saat query; set yang muat
+# dalam satu blok prefix-nya di-cache, set besar dialirkan blok per blok dari memmap
+UKURAN_BLOK_PREFIX = 16_384
+
+# Parameter bawaan model AR(1) inflasi + spread riil (angka tahunan)
+PARAMETER_AR1 = {
+    "inflation_mean": 0.035,
+    "inflation_start": 0.03,
+    "inflation_phi": 0.6,
+    "inflation_sigma": 0.01,
+    "real_wage_growth": 0.02,
+    "wage_sigma": 0.01,
+    "real_return": 0.03,
+    "return_sigma": 0.05,
+    "wage_return_corr": 0.2,
+}
+PARAMETER_CONSTANT = {"salary": 0.05, "return": 0.06, "inflation": 0.03}
+
+
+# ==============================================================================
+# MODEL
+# ==============================================================================
+
+def _model_ar1(rng, n_skenario, tahun, p):
+    """
+    Inflasi AR(1) di sekitar rata-rata jangka panjang; kenaikan gaji dan
+    return = inflasi + spread riil + shock (berkorelasi).
+    """
+    pi = np.empty((n_skenario, tahun))
+    sebelum = np.full(n_skenario, p["inflation_start"])
+    for t in range(tahun):
+        sebelum = (p["inflation_mean"] + p["inflation_phi"] * (sebelum - p["inflation_mean"])
+                   + p["inflation_sigma"] * rng.standard_normal(n_skenario))
+        pi[:, t] = sebelum
+    z1 = rng.standard_normal((n_skenario, tahun))
+    z2 = p["wage_return_corr"] * z1 + np.sqrt(1 - p["wage_return_corr"] ** 2) * rng.standard_normal(
+        (n_skenario, tahun))
+    gaji = pi + p["real_wage_growth"] + p["wage_sigma"] * z1
+    imbal = pi + p["real_return"] + p["return_sigma"] * z2
+    return gaji, imbal, pi
+
+
+def _model_constant(rng, n_skenario, tahun, p):
+    """Semua jalur konstan (untuk rekonsiliasi dengan mesin deterministik)."""
+    return tuple(np.full((n_skenario, tahun), p[v]) for v in VARIABEL)
+
+
+MODEL = {
+    "ar1": (_model_ar1, PARAMETER_AR1),
+    "constant": (_model_constant, PARAMETER_CONSTANT),
+}
+
+
+# ==============================================================================
+# SET SKENARIO
+# ==============================================================================
+
+class ScenarioSet:
+    """
+    Jalur salary / return / inflation per skenario (array atau memmap read-only).
+
+    Fungsi jalur di bawah memakai prefix product / prefix sum sepanjang sumbu
+    tahun, sehingga masa kerja boleh berbeda per peserta (array `years`) dan
+    hasilnya ter-broadcast dengan sumbu skenario. Prefix dihitung per blok
+    `UKURAN_BLOK_PREFIX` skenario langsung dari memmap, jadi memori kerja tidak
+    tumbuh dengan jumlah skenario (hanya set kecil yang prefix-nya di-cache).
+    """
+
+    def __init__(self, data, meta):
+        self.data = data
+        self.meta = meta
+        self._prefix = None
+
+    @classmethod
+    def load(cls, path):
+        """Membuka `<path>.npy` (memory map, read-only) beserta `<path>.json`."""
+        path = Path(path)
+        meta = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+        return cls(np.load(path.with_suffix(".npy"), mmap_mode="r"), meta)
+
+    def __repr__(self):
+        return (f"ScenarioSet(model={self.meta['model']!r}, seed={self.meta['seed']}, "
+                f"skenario={self.n_scenarios:,}, tahun={self.years})")
+
+    def __getitem__(self, idx):
+        """Subset skenario (view, tanpa salinan)."""
+        data = self.data[:, idx]
+        meta = dict(self.meta, n_scenarios=int(data.shape[1]))
+        return ScenarioSet(data, meta)
+
+    @property
+    def n_scenarios(self):
+        return self.data.shape[1]
+
+    @property
+    def years(self):
+        return self.data.shape[2]
+
+    @property
+    def salary(self):
+        return self.data[0]
+
+    @property
+    def returns(self):
+        return self.data[1]
+
+    @property
+    def inflation(self):
+        return self.data[2]
+
+    # --- Kernel jalur ---
+
+    def _blok(self, awal, akhir):
+        """Memo prefix satu blok skenario (di-cache jika seluruh set muat dalam satu blok)."""
+        if self._prefix is not None:
+            return self._prefix
+        memo = {"s": np.asarray(self.data[0, awal:akhir], dtype=float),
+                "i": np.asarray(self.data[1, awal:akhir], dtype=float)}
+        if akhir - awal == self.n_scenarios:
+            self._prefix = memo
+        return memo
+
+    @staticmethod
+    def _kumulatif(memo, nama):
+        """Prefix array shape (skenario blok, tahun + 1), float64, dihitung sekali per memo."""
+        if nama not in memo:
+            s, i = memo["s"], memo["i"]
+            satu, nol = np.ones((len(s), 1)), np.zeros((len(s), 1))
+            kumulatif = ScenarioSet._kumulatif
+            if nama == "wage":      # W_k = PROD_{u<k} (1 + s_u)
+                hasil = np.hstack([satu, np.cumprod(1 + s, axis=1)])
+            elif nama == "growth":  # C_k = PROD_{u<k} (1 + i_u)
+                hasil = np.hstack([satu, np.cumprod(1 + i, axis=1)])
+            elif nama == "wage_sum":  # SUM_{t<k} W_t
+                hasil = np.hstack([nol, np.cumsum(kumulatif(memo, "wage")[:, :-1], axis=1)])
+            elif nama == "contrib":   # SUM_{t<k} W_t / C_{t+1}
+                w, c = kumulatif(memo, "wage"), kumulatif(memo, "growth")
+                hasil = np.hstack([nol, np.cumsum(w[:, :-1] / c[:, 1:], axis=1)])
+            elif nama == "level":     # SUM_{t<k} s12_t / C_{t+1}, s12 = FV 12 iuran akhir bulan
+                r = (1 + i) ** (1 / 12) - 1
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    s12 = np.where(r == 0, 12.0, ((1 + r) ** 12 - 1) / np.where(r == 0, 1.0, r))
+                hasil = np.hstack([nol, np.cumsum(s12 / kumulatif(memo, "growth")[:, 1:], axis=1)])
+            else:
+                raise KeyError(nama)
+            memo[nama] = hasil
+        return memo[nama]
+
+    def _ambil(self, years, *names):
+        """Gather prefix[skenario, years] per nama, broadcast years x skenario, blok demi blok."""
+        years = np.asarray(years).astype(int)
+        if np.any(years < 0) or np.any(years > self.years):
+            raise ValueError(f"Masa kerja harus di antara 0 dan {self.years} tahun (panjang skenario).")
+        S = self.n_scenarios
+        years = np.broadcast_to(years, np.broadcast_shapes(years.shape, (S,)))
+        hasil = [np.empty(years.shape) for _ in names]
+        for awal in range(0, S, UKURAN_BLOK_PREFIX):
+            akhir = min(S, awal + UKURAN_BLOK_PREFIX)
+            memo = self._blok(awal, akhir)
+            tahun = years[..., awal:akhir]
+            baris = np.arange(akhir - awal)
+            for h, nama in zip(hasil, names):
+                h[..., awal:akhir] = self._kumulatif(memo, nama)[baris, tahun]
+        return hasil if len(names) > 1 else hasil[0]
+
+    def final_wage(self, start_wage, years):
+        """Gaji bulanan setelah `years` tahun: W * PROD (1 + s_t)."""
+        return np.asarray(start_wage, dtype=float) * self._ambil(years, "wage")
+
+    def average_wage(self, start_wage, years):
+        """Rata-rata upah nominal selama masa kerja."""
+        return np.asarray(start_wage, dtype=float) * self._ambil(years, "wage_sum") / np.asarray(years)
+
+    def accumulation_factor(self, years):
+        """SUM_t W_t * PROD_{u=t+1}^{n-1} (1 + i_u): padanan `growing_annuity_fv` untuk jalur."""
+        growth, contrib = self._ambil(years, "growth", "contrib")
+        return growth * contrib
+
+    def level_contribution_fv(self, years):
+        """FV iuran bulanan tetap 1 (akhir bulan) selama `years` tahun: padanan FV anuitas bulanan."""
+        growth, level = self._ambil(years, "growth", "level")
+        return growth * level
+
+    def mean_return(self, years):
+        """Rata-rata geometrik return selama `years` tahun (untuk konversi anuitas)."""
+        return self._ambil(years, "growth") ** (1 / np.asarray(years, dtype=float)) - 1
+
+
+# ==============================================================================
+# PEMBANGKITAN & PENYIMPANAN
+# ==============================================================================
+
+def generate(path, n_scenarios, years, seed=2025, model="ar1", params=None, dtype="float32"):
+    """
+    Membangkitkan skenario langsung ke `<path>.npy` (chunk per skenario, tanpa
+    menahan seluruh array di memori) dan menulis metadata `<path>.json`.
+
+    Returns:
+        ScenarioSet: set yang baru dibuat (memory map).
+    """
+    if model not in MODEL:
+        raise KeyError(f"Model '{model}' tidak dikenal. Pilihan: {', '.join(MODEL)}")
+    fungsi, bawaan = MODEL[model]
+    params = {**bawaan, **(params or {})}
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    arr = np.lib.format.open_memmap(path.with_suffix(".npy"), mode="w+", dtype=dtype,
+                                    shape=(len(VARIABEL), n_scenarios, years))
+    rng = np.random.default_rng(seed)
+    for awal in range(0, n_scenarios, UKURAN_CHUNK_SKENARIO):
+        n = min(UKURAN_CHUNK_SKENARIO, n_scenarios - awal)
+        for k, jalur in enumerate(fungsi(rng, n, years, params)):
+            arr[k, awal:awal + n] = jalur
+    arr.flush()
+    del arr
+
+    meta = {
+        "format_version": VERSI_FORMAT,
+        "model": model,
+        "seed": seed,
+        "params": params,
+        "n_scenarios": n_scenarios,
+        "years": years,
+        "variables": list(VARIABEL),
+        "dtype": dtype,
+    }
+    path.with_suffix(".json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return ScenarioSet.load(path)
+
+
+def load_or_generate(path, n_scenarios, years, seed=2025, model="ar1", params=None, dtype="float32"):
+    """Memakai file yang ada jika metadatanya cocok; jika tidak, bangkitkan ulang."""
+    path = Path(path)
+    try:
+        set_lama = ScenarioSet.load(path)
+    except (FileNotFoundError, ValueError):
+        return generate(path, n_scenarios, years, seed, model, params, dtype)
+    meta = set_lama.meta
+    cocok = (meta.get("format_version") == VERSI_FORMAT and meta["model"] == model and meta["seed"] == seed
+             and meta["params"] == {**MODEL[model][1], **(params or {})}
+             and meta["n_scenarios"] == n_scenarios and meta["years"] == years and meta["dtype"] == dtype)
+    if cocok:
+        return set_lama
+    del set_lama
+    return generate(path, n_scenarios, years, seed, model, params, dtype)
+
+
+# ==============================================================================
+# DEMO
+# ==============================================================================
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from pensiun.dplk import dplk_contribution, dplk_contribution_paths
+    from pensiun.valuation import (actuarial_balance, actuarial_balance_paths, simulate_jp_deficit,
+                                   simulate_jp_deficit_paths)
+
+    with tempfile.TemporaryDirectory() as folder:
+        # 1. Model konstan harus sama dengan mesin deterministik
+        konstan = generate(Path(folder) / "konstan", 4, 40, model="constant",
+                           params={"salary": 0.0787, "return": 0.0653}, dtype="float64")
+        a = simulate_jp_deficit_paths(konstan, 2_500_000, 32, 0.057)["funding_ratio"][0]
+        b = simulate_jp_deficit(2_500_000, 32, 0.0787, 0.0653, 0.057)["funding_ratio"]
+        c = actuarial_balance_paths(konstan, 0.09, 0.015)["required_contribution"][0]
+        d = actuarial_balance(0.09, 0.015)["required_contribution"]
+        e = dplk_contribution_paths(konstan, 8_000_000, 30, 55)["dplk_contribution"][0]
+        f = dplk_contribution(8_000_000, 30, 55, 0.0787, 0.0653)["dplk_contribution"]
+        print("Model konstan vs deterministik (selisih relatif):")
+        print(f"  funding ratio JP   {abs(a / b - 1):.1e}")
+        print(f"  iuran wajar        {abs(c / d - 1):.1e}")
+        print(f"  iuran DPLK         {abs(e / f - 1):.1e}")
+
+        # 2. Bangkitkan sekali, pakai ulang di tiga mesin
+        basis = Path(folder) / "esg_ar1"
+        mulai = time.perf_counter()
+        skenario = load_or_generate(basis, 200_000, 45)
+        t_bangkit = time.perf_counter() - mulai
+        mulai = time.perf_counter()
+        skenario = load_or_generate(basis, 200_000, 45)
+        t_pakai = time.perf_counter() - mulai
+        ukuran = basis.with_suffix(".npy").stat().st_size / 2**20
+        print(f"\n{skenario}: {ukuran:,.1f} MB")
+        print(f"  bangkit {t_bangkit * 1e3:,.0f} ms, buka ulang (memmap) {t_pakai * 1e3:,.1f} ms")
+
+        fr = simulate_jp_deficit_paths(skenario, 2_500_000, 32, 0.057)["funding_ratio"]
+        iuran = actuarial_balance_paths(skenario, 0.09, 0.015)["required_contribution"]
+        dplk = dplk_contribution_paths(skenario, 8_000_000, 30, 55)["dplk_contribution"]
+        for nama, x in (("Funding ratio JP (%)", fr), ("Iuran wajar (%)", iuran), ("Iuran DPLK (Rp)", dplk)):
+            p5, p50, p95 = np.percentile(x, [5, 50, 95])
+            print(f"  {nama:<22} P5 {p5:>14,.2f} | P50 {p50:>14,.2f} | P95 {p95:>14,.2f}")
+        del skenario, konstan
@@ -0,0 +1,263 @@
+"""
+Valuasi Usia Pecahan dari Tanggal Eksak (Tanggal Lahir, Tanggal Masuk Kerja).
+
+Semua mesin memakai usia bulat (`usia_awal = 40`, `age_m=56, age_f=51`).
+Di produksi, valuasi dilakukan pada tanggal valuasi dari tanggal lahir dan
+tanggal masuk kerja, sehingga peserta berusia 40,7 tahun dianggap 40 atau 41
+dan PV melompat tepat di hari ulang tahun. Modul ini menyediakan:
+
+  - Aritmetika tanggal tervektorisasi pada array `datetime64[D]`:
+    `years_between` (tahun eksak: ulang tahun terakhir + pecahan hari sampai
+    ulang tahun berikutnya), `age_at` dan `service_at` dengan basis
+    "exact", "last" (ulang tahun terakhir) atau "nearest" (terdekat).
+  - Interpolasi tabel di antara usia bulat, x bulat dan 0 <= s < 1:
+        UDD            : l_{x+s} = (1 - s) l_x + s l_{x+1}
+        constant_force : l_{x+s} = l_x^(1-s) * l_{x+1}^s
+  - `annuity_due` untuk usia pecahan. Di bawah UDD, setiap l_{x+s+t}
+    linear dalam (l_{x+t}, l_{x+1+t}), sehingga
+
+        ä_{x+s:n|} = [(1-s) l_x ä_{x:n|} + s l_{x+1} ä_{x+1:n|}] / l_{x+s}
+
+    cukup dua gather dari kolom komutasi usia bulat (biaya ~2x mesin bulat).
+    Untuk constant force, tabel l_{y+s} dibuat sekali per pecahan s unik
+    (dari tanggal: paling banyak ~366 nilai), lalu komutasi & gather biasa.
+
+    usia = age_at(tanggal_lahir, "2025-12-31")
+    annuity_due(usia, 0.057, "m", frequency=12)            # UDD
+    annuity_due(usia, 0.057, "m", method="constant_force")
+"""
+
+import numpy as np
+
+from pensiun.annuity import _annuity_due_table
+from pensiun.mortality import load_table
+
+INTERPOLASI = ("udd", "constant_force")
+BASIS_USIA = ("exact", "last", "nearest")
+
+# Batas elemen matriks komutasi (bunga x pecahan x usia) per blok untuk constant force
+UKURAN_BLOK_KOMUTASI = 4_000_000
+
+
+# ==============================================================================
+# ARITMETIKA TANGGAL
+# ==============================================================================
+
+def to_dates(values):
+    """Array `datetime64[D]` dari string ISO / datetime / datetime64."""
+    return np.asarray(values, dtype="datetime64[D]")
+
+
+def _ulang_tahun(bulan_awal, hari, k):
+    """Tanggal ulang tahun ke-k (29 Feb di tahun non-kabisat jatuh ke 1 Mar)."""
+    return (bulan_awal + 12 * k).astype("datetime64[D]") + hari
+
+
+def years_between(start, end):
+    """
+    Selisih tahun eksak dari `start` ke `end` (array, di-broadcast).
+
+    Bagian bulat = jumlah ulang tahun yang sudah lewat; pecahan = hari sejak
+    ulang tahun terakhir / panjang tahun ulang tahun tersebut (365 atau 366).
+    """
+    start, end = np.broadcast_arrays(to_dates(start), to_dates(end))
+    bulan_awal = start.astype("datetime64[M]")
+    hari = (start - bulan_awal.astype("datetime64[D]")).astype("timedelta64[D]")
+    y = end.astype("datetime64[Y]").astype(int) - start.astype("datetime64[Y]").astype(int)
+    terakhir = _ulang_tahun(bulan_awal, hari, y)
+    lewat = terakhir > end
+    y = y - lewat
+    terakhir = np.where(lewat, _ulang_tahun(bulan_awal, hari, y), terakhir)
+    berikut = _ulang_tahun(bulan_awal, hari, y + 1)
+    hasil = y + (end - terakhir).astype(float) / (berikut - terakhir).astype(float)
+    return hasil if hasil.ndim else float(hasil)
+
+
+def _basis(tahun, basis):
+    if basis not in BASIS_USIA:
+        raise KeyError(f"Basis usia '{basis}' tidak dikenal. Pilihan: {', '.join(BASIS_USIA)}")
+    if basis == "last":
+        return np.floor(tahun).astype(int)
+    if basis == "nearest":
+        return np.floor(np.asarray(tahun) + 0.5).astype(int)
+    return tahun
+
+
+def age_at(birth_dates, valuation_date, basis="exact"):
+    """Usia pada tanggal valuasi: eksak (pecahan), ulang tahun terakhir, atau terdekat."""
+    return _basis(years_between(birth_dates, valuation_date), basis)
+
+
+def service_at(hire_dates, valuation_date, basis="exact"):
+    """Masa kerja pada tanggal valuasi (basis sama dengan `age_at`)."""
+    return _basis(years_between(hire_dates, valuation_date), basis)
+
+
+# ==============================================================================
+# INTERPOLASI TABEL
+# ==============================================================================
+
+def _pecah(ages, table):
+    """Usia pecahan -> (x bulat, s) dengan validasi rentang tabel."""
+    ages = np.asarray(ages, dtype=float)
+    if np.any(ages < table.min_age) or np.any(ages > table.max_age):
+        raise ValueError(f"Usia harus di antara {table.min_age} dan {table.max_age} untuk tabel {table.label}.")
+    x = np.floor(ages).astype(int)
+    return x, ages - x
+
+
+def _lx_pecahan(lx_by_age, x, s, method):
+    """l_{x+s} dari l_x dan l_{x+1} (lx_by_age: NaN di bawah tabel, 0 setelah ujung)."""
+    if method not in INTERPOLASI:
+        raise KeyError(f"Interpolasi '{method}' tidak dikenal. Pilihan: {', '.join(INTERPOLASI)}")
+    lx = np.nan_to_num(lx_by_age, nan=0.0)
+    batas = len(lx) - 1
+    l0, l1 = lx[np.minimum(x, batas)], lx[np.minimum(x + 1, batas)]
+    if method == "udd":
+        return (1 - s) * l0 + s * l1
+    with np.errstate(divide="ignore"):
+        return np.where(s == 0, l0, np.where(l1 > 0, l0 ** (1 - s) * l1 ** s, 0.0))
+
+
+def lx_at(ages, gender="m", table="tmi_4", method="udd"):
+    """l_{x+s} pada usia pecahan."""
+    tabel = load_table(table, gender)
+    x, s = _pecah(ages, tabel)
+    hasil = _lx_pecahan(tabel.lx_by_age, x, s, method)
+    return hasil if np.ndim(hasil) else float(hasil)
+
+
+def survival(ages, t, gender="m", table="tmi_4", method="udd"):
+    """tp_{x+s} untuk usia dan jangka pecahan (0 setelah ujung tabel)."""
+    tabel = load_table(table, gender)
+    ages = np.asarray(ages, dtype=float)
+    _pecah(ages, tabel)
+    ujung = np.minimum(ages + np.asarray(t, dtype=float), tabel.max_age + 1)
+    x1 = np.floor(ujung).astype(int)
+    hasil = (_lx_pecahan(tabel.lx_by_age, x1, ujung - x1, method) / lx_at(ages, gender, table, method))
+    return hasil if np.ndim(hasil) else float(hasil)
+
+
+# ==============================================================================
+# ANUITAS USIA PECAHAN
+# ==============================================================================
+
+def _anuitas_udd(tabel, x, s, rates, durations):
+    """Kombinasi berbobot l dari ä_{x:n|} dan ä_{x+1:n|} (rumus tertutup UDD)."""
+    lx = np.nan_to_num(tabel.lx_by_age, nan=0.0)
+    batas = len(lx) - 1
+    x1 = np.minimum(x + 1, tabel.max_age)
+    a0 = _annuity_due_table(tabel, x, rates, durations)
+    a1 = _annuity_due_table(tabel, x1, rates, durations)
+    l0 = lx[x]
+    l1 = np.where(x + 1 <= tabel.max_age, lx[np.minimum(x + 1, batas)], 0.0)
+    return ((1 - s) * l0 * a0 + s * l1 * a1) / ((1 - s) * l0 + s * l1)
+
+
+def _anuitas_gaya_konstan(tabel, x, s, rates, durations):
+    """Tabel l_{y+s} per pecahan s unik, lalu kolom komutasi & gather seperti usia bulat."""
+    lx = np.nan_to_num(tabel.lx_by_age, nan=0.0)
+    A = len(lx)
+    batas = A - 1
+    ujung = np.full(x.shape, batas) if durations is None else np.minimum(x + durations, batas)
+
+    s_unik, s_inv = np.unique(s, return_inverse=True)
+    r_unik, r_inv = np.unique(rates, return_inverse=True)
+    s_inv, r_inv = s_inv.reshape(x.shape), r_inv.reshape(x.shape)
+    y = np.arange(A)
+    L = _lx_pecahan(lx, y[None, :], s_unik[:, None], "constant_force")        # (S, A): l_{y+s}
+
+    hasil = np.empty(x.shape)
+    langkah = max(1, UKURAN_BLOK_KOMUTASI // (len(s_unik) * A))
+    for awal in range(0, len(r_unik), langkah):
+        blok = r_unik[awal:awal + langkah]
+        # D[k, j, y] = v_k^y * l_{y+s_j}, N = jumlah ekor D
+        D = L[None, :, :] * (1 + blok[:, None, None]) ** (-y[None, None, :])
+        N = np.cumsum(D[..., ::-1], axis=-1)[..., ::-1]
+        mask = (r_inv >= awal) & (r_inv < awal + len(blok))
+        k, j = r_inv[mask] - awal, s_inv[mask]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hasil[mask] = (N[k, j, x[mask]] - N[k, j, ujung[mask]]) / D[k, j, x[mask]]
+    return hasil
+
+
+def annuity_due(ages, rates, gender="m", table="tmi_4", durations=None, frequency=1, method="udd"):
+    """
+    Faktor anuitas hidup awal ä_{x+s} / ä_{x+s:n|} untuk usia pecahan.
+
+    Pembayaran di t = 0, 1, ..., (durations - 1) dari tanggal valuasi; konvensi
+    ujung tabel dan koreksi Woolhouse sama dengan `pensiun.annuity.annuity_due`,
+    sehingga untuk usia bulat hasilnya identik.
+    """
+    tabel = load_table(table, gender)
+    ages, rates = np.broadcast_arrays(np.asarray(ages, dtype=float), np.asarray(rates, dtype=float))
+    x, s = _pecah(ages, tabel)
+    n = None if durations is None else np.broadcast_to(np.asarray(durations, dtype=int), ages.shape)
+    if method == "udd":
+        hasil = _anuitas_udd(tabel, x, s, rates, n)
+    elif method == "constant_force":
+        hasil = _anuitas_gaya_konstan(tabel, x, s, rates, n)
+    else:
+        raise KeyError(f"Interpolasi '{method}' tidak dikenal. Pilihan: {', '.join(INTERPOLASI)}")
+    if frequency != 1:
+        koreksi = (frequency - 1) / (2 * frequency)
+        if n is None:
+            hasil = hasil - koreksi
+        else:
+            nEx = survival(ages, n, gender, table, method) * (1 + rates) ** (-n.astype(float))
+            hasil = hasil - koreksi * (1 - nEx)
+    return hasil if hasil.ndim else float(hasil)
+
+
+# ==============================================================================
+# DEMO: PV HALUS DI SEKITAR ULANG TAHUN & WAKTU 1 JUTA PESERTA
+# ==============================================================================
+if __name__ == "__main__":
+    import time
+
+    from pensiun import annuity
+
+    # Usia bulat: identik dengan mesin lama
+    for m in INTERPOLASI:
+        assert np.allclose(annuity_due([40, 55, 60], 0.057, "m", durations=[16, 5, 10], method=m),
+                           annuity.annuity_due([40, 55, 60], 0.057, "m", durations=[16, 5, 10]))
+        assert np.allclose(annuity_due([55.0, 70.0], 0.057, "f", method=m, frequency=12),
+                           annuity.annuity_due([55, 70], 0.057, "f", frequency=12))
+
+    lahir = to_dates("1969-08-17")
+    print("Pensiunan lahir 17-08-1969, ä^(12) TMI 4 pria @ 5.7% di sekitar ulang tahun ke-56:\n")
+    print(f"{'Tanggal valuasi':>16} | {'Usia eksak':>10} | {'Usia bulat':>10} | {'ä bulat':>8} | {'ä UDD':>8} | "
+          f"{'ä gaya konstan':>14}")
+    for tgl in ("2025-06-30", "2025-08-16", "2025-08-17", "2025-08-18", "2025-12-31", "2026-02-28"):
+        usia = age_at(lahir, tgl)
+        print(f"{tgl:>16} | {usia:>10.4f} | {age_at(lahir, tgl, 'nearest'):>10} | "
+              f"{annuity.annuity_due(age_at(lahir, tgl, 'nearest'), 0.057, 'm', frequency=12):>8.4f} | "
+              f"{annuity_due(usia, 0.057, 'm', frequency=12):>8.4f} | "
+              f"{annuity_due(usia, 0.057, 'm', frequency=12, method='constant_force'):>14.4f}")
+
+    # 1 juta peserta: tanggal -> usia & masa kerja -> anuitas temporer sampai usia 56
+    N = 1_000_000
+    rng = np.random.default_rng(49)
+    tanggal_valuasi = to_dates("2025-12-31")
+    lahir = tanggal_valuasi - rng.integers(25 * 365, 55 * 365, N).astype("timedelta64[D]")
+    masuk = lahir + rng.integers(20 * 365, 25 * 365, N).astype("timedelta64[D]")
+
+    mulai = time.perf_counter()
+    usia = age_at(lahir, tanggal_valuasi)
+    masa_kerja = service_at(masuk, tanggal_valuasi)
+    t_tanggal = time.perf_counter() - mulai
+    sisa = np.ceil(56 - usia).astype(int)
+
+    mulai = time.perf_counter()
+    annuity.annuity_due(np.floor(usia).astype(int), 0.057, "m", durations=sisa)
+    t_bulat = time.perf_counter() - mulai
+    waktu = {}
+    for m in INTERPOLASI:
+        mulai = time.perf_counter()
+        annuity_due(usia, 0.057, "m", durations=sisa, method=m)
+        waktu[m] = time.perf_counter() - mulai
+    print(f"\n{N:,} peserta: tanggal -> usia & masa kerja {t_tanggal * 1e3:.0f} ms "
+          f"(rata-rata masa kerja {masa_kerja.mean():.2f} thn)")
+    print(f"ä_x:n| usia bulat {t_bulat * 1e3:.0f} ms | UDD {waktu['udd'] * 1e3:.0f} ms "
+          f"({waktu['udd'] / t_bulat:.1f}x) | gaya konstan {waktu['constant_force'] * 1e3:.0f} ms "
+          f"({waktu['constant_force'] / t_bulat:.1f}x)")
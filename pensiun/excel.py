@@ -0,0 +1,382 @@
+"""
+Pembacaan Model Excel & Rekonsiliasi dengan Mesin Python.
+
+Dua workbook di repositori ini selama ini hanya dibandingkan secara manual:
+  - `case_study_IRR_rate/Dashboard.xlsx` : model Excel kalkulator2.py
+    (named range input/hasil + tabel 'Proyeksi Tahunan' dan 'Referensi')
+  - `file_mortality_table/mortality_table.xlsx` : tabel induk TMI IV, GAM83,
+    GAM71 beserta kolom komutasi Dx, Cx, Nx, Mx
+
+`read_workbook` mengekstrak named range dan semua Excel Table menjadi
+struktur Python (nilai hasil hitung terakhir yang tersimpan di file, tanpa
+menghitung ulang rumus). Hasil parsing di-cache berdasarkan hash SHA-256 isi
+file, di memori dan di disk (JSON, bukan pickle: file cache di direktori
+pengguna tidak boleh bisa menjalankan kode saat dibaca), sehingga pembacaan
+ulang file yang sama tidak lagi membuka openpyxl.
+
+`reconcile_dashboard` dan `reconcile_mortality` membandingkan setiap baris
+Excel dengan hasil mesin `pensiun` secara tervektorisasi:
+
+    python -m pensiun reconcile
+"""
+
+import datetime as dt
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from pensiun import instrument
+
+AKAR_REPO = Path(__file__).resolve().parent.parent
+DASHBOARD_XLSX = AKAR_REPO / "case_study_IRR_rate" / "Dashboard.xlsx"
+MORTALITY_XLSX = AKAR_REPO / "file_mortality_table" / "mortality_table.xlsx"
+
+# Cache hasil parsing di disk; bisa diganti lewat environment variable PENSIUN_CACHE_DIR
+CACHE_DIR = Path(os.environ.get("PENSIUN_CACHE_DIR", Path.home() / ".cache" / "pensiun" / "excel"))
+# Naikkan jika struktur hasil `read_workbook` berubah (cache lama diabaikan)
+VERSI_CACHE = 2
+
+# Sheet mortality_table.xlsx -> nama tabel di registri `pensiun.mortality`
+SHEET_MORTALITA = {"TMI_IV": "tmi_4", "GAM83": "gam_83", "GAM71": "gam_71"}
+# Blok kolom per gender: (kolom pertama, kolom terakhir) dari Usia s.d. Mx
+BLOK_GENDER = {"m": ("A", "H"), "f": ("J", "Q")}
+KOLOM_KOMUTASI = ["usia", "qx", "lx", "dx", "Dx", "Cx", "Nx", "Mx"]
+
+# Toleransi selisih relatif agar dianggap cocok
+TOLERANSI_RELATIF = 1e-9
+
+_cache_memori = {}
+
+
+# ==============================================================================
+# PEMBACAAN WORKBOOK
+# ==============================================================================
+
+def file_hash(path):
+    """SHA-256 isi file (kunci cache)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for blok in iter(lambda: f.read(1 << 20), b""):
+            h.update(blok)
+    return h.hexdigest()
+
+
+def _ke_json(nilai):
+    """Nilai sel non-JSON (tanggal/waktu dari openpyxl) -> dict bertanda."""
+    if isinstance(nilai, dt.timedelta):
+        return {"__excel__": "timedelta", "v": nilai.total_seconds()}
+    for nama, tipe in (("datetime", dt.datetime), ("date", dt.date), ("time", dt.time)):
+        if isinstance(nilai, tipe):
+            return {"__excel__": nama, "v": nilai.isoformat()}
+    raise TypeError(f"Nilai sel tidak bisa disimpan ke cache: {type(nilai).__name__}")
+
+
+def _dari_json(obj):
+    tipe = obj.get("__excel__")
+    if tipe is None:
+        return obj
+    if tipe == "timedelta":
+        return dt.timedelta(seconds=obj["v"])
+    return {"datetime": dt.datetime, "date": dt.date, "time": dt.time}[tipe].fromisoformat(obj["v"])
+
+
+@instrument.timed("excel.parse_workbook")
+def _parse_workbook(path):
+    try:
+        import openpyxl
+    except ImportError:
+        raise ImportError("Membaca file Excel membutuhkan openpyxl: pip install openpyxl") from None
+
+    wb = openpyxl.load_workbook(path, data_only=True, read_only=False)
+    names = {}
+    for nama, definisi in wb.defined_names.items():
+        tujuan = list(definisi.destinations)
+        if not tujuan:
+            names[nama] = None  # misal #REF!
+            continue
+        sheet, ref = tujuan[0]
+        sel = wb[sheet][ref.replace("$", "")]
+        names[nama] = sel.value if not isinstance(sel, tuple) else [[c.value for c in baris] for baris in sel]
+
+    tables = {}
+    for ws in wb.worksheets:
+        for nama, ref in ws.tables.items():
+            baris = [[c.value for c in r] for r in ws[ref]]
+            tables[nama] = {"sheet": ws.title, "ref": ref, "columns": baris[0], "rows": baris[1:]}
+
+    sheets = {ws.title: [list(r) for r in ws.iter_rows(values_only=True)] for ws in wb.worksheets}
+    return {"names": names, "tables": tables, "sheets": sheets}
+
+
+def read_workbook(path, use_cache=True):
+    """
+    Named range, Excel Table dan isi sheet dari sebuah workbook.
+
+    Returns:
+        dict: names {nama: nilai}, tables {nama: {sheet, ref, columns, rows}},
+        sheets {judul: list baris}, serta sha256 file.
+    """
+    path = Path(path)
+    with instrument.timer("excel.file_hash"):
+        kunci = file_hash(path)
+    if use_cache and kunci in _cache_memori:
+        instrument.cache_event("excel.memory", True)
+        return _cache_memori[kunci]
+    instrument.cache_event("excel.memory", False)
+
+    file_cache = CACHE_DIR / f"{kunci}.v{VERSI_CACHE}.json"
+    hasil = None
+    if use_cache and file_cache.exists():
+        try:
+            with open(file_cache, encoding="utf-8") as f:
+                hasil = json.load(f, object_hook=_dari_json)
+            if not isinstance(hasil, dict) or hasil.get("sha256") != kunci:
+                hasil = None
+        except (OSError, ValueError, KeyError, TypeError):
+            hasil = None
+        instrument.cache_event("excel.disk", hasil is not None)
+
+    if hasil is None:
+        hasil = _parse_workbook(path)
+        hasil["sha256"] = kunci
+        if use_cache:
+            try:
+                CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                sementara = file_cache.with_suffix(f".{os.getpid()}.tmp")
+                with open(sementara, "w", encoding="utf-8") as f:
+                    json.dump(hasil, f, default=_ke_json)
+                os.replace(sementara, file_cache)
+            except (OSError, TypeError):
+                pass  # cache disk hanya optimasi
+
+    if use_cache:
+        _cache_memori[kunci] = hasil
+    return hasil
+
+
+def table_columns(tabel):
+    """Excel Table -> {nama_kolom: np.ndarray}, baris kosong di akhir dibuang."""
+    rows = [r for r in tabel["rows"] if any(v is not None for v in r)]
+    hasil = {}
+    for j, nama in enumerate(tabel["columns"]):
+        kolom = [r[j] for r in rows]
+        try:
+            hasil[nama] = np.array([np.nan if v is None else v for v in kolom], dtype=float)
+        except (TypeError, ValueError):
+            hasil[nama] = np.array(kolom, dtype=object)
+    return hasil
+
+
+def load_dashboard(path=DASHBOARD_XLSX):
+    """
+    Input, hasil dan tabel Dashboard.xlsx.
+
+    Returns:
+        dict: names (semua named range), tables {nama: {kolom: array}}
+    """
+    wb = read_workbook(path)
+    return {
+        "names": wb["names"],
+        "tables": {nama: table_columns(t) for nama, t in wb["tables"].items()},
+    }
+
+
+def load_mortality_workbook(path=MORTALITY_XLSX):
+    """
+    Tabel mortalita induk beserta kolom komutasi dari mortality_table.xlsx.
+
+    Returns:
+        dict: {(nama_tabel, gender): {"interest": i, "usia": array, "qx": ..., "Mx": ...}}
+    """
+    from openpyxl.utils import column_index_from_string
+
+    wb = read_workbook(path)
+    hasil = {}
+    for sheet, nama in SHEET_MORTALITA.items():
+        isi = wb["sheets"][sheet]
+        bunga = isi[2][column_index_from_string("I") - 1]
+        for gender, (awal, akhir) in BLOK_GENDER.items():
+            a, b = column_index_from_string(awal) - 1, column_index_from_string(akhir)
+            baris = [r[a:b] for r in isi[2:] if r[a] is not None]
+            data = np.array(baris, dtype=float)
+            kolom = {k: data[:, j] for j, k in enumerate(KOLOM_KOMUTASI)}
+            kolom["usia"] = kolom["usia"].astype(int)
+            hasil[(nama, gender)] = {"interest": float(bunga), **kolom}
+    return hasil
+
+
+# ==============================================================================
+# REKONSILIASI
+# ==============================================================================
+
+def _banding(sumber, item, excel, python, toleransi=TOLERANSI_RELATIF):
+    """Satu baris laporan; array dibandingkan per elemen dan diringkas."""
+    excel = np.asarray(excel, dtype=float)
+    python = np.asarray(python, dtype=float)
+    if excel.shape != python.shape:
+        return {"source": sumber, "item": item, "rows": int(excel.size), "excel": float("nan"),
+                "python": float("nan"), "rel_diff": float("inf"), "tolerance": float(toleransi), "ok": False}
+    rel = np.abs(excel - python) / np.maximum(np.abs(excel), 1e-12)
+    rel = np.where(np.isnan(excel) & np.isnan(python), 0.0, rel)
+    idx = int(np.argmax(rel)) if rel.size else 0
+    return {
+        "source": sumber,
+        "item": item,
+        "rows": int(excel.size),
+        "excel": float(excel.reshape(-1)[idx]) if excel.size else float("nan"),
+        "python": float(python.reshape(-1)[idx]) if python.size else float("nan"),
+        "rel_diff": float(rel.reshape(-1)[idx]) if rel.size else 0.0,
+        "tolerance": float(toleransi),
+        "ok": bool(np.all(rel <= toleransi)),
+    }
+
+
+def reconcile_dashboard(path=DASHBOARD_XLSX, toleransi=TOLERANSI_RELATIF):
+    """
+    Membandingkan Dashboard.xlsx dengan `pensiun.dplk` baris demi baris.
+
+    Input dibaca dari named range (Usia_Awal, Gaji_Awal, ...), lalu hasil
+    mesin Python dibandingkan dengan: named result (Gaji_Akhir s.d. iuran DPLK
+    di H29), setiap tahun di Table2 (proyeksi JHT), tabel lx (Table3/35),
+    tabel anuitas per usia (Table5/57) dan tabel faktor PP 35/2021.
+    """
+    from pensiun import dplk
+    from pensiun.finmath import growing_annuity_fv
+    from pensiun.mortality import load_table
+
+    model = load_dashboard(path)
+    n, t = model["names"], model["tables"]
+    sumber = Path(path).name
+
+    usia_awal, usia_pensiun = int(n["Usia_Awal"]), int(n["Usia_Pensiun"])
+    gender, i, s = str(n["Gender"]).strip().lower(), float(n["Imbal_Hasil"]), float(n["Kenaikan_Gaji"])
+    jp_kwargs = dict(jp_retirement_age=int(n["Usia_Pensiun_JP"]), jp_start_age=int(n["Usia_Mulai_Iuran_JP"]),
+                     jp_benefit_cap=float(n["Batas_Atas_Manfaat_JP"]))
+
+    py = dplk.dplk_contribution(n["Gaji_Awal"], usia_awal, usia_pensiun, s, i, float(n["Target_IRR"]),
+                                gender)
+    pv_jp, manfaat_jp, a_60 = dplk.pv_jp_benefit(py["final_wage"], usia_pensiun, i, gender, **jp_kwargs)
+    jht = dplk.jht_balance(n["Gaji_Awal"], s, i, usia_pensiun - usia_awal, float(n["Rate_Iuran_JHT"]))
+
+    laporan = [
+        _banding(sumber, "Gaji_Akhir", n["Gaji_Akhir"], py["final_wage"], toleransi),
+        _banding(sumber, "total_akumulasi_dana_jht", n["total_akumulasi_dana_jht"], jht, toleransi),
+        _banding(sumber, "uang_pesangon_final", n["uang_pesangon_final"], py["pesangon"], toleransi),
+        _banding(sumber, "Manfaat_JP_Final", n["Manfaat_JP_Final"], manfaat_jp, toleransi),
+        _banding(sumber, "lump_sum_jp", n["lump_sum_jp"], manfaat_jp * 12 * a_60, toleransi),
+        _banding(sumber, "pv_manfaat_jp", n["pv_manfaat_jp"], pv_jp, toleransi),
+        _banding(sumber, "dana_lump_sum", n["dana_lump_sum"], py["total_fund"], toleransi),
+        _banding(sumber, "a_55", n["a_55"], py["annuity_factor"], toleransi),
+        _banding(sumber, "a_60", n["a_60"], a_60, toleransi),
+    ]
+
+    # Sel hasil tanpa named range (H23:H29), dibaca dari isi sheet Dashboard
+    wb = read_workbook(path)
+    dashboard = wb["sheets"]["Dashboard"]
+    sel = {baris: dashboard[baris - 1][7] for baris in (23, 24, 25, 28, 29)}
+    laporan += [
+        _banding(sumber, "Dashboard!H23 pensiun dari dana ada", sel[23], py["existing_pension"], toleransi),
+        _banding(sumber, "Dashboard!H24 target pensiun", sel[24], py["target_pension"], toleransi),
+        _banding(sumber, "Dashboard!H25 gap bulanan", sel[25], py["gap"], toleransi),
+        _banding(sumber, "Dashboard!H28 dana DPLK", sel[28], py["dplk_fund"], toleransi),
+        _banding(sumber, "Dashboard!H29 iuran DPLK", sel[29], py["dplk_contribution"], toleransi),
+    ]
+
+    # Table2: proyeksi JHT tahunan (saldo akhir tahun ke-k = iuran awal x deret tumbuh k tahun)
+    proyeksi = t["Table2"]
+    tahun = proyeksi["Tahun Ke-"]
+    iuran_awal = float(n["Gaji_Awal"]) * 12 * float(n["Rate_Iuran_JHT"])
+    laporan += [
+        _banding(sumber, "Table2[Gaji Tahunan]", proyeksi["Gaji Tahunan"],
+                 float(n["Gaji_Awal"]) * 12 * (1 + s) ** (tahun - 1), toleransi),
+        _banding(sumber, "Table2[Iuran JHT Setahun]", proyeksi["Iuran JHT Setahun"],
+                 iuran_awal * (1 + s) ** (tahun - 1), toleransi),
+        _banding(sumber, "Table2[Saldo Akhir Tahun]", proyeksi["Saldo Akhir Tahun"],
+                 iuran_awal * growing_annuity_fv(s, i, tahun), toleransi),
+    ]
+
+    # Table3/Table35: lx TMI 4 pria/wanita
+    for nama_tabel, g in (("Table3", "m"), ("Table35", "f")):
+        lx_excel = t[nama_tabel]
+        lx_py = load_table("tmi_4", g).lx_by_age[lx_excel["usia"].astype(int)]
+        laporan.append(_banding(sumber, f"{nama_tabel}[lx] (TMI 4 {g})", lx_excel["lx"], lx_py, toleransi))
+
+    # Table5/Table57: baris anuitas ä_55 dan ä_60 (t = 0, 1, ...)
+    lx = load_table("tmi_4", gender).lx_by_age
+    for nama_tabel, usia in (("Table5", usia_pensiun), ("Table57", jp_kwargs["jp_retirement_age"])):
+        anuitas = t[nama_tabel]
+        k = anuitas["Usia"].astype(int)
+        ujung = np.minimum(usia + k, len(lx) - 1)
+        laporan += [
+            _banding(sumber, f"{nama_tabel}[Probabilitas Hidup]", anuitas["Probabilitas Hidup"],
+                     lx[ujung] / lx[usia], toleransi),
+            _banding(sumber, f"{nama_tabel}[PV Anuitas per Tahun]", anuitas["PV Anuitas per Tahun"],
+                     lx[ujung] / lx[usia] * (1 + i) ** -k, toleransi),
+        ]
+
+    # Referensi: faktor PP 35/2021
+    up, upmk = t["Table7"], t["Table9"]
+    laporan += [
+        _banding(sumber, "Table7 faktor UP", up["Faktor UP (Bulan)"],
+                 dplk.FAKTOR_UP_BULAN[np.searchsorted(dplk.BATAS_UP_TAHUN, up["Masa Kerja (Tahun)"], "right")],
+                 toleransi),
+        _banding(sumber, "Table9 faktor UPMK", upmk["Faktor UPMK (Bulan)"],
+                 dplk.FAKTOR_UPMK_BULAN[np.searchsorted(dplk.BATAS_UPMK_TAHUN, upmk["Masa Kerja (Tahun)"],
+                                                        "right")],
+                 toleransi),
+    ]
+    return laporan
+
+
+def reconcile_mortality(path=MORTALITY_XLSX, toleransi=TOLERANSI_RELATIF):
+    """
+    Membandingkan mortality_table.xlsx dengan CSV di registri dan kolom komutasi.
+
+    qx dan lx dibandingkan dengan `load_table`, sedangkan Dx dan Nx dengan
+    `pensiun.annuity.commutation` pada tingkat bunga sel I3 tiap sheet.
+    """
+    from pensiun.annuity import commutation
+    from pensiun.mortality import load_table
+
+    sumber = Path(path).name
+    laporan = []
+    for (nama, gender), kolom in load_mortality_workbook(path).items():
+        tabel = load_table(nama, gender)
+        usia = kolom["usia"]
+        label = tabel.label
+        qx_py = dict(zip(tabel.ages, tabel.qx))
+        D, N = commutation(tabel.lx_by_age, [kolom["interest"]])
+        laporan += [
+            _banding(sumber, f"{label} qx", kolom["qx"], [qx_py.get(int(x), np.nan) for x in usia], toleransi),
+            _banding(sumber, f"{label} lx", kolom["lx"], tabel.lx_by_age[usia], toleransi),
+            _banding(sumber, f"{label} Dx", kolom["Dx"], D[0, usia], toleransi),
+            _banding(sumber, f"{label} Nx", kolom["Nx"], N[0, usia], toleransi),
+        ]
+    return laporan
+
+
+def print_report(laporan):
+    """Mencetak hasil rekonsiliasi; mengembalikan jumlah item yang tidak cocok."""
+    print(f"{'Sumber':<22} | {'Item':<38} | {'Baris':>5} | {'Excel':>18} | {'Python':>18} | "
+          f"{'Selisih rel.':>12} |")
+    print("-" * 130)
+    for r in laporan:
+        tanda = "✅" if r["ok"] else "❌"
+        print(f"{r['source']:<22} | {r['item']:<38} | {r['rows']:>5} | {r['excel']:>18,.6f} | "
+              f"{r['python']:>18,.6f} | {r['rel_diff']:>12.2e} | {tanda}")
+    gagal = sum(not r["ok"] for r in laporan)
+    print("-" * 130)
+    # Toleransi yang benar-benar dipakai tiap item (bisa berbeda antar-rekonsiliasi)
+    toleransi = ", ".join(f"{t:g}" for t in sorted({r["tolerance"] for r in laporan})) or f"{TOLERANSI_RELATIF:g}"
+    print(f"{len(laporan) - gagal} cocok, {gagal} berbeda (toleransi relatif {toleransi})")
+    return gagal
+
+
+if __name__ == "__main__":
+    import sys
+
+    laporan = reconcile_dashboard() + reconcile_mortality()
+    sys.exit(1 if print_report(laporan) else 0)
@@ -0,0 +1,210 @@
+"""
+Matematika Keuangan Tervektorisasi (pengganti numpy_financial).
+
+Berisi FV, PV, PMT, NPER dan RATE dengan konvensi tanda yang sama seperti
+Excel dan `numpy_financial` (uang keluar negatif, uang masuk positif), plus
+`growing_annuity_fv` untuk deret iuran yang tumbuh mengikuti gaji. Semua
+fungsi mem-broadcast array tingkat bunga, periode dan nominal, dan menangani
+kasus bunga 0% tanpa pembagian dengan nol.
+
+Jalankan `python -m pensiun.finmath` untuk membandingkan ketepatan dan
+kecepatan terhadap numpy_financial pada input 10^6 elemen.
+"""
+
+import numpy as np
+
+# Di bawah ambang ini bunga dianggap 0 (rumus anuitas memakai limit r -> 0)
+EPS_BUNGA = 1e-12
+
+
+def _when(when):
+    """'end'/0 = pembayaran akhir periode, 'begin'/1 = awal periode."""
+    if isinstance(when, str):
+        return {"end": 0, "begin": 1}[when]
+    return np.asarray(when)
+
+
+def _keluaran(x):
+    return x if np.ndim(x) else float(x)
+
+
+def _tumbuh_faktor(r, n, when):
+    """
+    ((1+r)^n, (1 + r*when) * ((1+r)^n - 1) / r) dengan limit n saat r = 0.
+
+    (1+r)^n -- operasi termahal -- dihitung sekali dan dipakai bersama oleh
+    kedua suku; masker bunga nol dan faktor `when` hanya diterapkan bila perlu.
+    """
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        tumbuh = (1 + r) ** n
+        nol = np.abs(r) < EPS_BUNGA
+        if nol.any():
+            faktor = np.where(nol, n, (tumbuh - 1) / np.where(nol, 1.0, r))
+        else:
+            faktor = (tumbuh - 1) / r
+        if np.any(when):
+            faktor = faktor * (1 + r * when)
+    return tumbuh, faktor
+
+
+def fv(rate, nper, pmt, pv, when="end"):
+    """Future value; setara `npf.fv` / Excel FV."""
+    r, n, a, p = (np.asarray(v, dtype=float) for v in (rate, nper, pmt, pv))
+    tumbuh, faktor = _tumbuh_faktor(r, n, _when(when))
+    return _keluaran(-(p * tumbuh + a * faktor))
+
+
+def pv(rate, nper, pmt, fv=0.0, when="end"):
+    """Present value; setara `npf.pv` / Excel PV."""
+    r, n, a, f = (np.asarray(v, dtype=float) for v in (rate, nper, pmt, fv))
+    tumbuh, faktor = _tumbuh_faktor(r, n, _when(when))
+    return _keluaran(-(f + a * faktor) / tumbuh)
+
+
+def pmt(rate, nper, pv, fv=0.0, when="end"):
+    """Pembayaran per periode; setara `npf.pmt` / Excel PMT."""
+    r, n, p, f = (np.asarray(v, dtype=float) for v in (rate, nper, pv, fv))
+    tumbuh, faktor = _tumbuh_faktor(r, n, _when(when))
+    return _keluaran(-(f + p * tumbuh) / faktor)
+
+
+def nper(rate, pmt, pv, fv=0.0, when="end"):
+    """Jumlah periode; setara `npf.nper` / Excel NPER."""
+    r, a, p, f = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (rate, pmt, pv, fv)))
+    w = _when(when)
+    nol = np.abs(r) < EPS_BUNGA
+    r_aman = np.where(nol, 1.0, r)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = a * (1 + r_aman * w) / r_aman
+        n = np.log((-f + z) / (p + z)) / np.log(1 + r_aman)
+        n_nol = -(f + p) / a
+    return _keluaran(np.where(nol, n_nol, n))
+
+
+def rate(nper, pmt, pv, fv=0.0, when="end", guess=0.1, tol=1e-10, maxiter=100):
+    """
+    Tingkat bunga per periode dengan iterasi Newton tervektorisasi.
+
+    Semua elemen diiterasi bersamaan; elemen yang sudah konvergen dibekukan.
+    Elemen yang tidak konvergen dalam `maxiter` iterasi bernilai NaN
+    (perilaku yang sama dengan `npf.rate`).
+    """
+    n, a, p, f, w = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (nper, pmt, pv, fv, _when(when)))
+    )
+    bentuk = n.shape
+    # Iterasi pada salinan minimal 1-D: np.nonzero tidak menerima array 0-d (input skalar)
+    n, a, p, f, w = (np.atleast_1d(v) for v in (n, a, p, f, w))
+    r = np.full(n.shape, float(guess))
+    aktif = np.ones(n.shape, dtype=bool)
+
+    for _ in range(maxiter):
+        # Hanya elemen yang belum konvergen yang dihitung ulang
+        idx = np.nonzero(aktif)
+        ri, ni, ai, pi, fi, wi = r[idx], n[idx], a[idx], p[idx], f[idx], w[idx]
+        ri = np.where(np.abs(ri) < EPS_BUNGA, EPS_BUNGA, ri)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            tumbuh = (1 + ri) ** ni
+            g = pi * tumbuh + ai * (1 + ri * wi) * (tumbuh - 1) / ri + fi
+            d_faktor = (
+                wi * (tumbuh - 1) / ri
+                + (1 + ri * wi) * (ni * tumbuh / (1 + ri) * ri - (tumbuh - 1)) / ri ** 2
+            )
+            dg = pi * ni * tumbuh / (1 + ri) + ai * d_faktor
+            langkah = g / dg
+        r[idx] = ri - langkah
+        aktif[idx] = ~(np.abs(langkah) < tol)
+        if not aktif.any():
+            break
+
+    return _keluaran(np.where(aktif, np.nan, r).reshape(bentuk))
+
+
+def growing_annuity_fv(growth, rate, years):
+    """
+    SUM_t (1+g)^t * (1+i)^(n-1-t), t = 0 .. n-1 (deret iuran yang tumbuh).
+
+    Bentuk tertutup dari loop `accumulated += cont * (1 + i) ** periods`
+    (cek-balance) dan `hitung_akumulasi_jht` (kalkulator2.py):
+        ((1+i)^n - (1+g)^n) / (i - g)     jika i != g
+        n * (1+i)^(n-1)                   jika i == g
+    """
+    g, i, n = np.broadcast_arrays(
+        np.asarray(growth, dtype=float), np.asarray(rate, dtype=float), np.asarray(years, dtype=float)
+    )
+    selisih = i - g
+    sama = np.isclose(selisih, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hasil = np.where(
+            sama,
+            n * (1 + i) ** (n - 1),
+            ((1 + i) ** n - (1 + g) ** n) / np.where(sama, 1.0, selisih),
+        )
+    return _keluaran(hasil)
+
+
+# ==============================================================================
+# BENCHMARK vs numpy_financial
+# ==============================================================================
+if __name__ == "__main__":
+    import time
+
+    # Input skalar (pola npf paling umum) -> float Python, konsisten dengan fv/pv/pmt
+    r_skalar = rate(60, -1000, 50000)
+    assert isinstance(r_skalar, float) and np.isclose(pv(r_skalar, 60, -1000), 50000)
+
+    try:
+        import numpy_financial as npf
+    except ImportError:
+        raise SystemExit("numpy_financial tidak terpasang; benchmark pembanding dilewati.")
+
+    N = 1_000_000
+    rng = np.random.default_rng(42)
+    r = rng.uniform(0.0, 0.01, N)
+    r[::1000] = 0.0  # sisipkan kasus bunga nol
+    n = rng.integers(12, 480, N).astype(float)
+    a = -rng.uniform(1e5, 5e6, N)
+    p = rng.uniform(0, 1e8, N)
+
+    def ukur(fungsi, *args, ulang=3):
+        terbaik = float("inf")
+        for _ in range(ulang):
+            mulai = time.perf_counter()
+            hasil = fungsi(*args)
+            terbaik = min(terbaik, time.perf_counter() - mulai)
+        return hasil, terbaik
+
+    print(f"--- Benchmark finmath vs numpy_financial ({N:,} elemen) ---")
+    print(f"{'Fungsi':<6} | {'finmath (s)':>11} | {'npf (s)':>9} | {'Speedup':>7} | {'Maks. selisih relatif':>21}")
+    print("-" * 68)
+    kasus = [
+        ("fv", fv, npf.fv, (r, n, a, p)),
+        ("pv", pv, npf.pv, (r, n, a, p)),
+        ("pmt", pmt, npf.pmt, (r, n, p, 0.0)),
+        # npf.nper memakai rumus bunga-nol (dengan tanda terbalik) untuk SELURUH
+        # array bila ada satu saja bunga 0, jadi pembandingnya hanya bunga > 0
+        ("nper", nper, npf.nper, (r[r > 0], a[r > 0], p[r > 0], 0.0)),
+    ]
+    for nama, kita, pembanding, args in kasus:
+        h1, t1 = ukur(kita, *args)
+        h2, t2 = ukur(pembanding, *args)
+        selisih = np.nanmax(np.abs(h1 - h2) / np.maximum(np.abs(h2), 1.0))
+        print(f"{nama:<6} | {t1:>11.4f} | {t2:>9.4f} | {t2 / t1:>6.1f}x | {selisih:>21.2e}")
+
+    # RATE: target dibangkitkan dari bunga yang diketahui, lalu dicari ulang
+    M = 100_000  # npf.rate jauh lebih lambat; subset agar benchmark tetap singkat
+    target = fv(r[:M], n[:M], a[:M], 0.0)
+    h1, t1 = ukur(rate, n[:M], a[:M], 0.0, target, "end", 0.005)
+    h2, t2 = ukur(npf.rate, n[:M], a[:M], 0.0, target, "end", 0.005, ulang=1)
+    selisih = np.nanmax(np.abs(h1 - r[:M]))
+    print(f"{'rate':<6} | {t1:>11.4f} | {t2:>9.4f} | {t2 / t1:>6.1f}x | {selisih:>21.2e}  ({M:,} elemen)")
+
+    # Pola pemakaian di skrip lama: satu panggilan npf skalar per orang
+    K = 10_000
+    mulai = time.perf_counter()
+    for k in range(K):
+        npf.pmt(r[k] / 12, n[k], p[k])
+    t_loop = time.perf_counter() - mulai
+    _, t_vec = ukur(pmt, r[:K] / 12, n[:K], p[:K])
+    print(f"\npmt skalar per orang ({K:,}x npf.pmt): {t_loop:.4f} s | finmath sekali jalan: "
+          f"{t_vec:.5f} s | {t_loop / t_vec:,.0f}x lebih cepat")
@@ -0,0 +1,279 @@
+"""
+Graf Komputasi Valuasi dengan Re-valuasi Inkremental.
+
+Dalam sesi analisis biasanya hanya SATU input yang diubah (selisih usia
+pasangan atau indeksasi di `PensionValidator`, accrual rate di
+`equilibrium_simulator.py`), tetapi semuanya dihitung ulang dari nol. Di sini
+valuasi dipecah menjadi node yang saling bergantung:
+
+    start_wage, years_of_service, salary_increase_rate ──> avg_wage ──> monthly_benefit ─┐
+    mortalita + discount_rate + indexation + usia ──────> annuity_factor ───────────────┴─> liability
+    start_wage, years_of_service, salary, invest_return ─> asset_1pct ──> asset
+                                                           (asset, liability) ──> gap, funding_ratio, ...
+
+Setiap node di-memo bersama versi input yang dipakainya. Versi diambil dari
+SATU penghitung monoton milik graf (input maupun node), sehingga versi tidak
+pernah berulang meski sebuah node ditimpa input. `set()` hanya
+menaikkan versi input yang nilainya benar-benar berubah, dan saat node
+diminta, hanya node hilir dari input yang berubah yang dihitung ulang.
+Node yang hasilnya ternyata sama (early cutoff) tidak memicu hitung ulang
+node di hilirnya. Mengubah discount rate tidak mengulang proyeksi aset, dan
+mengubah return investasi tidak mengulang faktor anuitas.
+
+Dependensi node dibaca dari nama parameter method yang diberi `@node`.
+
+    g = JPValuation(salary_increase_rate=0.0787)
+    g["funding_ratio"]
+    g.set(spouse_age_diff=5)      # hanya annuity_factor -> liability -> ... yang dihitung ulang
+    g.recomputed                  # Counter jumlah hitung ulang per node
+
+    python -m pensiun.graph       # demo sesi analis + perbandingan waktu
+"""
+
+import inspect
+from collections import Counter
+
+import numpy as np
+
+from pensiun.annuity import last_survivor_annuity
+from pensiun.valuation import (ACCRUAL_RATE, CONTRIBUTION_RATE, IMPLIED_ANNUITY_FACTOR, accumulated_asset,
+                               average_wage)
+
+
+def node(fn):
+    """Menandai method sebagai node graf; dependensi = nama parameter selain `self`."""
+    fn._dependensi = tuple(p for p in inspect.signature(fn).parameters if p != "self")
+    return fn
+
+
+def _sama(a, b):
+    if a is b:
+        return True
+    try:
+        return np.shape(a) == np.shape(b) and bool(np.all(np.asarray(a) == np.asarray(b)))
+    except (TypeError, ValueError):
+        return False
+
+
+class ValuationGraph:
+    """
+    Basis graf: subclass mendefinisikan INPUT (nama -> nilai bawaan) dan node `@node`.
+
+    Input yang namanya sama dengan node akan menimpa node itu (misal
+    `annuity_factor` tetap 14.32 di model equilibrium). Timpaan lewat `set()`
+    dilepas dengan `unset()` agar node kembali dihitung dari dependensinya.
+    """
+
+    INPUT = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.NODE = {}
+        for kelas in reversed(cls.__mro__):
+            for nama, atribut in vars(kelas).items():
+                if hasattr(atribut, "_dependensi"):
+                    cls.NODE[nama] = atribut
+
+    def __init__(self, **inputs):
+        tidak_dikenal = set(inputs) - set(self.INPUT) - set(self.NODE)
+        if tidak_dikenal:
+            raise KeyError(f"Input tidak dikenal: {', '.join(sorted(tidak_dikenal))}")
+        self._input = {**self.INPUT, **inputs}
+        self._versi = dict.fromkeys(self._input, 0)
+        self._jam = 0  # penghitung versi monoton bersama untuk input & node
+        self._cache = {}
+        self.recomputed = Counter()
+
+    def set(self, **changes):
+        """Mengubah input; mengembalikan daftar input yang benar-benar berubah."""
+        berubah = []
+        for nama, nilai in changes.items():
+            if nama not in self.INPUT and nama not in self.NODE:
+                raise KeyError(f"Input tidak dikenal: {nama}")
+            if nama in self._input and _sama(self._input[nama], nilai):
+                continue
+            self._input[nama] = nilai
+            self._jam += 1
+            self._versi[nama] = self._jam
+            berubah.append(nama)
+        return berubah
+
+    def unset(self, *names):
+        """Melepas timpaan node (dari konstruktor atau `set`); node kembali dihitung."""
+        for nama in names:
+            if nama not in self.NODE:
+                raise KeyError(f"'{nama}' bukan node; input biasa diubah lewat set().")
+            if nama in self._input:
+                del self._input[nama]
+                del self._versi[nama]
+                # Dihitung ulang dengan versi baru dari penghitung bersama -> hilir ikut diperbarui
+                self._cache.pop(nama, None)
+
+    def __getitem__(self, nama):
+        return self._evaluasi(nama)[0]
+
+    def values(self, *names):
+        """Beberapa node sekaligus sebagai dict (semua node jika kosong)."""
+        return {nama: self[nama] for nama in (names or self.NODE)}
+
+    def dependencies(self, nama):
+        return () if nama in self._input else self.NODE[nama]._dependensi
+
+    def _evaluasi(self, nama):
+        """(nilai, versi) sebuah input atau node, menghitung ulang hanya jika dependensinya berubah."""
+        if nama in self._input:
+            return self._input[nama], self._versi[nama]
+        if nama not in self.NODE:
+            raise KeyError(f"Node/input tidak dikenal: {nama}")
+        fungsi = self.NODE[nama]
+        hasil_dep = [self._evaluasi(dep) for dep in fungsi._dependensi]
+        versi_dep = tuple(v for _, v in hasil_dep)
+
+        lama = self._cache.get(nama)
+        if lama is not None and lama[1] == versi_dep:
+            return lama[0], lama[2]
+
+        nilai = fungsi(self, *(n for n, _ in hasil_dep))
+        self.recomputed[nama] += 1
+        # Early cutoff: hasil sama -> versi node tidak naik, hilir tidak perlu dihitung ulang
+        if lama is not None and _sama(lama[0], nilai):
+            versi = lama[2]
+        else:
+            self._jam += 1
+            versi = self._jam
+        self._cache[nama] = (nilai, versi_dep, versi)
+        return nilai, versi
+
+
+class _AsetLiabilitas(ValuationGraph):
+    """Node bersama: proyeksi aset, rata-rata upah, manfaat dan neraca."""
+
+    @node
+    def asset_1pct(self, start_wage, years_of_service, salary_increase_rate, invest_return_rate):
+        return accumulated_asset(start_wage, years_of_service, salary_increase_rate, invest_return_rate, 0.01)
+
+    @node
+    def asset(self, asset_1pct, contribution_rate):
+        return asset_1pct * np.asarray(contribution_rate) / 0.01
+
+    @node
+    def avg_wage(self, start_wage, years_of_service, salary_increase_rate):
+        return average_wage(start_wage, years_of_service, salary_increase_rate)
+
+    @node
+    def monthly_benefit(self, accrual_rate, years_of_service, avg_wage):
+        return np.asarray(accrual_rate) * np.asarray(years_of_service) * avg_wage
+
+    @node
+    def liability(self, monthly_benefit, annuity_factor):
+        return monthly_benefit * 12 * annuity_factor
+
+    @node
+    def gap(self, asset, liability):
+        return asset - liability
+
+    @node
+    def funding_ratio(self, asset, liability):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(liability != 0, asset / liability * 100, 0.0)
+
+    @node
+    def required_contribution(self, asset_1pct, liability):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(asset_1pct > 0, liability / asset_1pct, 0.0)
+
+
+class JPValuation(_AsetLiabilitas):
+    """Graf `simulate_jp_deficit` / `PensionValidator` (anuitas joint life last survivor)."""
+
+    INPUT = {
+        "start_wage": 2_500_000,
+        "years_of_service": 32,
+        "salary_increase_rate": 0.0787,
+        "invest_return_rate": 0.0653,
+        "discount_rate": 0.057,
+        "benefit_indexation": 0.0,
+        "retirement_age": 56,
+        "spouse_age_diff": 3,
+        "table": "tmi_4",
+        "contribution_rate": CONTRIBUTION_RATE,
+        "accrual_rate": ACCRUAL_RATE,
+    }
+
+    @node
+    def annuity_factor(self, retirement_age, spouse_age_diff, discount_rate, benefit_indexation, table):
+        return last_survivor_annuity(retirement_age, np.asarray(retirement_age) - np.asarray(spouse_age_diff),
+                                     discount_rate, benefit_indexation, table=table)
+
+
+class EquilibriumValuation(_AsetLiabilitas):
+    """Graf `equilibrium_simulator.py`: faktor anuitas dikunci (input, bukan node)."""
+
+    INPUT = {
+        "start_wage": 2_500_000,
+        "years_of_service": 32,
+        "salary_increase_rate": 0.0787,
+        "invest_return_rate": 0.0653,
+        "annuity_factor": IMPLIED_ANNUITY_FACTOR,
+        "contribution_rate": CONTRIBUTION_RATE,
+        "accrual_rate": ACCRUAL_RATE,
+    }
+
+
+# ==============================================================================
+# DEMO: SESI ANALIS
+# ==============================================================================
+if __name__ == "__main__":
+    import time
+
+    from pensiun.valuation import simulate_jp_deficit
+
+    N = 200_000
+    rng = np.random.default_rng(38)
+    skenario = {
+        "salary_increase_rate": rng.uniform(0.03, 0.10, N),
+        "invest_return_rate": rng.uniform(0.04, 0.09, N),
+        "discount_rate": rng.uniform(0.04, 0.08, N),
+    }
+    g = JPValuation(**skenario)
+    g["funding_ratio"]
+    g.recomputed.clear()
+
+    sesi = [
+        {"spouse_age_diff": 5},
+        {"benefit_indexation": 0.02},
+        {"accrual_rate": 0.015},
+        {"contribution_rate": 0.09},
+        {"invest_return_rate": skenario["invest_return_rate"] + 0.005},
+        {"discount_rate": skenario["discount_rate"] + 0.005},
+        {"spouse_age_diff": 5},  # tidak berubah -> tidak ada yang dihitung
+    ]
+    masukan = dict(JPValuation.INPUT, **skenario)
+    print(f"{N:,} skenario per langkah\n")
+    print(f"{'Perubahan':<24} | {'Node dihitung ulang':<58} | {'Graf (ms)':>9} | {'Penuh (ms)':>10}")
+    print("-" * 110)
+    for ubah in sesi:
+        g.recomputed.clear()
+        mulai = time.perf_counter()
+        g.set(**ubah)
+        hasil = g["funding_ratio"]
+        t_graf = (time.perf_counter() - mulai) * 1e3
+
+        masukan.update(ubah)
+        mulai = time.perf_counter()
+        penuh = simulate_jp_deficit(**masukan)
+        t_penuh = (time.perf_counter() - mulai) * 1e3
+        assert np.allclose(hasil, penuh["funding_ratio"], rtol=1e-12)
+
+        nama = ", ".join(ubah)
+        dihitung = ", ".join(g.recomputed) or "-"
+        print(f"{nama:<24} | {dihitung:<58} | {t_graf:>9.1f} | {t_penuh:>10.1f}")
+
+    # Node yang sudah pernah dihitung ulang lalu ditimpa input: hilir harus ikut berubah
+    g.set(annuity_factor=20.0)
+    assert np.allclose(g["liability"], g["monthly_benefit"] * 12 * 20.0, rtol=1e-12)
+    # Timpaan dilepas: perubahan input kembali sampai ke annuity_factor & hilirnya
+    g.unset("annuity_factor")
+    g.set(discount_rate=skenario["discount_rate"])
+    masukan["discount_rate"] = skenario["discount_rate"]
+    assert np.allclose(g["funding_ratio"], simulate_jp_deficit(**masukan)["funding_ratio"], rtol=1e-12)
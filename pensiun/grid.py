@@ -0,0 +1,351 @@
+"""
+Grid Faktor Anuitas Pra-hitung untuk Kuotasi Instan.
+
+Alat kuotasi hanya butuh ä_x pada usia bulat untuk beberapa tabel, tetapi
+pada tingkat bunga yang kontinu. `build` menghitung SEKALI (per versi tabel
+mortalita) dan menyimpan ke satu file .npz:
+
+  - ä_x seumur hidup   : (tabel x gender x usia x bunga) + turunan d ä / d i
+  - ä_x, ä_y, ä_xy     : (tabel x usia peserta x selisih usia pasangan x bunga)
+                         + turunan, konvensi `joint_life_factors`
+  - l_x per tabel      : untuk anuitas temporer & frekuensi pembayaran
+
+Lookup (`AnnuityGrid`) menginterpolasi dalam bunga dengan spline kubik
+Hermite memakai turunan analitik di titik grid (galat O(h^4)); tidak ada
+penjumlahan mortalita saat kuotasi. Dimensi durasi dan frekuensi tidak perlu
+disimpan karena keduanya eksak dari grid seumur hidup:
+
+    ä_x:n|    = ä_x - nEx * ä_{x+n},   nEx = v^n l_{x+n} / l_x
+    ä^(m)     = ä - (m-1)/(2m) * (1 - nEx)        (Woolhouse, sama dengan `annuity_due`)
+
+Batas galat interpolasi diukur saat build (di titik tengah antar grid) dan
+disimpan di metadata (`grid.error_bound`). Indeksasi manfaat g untuk anuitas
+gabungan ditangani sebagai bunga efektif (1 + i) / (1 + g) - 1.
+
+    grid = load_or_build()
+    grid.annuity_due(55, 0.0637, "f", "gam_83", frequency=12)
+    python -m pensiun.grid    # build, batas galat & perbandingan waktu
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from pensiun.annuity import KOREKSI_BULANAN, joint_life_moments
+from pensiun.mortality import GENDER, TABEL_MORTALITA, load_table
+
+GRID_BAWAAN = Path(os.environ.get("PENSIUN_GRID", Path.home() / ".cache" / "pensiun" / "annuity_grid.npz"))
+VERSI_FORMAT = 1
+
+# Grid bunga (efektif, boleh negatif untuk bunga riil setelah indeksasi)
+BUNGA_MIN, BUNGA_MAKS, LANGKAH_BUNGA = -0.03, 0.15, 0.0025
+# Grid anuitas gabungan: usia peserta (pria) & selisih usia pasangan (wanita lebih muda)
+USIA_GABUNGAN = (40, 75)
+SELISIH_GABUNGAN = (-5, 15)
+
+
+def _sidik_tabel(tables):
+    """Hash l_x semua tabel: grid dibangun ulang jika data mortalita berubah."""
+    h = hashlib.sha256()
+    for nama in tables:
+        for g in GENDER:
+            h.update(np.nan_to_num(load_table(nama, g).lx_by_age).tobytes())
+    return h.hexdigest()[:16]
+
+
+def _hermite(nilai, turunan, r, r0, h):
+    """
+    Spline kubik Hermite di sumbu terakhir (grid seragam r0 + k h).
+
+    `r` ber-shape `nilai.shape[:-1]` (satu bunga per titik) atau
+    `nilai.shape[:-1] + (m,)` (m bunga per titik).
+    """
+    r = np.asarray(r, dtype=float)
+    satu = r.ndim < nilai.ndim
+    if satu:
+        r = r[..., None]
+    r = np.broadcast_to(r, nilai.shape[:-1] + r.shape[-1:])
+    posisi = (r - r0) / h
+    k = np.clip(np.floor(posisi).astype(int), 0, nilai.shape[-1] - 2)
+    u = posisi - k
+    f0, f1 = np.take_along_axis(nilai, k, -1), np.take_along_axis(nilai, k + 1, -1)
+    d0, d1 = np.take_along_axis(turunan, k, -1) * h, np.take_along_axis(turunan, k + 1, -1) * h
+    u2, u3 = u * u, u * u * u
+    hasil = (2 * u3 - 3 * u2 + 1) * f0 + (u3 - 2 * u2 + u) * d0 + (-2 * u3 + 3 * u2) * f1 + (u3 - u2) * d1
+    return hasil[..., 0] if satu else hasil
+
+
+def _indeks(nilai, daftar, jenis):
+    """String/array string -> indeks posisi di `daftar`."""
+    peta = {v: k for k, v in enumerate(daftar)}
+    if np.ndim(nilai) == 0:
+        if str(nilai) not in peta:
+            raise KeyError(f"{jenis} '{nilai}' tidak ada di grid. Pilihan: {', '.join(daftar)}")
+        return np.asarray(peta[str(nilai)])
+    unik, inv = np.unique(np.asarray(nilai).astype(str), return_inverse=True)
+    try:
+        kode = np.array([peta[u] for u in unik])
+    except KeyError as e:
+        raise KeyError(f"{jenis} {e} tidak ada di grid. Pilihan: {', '.join(daftar)}") from None
+    return kode[inv].reshape(np.shape(nilai))
+
+
+# ==============================================================================
+# BUILD
+# ==============================================================================
+
+def _momen_tunggal(lx, rates):
+    """(SUM_t v^t tpx, SUM_t t v^t tpx) untuk semua usia & bunga: shape (usia, bunga)."""
+    A = len(lx)
+    t = np.arange(A)
+    idx = np.minimum(np.arange(A)[:, None] + t[None, :], A - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = lx[idx] / lx[:, None]
+    p[lx == 0] = np.nan
+    v = (1 + rates[:, None]) ** (-t[None, :].astype(float))
+    return p @ v.T, p @ (v * t).T
+
+
+def build(path=GRID_BAWAAN, tables=None):
+    """Menghitung semua grid dan menyimpannya ke `path` (.npz). Mengembalikan `AnnuityGrid`."""
+    tables = list(tables or TABEL_MORTALITA)
+    rates = np.round(np.arange(BUNGA_MIN, BUNGA_MAKS + LANGKAH_BUNGA / 2, LANGKAH_BUNGA), 10)
+    tengah = rates[:-1] + LANGKAH_BUNGA / 2
+    A = max(len(load_table(n, g).lx_by_age) for n in tables for g in GENDER)
+
+    lx = np.zeros((len(tables), len(GENDER), A + 1))
+    batas_usia = np.zeros((len(tables), len(GENDER), 2), dtype=int)
+    tunggal = np.full((len(tables), len(GENDER), A + 1, len(rates)), np.nan)
+    tunggal_d = np.full_like(tunggal, np.nan)
+    galat = {"single": 0.0, "joint": 0.0}
+    for a, nama in enumerate(tables):
+        for b, g in enumerate(GENDER):
+            tabel = load_table(nama, g)
+            l = np.nan_to_num(tabel.lx_by_age, nan=0.0)
+            lx[a, b, :len(l)] = l
+            batas_usia[a, b] = tabel.min_age, tabel.max_age
+            m0, m1 = _momen_tunggal(lx[a, b], rates)
+            tunggal[a, b], tunggal_d[a, b] = m0, -m1 / (1 + rates)
+            tunggal[a, b, lx[a, b] == 0] = 0.0  # usia di luar tabel: l_x = 0 -> ä = 0 (ujung temporer)
+            tunggal_d[a, b, lx[a, b] == 0] = 0.0
+            usia = np.arange(tabel.min_age, tabel.max_age + 1)
+            eksak = _momen_tunggal(lx[a, b], tengah)[0][usia]
+            kira = _hermite(tunggal[a, b, usia], tunggal_d[a, b, usia], tengah[None, :], rates[0], LANGKAH_BUNGA)
+            galat["single"] = max(galat["single"], float(np.max(np.abs(kira - eksak))))
+
+    usia_x = np.arange(USIA_GABUNGAN[0], USIA_GABUNGAN[1] + 1)
+    selisih = np.arange(SELISIH_GABUNGAN[0], SELISIH_GABUNGAN[1] + 1)
+    gabungan = np.empty((3, len(tables), len(usia_x), len(selisih), len(rates)))
+    gabungan_d = np.empty_like(gabungan)
+    X, Y, R = np.meshgrid(usia_x, selisih, rates, indexing="ij")
+    Xm, Ym, Rm = np.meshgrid(usia_x, selisih, tengah, indexing="ij")
+    for a, nama in enumerate(tables):
+        momen = joint_life_moments(X, X - Y, R, table=nama, order=1)
+        for k, m in enumerate(momen):
+            gabungan[k, a], gabungan_d[k, a] = m[0], -m[1] / (1 + R)
+        eksak = np.stack([m[0] for m in joint_life_moments(Xm, Xm - Ym, Rm, table=nama)])
+        kira = _hermite(gabungan[:, a], gabungan_d[:, a], Rm[None], rates[0], LANGKAH_BUNGA)
+        galat["joint"] = max(galat["joint"], float(np.max(np.abs(kira - eksak))))
+
+    meta = {
+        "format_version": VERSI_FORMAT,
+        "tables": tables,
+        "genders": list(GENDER),
+        "rate_min": float(rates[0]),
+        "rate_step": LANGKAH_BUNGA,
+        "joint_ages": [int(usia_x[0]), int(usia_x[-1])],
+        "joint_diffs": [int(selisih[0]), int(selisih[-1])],
+        "mortality_hash": _sidik_tabel(tables),
+        "error_bound": galat,
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(path, rates=rates, lx=lx, age_bounds=batas_usia, single=tunggal, single_d=tunggal_d,
+             joint=gabungan, joint_d=gabungan_d, meta=json.dumps(meta))
+    return AnnuityGrid.load(path)
+
+
+def load_or_build(path=GRID_BAWAAN, tables=None):
+    """Memakai grid yang ada jika tabel & format cocok; jika tidak, build ulang."""
+    tables = list(tables or TABEL_MORTALITA)
+    try:
+        grid = AnnuityGrid.load(path)
+    except (FileNotFoundError, KeyError, ValueError):
+        return build(path, tables)
+    m = grid.meta
+    if m.get("format_version") == VERSI_FORMAT and m["tables"] == tables and \
+            m["mortality_hash"] == _sidik_tabel(tables):
+        return grid
+    return build(path, tables)
+
+
+# ==============================================================================
+# LOOKUP
+# ==============================================================================
+
+class AnnuityGrid:
+    """Lookup faktor anuitas dari grid pra-hitung (argumen mengikuti `pensiun.annuity`)."""
+
+    def __init__(self, arrays, meta):
+        self.meta = meta
+        self.rates = arrays["rates"]
+        self.lx = arrays["lx"]
+        self.age_bounds = arrays["age_bounds"]
+        self.single = arrays["single"]
+        self.single_d = arrays["single_d"]
+        self.joint = arrays["joint"]
+        self.joint_d = arrays["joint_d"]
+        self.tables = meta["tables"]
+        self.genders = meta["genders"]
+        self._kode = {(nama, g): (a, b) for a, nama in enumerate(self.tables) for b, g in enumerate(self.genders)}
+
+    @classmethod
+    def load(cls, path=GRID_BAWAAN):
+        with np.load(path) as f:
+            arrays = {k: f[k] for k in f.files}
+        return cls(arrays, json.loads(str(arrays.pop("meta"))))
+
+    def __repr__(self):
+        return (f"AnnuityGrid({', '.join(self.tables)}; bunga {self.rates[0]:.1%}..{self.rates[-1]:.1%}, "
+                f"galat maks {max(self.error_bound.values()):.1e})")
+
+    @property
+    def error_bound(self):
+        """Galat absolut maksimum interpolasi (terukur saat build) per jenis anuitas."""
+        return self.meta["error_bound"]
+
+    def _cek_bunga(self, r):
+        if np.ndim(r) == 0:
+            if not self.rates[0] - 1e-12 <= r <= self.rates[-1] + 1e-12:
+                raise ValueError(f"Bunga harus di antara {self.rates[0]:.2%} dan {self.rates[-1]:.2%} (rentang grid).")
+            return
+        if np.any(r < self.rates[0] - 1e-12) or np.any(r > self.rates[-1] + 1e-12):
+            raise ValueError(f"Bunga harus di antara {self.rates[0]:.2%} dan {self.rates[-1]:.2%} (rentang grid).")
+
+    def _seumur_hidup(self, t, g, x, r):
+        return _hermite(self.single[t, g, x], self.single_d[t, g, x], r, self.rates[0], self.meta["rate_step"])
+
+    def annuity_due(self, ages, rates, gender="m", table="tmi_4", durations=None, frequency=1):
+        """ä_x / ä_x:n| / ä^(m) dengan hasil sama (dalam batas galat) dengan `annuity.annuity_due`."""
+        if durations is None and np.ndim(ages) == 0 and np.ndim(rates) == 0 and (table, gender) in self._kode:
+            return self._kuotasi(int(ages), float(rates), *self._kode[table, gender], frequency)
+        arrays = [np.asarray(ages), np.asarray(rates, dtype=float), np.asarray(gender), np.asarray(table)]
+        if durations is not None:
+            arrays.append(np.asarray(durations))
+        arrays = np.broadcast_arrays(*arrays)
+        x, r = arrays[0].astype(int), arrays[1]
+        t = _indeks(arrays[3], self.tables, "Tabel")
+        g = _indeks(arrays[2], self.genders, "Gender")
+        batas = self.age_bounds[t, g]
+        if np.any(x < batas[..., 0]) or np.any(x > batas[..., 1]):
+            raise ValueError("Usia di luar rentang tabel mortalita.")
+        self._cek_bunga(r)
+
+        hasil = self._seumur_hidup(t, g, x, r)
+        nEx = 0.0
+        if durations is not None:
+            ujung = np.minimum(x + arrays[4].astype(int), self.lx.shape[-1] - 1)
+            nEx = (1 + r) ** (-(ujung - x)) * self.lx[t, g, ujung] / self.lx[t, g, x]
+            hasil = hasil - nEx * self._seumur_hidup(t, g, ujung, r)
+        if frequency != 1:
+            hasil = hasil - (frequency - 1) / (2 * frequency) * (1 - nEx)
+        return hasil if hasil.ndim else float(hasil)
+
+    def _kuotasi(self, x, r, t, g, frequency):
+        """Jalur cepat satu kuotasi seumur hidup: aritmetika float biasa tanpa broadcast numpy."""
+        mn, mx = self.age_bounds[t, g]
+        if not mn <= x <= mx:
+            raise ValueError("Usia di luar rentang tabel mortalita.")
+        self._cek_bunga(r)
+        h = self.meta["rate_step"]
+        posisi = (r - self.rates[0]) / h
+        k = min(max(int(posisi), 0), len(self.rates) - 2)
+        u = posisi - k
+        f0, f1 = self.single[t, g, x, k:k + 2].tolist()
+        d0, d1 = (self.single_d[t, g, x, k:k + 2] * h).tolist()
+        u2, u3 = u * u, u * u * u
+        hasil = (2 * u3 - 3 * u2 + 1) * f0 + (u3 - 2 * u2 + u) * d0 + (-2 * u3 + 3 * u2) * f1 + (u3 - u2) * d1
+        return hasil - (frequency - 1) / (2 * frequency)
+
+    def joint_life_factors(self, age_x, age_y, rates, benefit_growth=0.0, table="tmi_4"):
+        """(ä_x, ä_y, ä_xy) pasangan pria x & wanita y, konvensi `annuity.joint_life_factors`."""
+        x, y, r, gr, tb = np.broadcast_arrays(np.asarray(age_x), np.asarray(age_y), np.asarray(rates, dtype=float),
+                                              np.asarray(benefit_growth, dtype=float), np.asarray(table))
+        r = (1 + r) / (1 + gr) - 1
+        self._cek_bunga(r)
+        a0, a1 = self.meta["joint_ages"]
+        d0, d1 = self.meta["joint_diffs"]
+        d = x.astype(int) - y.astype(int)
+        if np.any(x < a0) or np.any(x > a1) or np.any(d < d0) or np.any(d > d1):
+            raise ValueError(f"Grid gabungan mencakup usia {a0}-{a1} dan selisih usia {d0}..{d1}.")
+        t = _indeks(tb, self.tables, "Tabel")
+        i, j = x.astype(int) - a0, d - d0
+        hasil = _hermite(self.joint[:, t, i, j], self.joint_d[:, t, i, j], r, self.rates[0], self.meta["rate_step"])
+        return tuple(h if h.ndim else float(h) for h in hasil)
+
+    def last_survivor_annuity(self, age_x, age_y, rates, benefit_growth=0.0, table="tmi_4"):
+        ax, ay, axy = self.joint_life_factors(age_x, age_y, rates, benefit_growth, table)
+        return ax + ay - axy - KOREKSI_BULANAN
+
+    def reversionary_annuity(self, age_x, age_y, rates, survivor_pct=0.5, benefit_growth=0.0, table="tmi_4"):
+        ax, ay, axy = self.joint_life_factors(age_x, age_y, rates, benefit_growth, table)
+        return (ax - KOREKSI_BULANAN) + survivor_pct * (ay - axy)
+
+
+# ==============================================================================
+# DEMO: BUILD, BATAS GALAT & WAKTU KUOTASI
+# ==============================================================================
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from pensiun.annuity import annuity_due, last_survivor_annuity
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / "grid.npz"
+        mulai = time.perf_counter()
+        grid = build(path)
+        t_build = time.perf_counter() - mulai
+        print(f"{grid}")
+        print(f"Build {t_build:.2f} dtk, file {path.stat().st_size / 2**20:.1f} MB")
+        print(f"Batas galat (titik tengah grid): tunggal {grid.error_bound['single']:.1e}, "
+              f"gabungan {grid.error_bound['joint']:.1e}")
+
+        rng = np.random.default_rng(42)
+        N = 200_000
+        usia = rng.integers(20, 90, N)
+        bunga = rng.uniform(0.0, 0.12, N)
+        gender = rng.choice(["m", "f"], N)
+        tabel = rng.choice(list(TABEL_MORTALITA), N)
+        durasi = rng.integers(1, 40, N)
+
+        print(f"\n{'Kuotasi (' + f'{N:,}' + ' baris)':<34} | {'Eksak (ms)':>10} | {'Grid (ms)':>9} | {'Selisih maks':>12}")
+        for nama, eksak, cepat in (
+            ("ä_x bulanan", lambda: annuity_due(usia, bunga, gender, tabel, frequency=12),
+             lambda: grid.annuity_due(usia, bunga, gender, tabel, frequency=12)),
+            ("ä_x:n| temporer", lambda: annuity_due(usia, bunga, gender, tabel, durasi),
+             lambda: grid.annuity_due(usia, bunga, gender, tabel, durasi)),
+            ("last survivor (20.000)", lambda: last_survivor_annuity(usia[:20_000] % 30 + 45, usia[:20_000] % 30 + 42,
+                                                                     bunga[:20_000], 0.02),
+             lambda: grid.last_survivor_annuity(usia[:20_000] % 30 + 45, usia[:20_000] % 30 + 42, bunga[:20_000],
+                                                0.02)),
+        ):
+            mulai = time.perf_counter()
+            a = eksak()
+            t_eksak = (time.perf_counter() - mulai) * 1e3
+            mulai = time.perf_counter()
+            b = cepat()
+            t_grid = (time.perf_counter() - mulai) * 1e3
+            print(f"{nama:<34} | {t_eksak:>10.1f} | {t_grid:>9.1f} | {np.max(np.abs(a - b)):>12.1e}")
+
+        waktu = []
+        for fungsi in (annuity_due, grid.annuity_due):
+            mulai = time.perf_counter()
+            for k in range(1000):
+                fungsi(55, 0.05 + k * 1e-5, "f", "gam_83", frequency=12)
+            waktu.append((time.perf_counter() - mulai) * 1e3)
+        print(f"\nSatu kuotasi skalar (bunga berbeda-beda): eksak {waktu[0]:.1f} µs, grid {waktu[1]:.1f} µs")
+        del grid
@@ -0,0 +1,224 @@
+"""
+Instrumentasi Opsional untuk Jalur Panas Valuasi.
+
+Saat run portofolio terasa lambat, modul ini menjawab "waktunya habis di
+mana": pembacaan tabel, evaluasi anuitas, iterasi solver, atau I/O Excel.
+Yang dicatat:
+  - latensi per tahap (jumlah, total, min, maks, histogram bucket log2 mikrodetik)
+  - counter (misal jumlah item anuitas, iterasi & evaluasi fungsi solver)
+  - hit rate cache (tabel mortalita, workbook Excel)
+
+Instrumentasi MATI secara default. Dalam keadaan mati, `timer` mengembalikan
+context manager kosong yang sama dan `timed` langsung memanggil fungsi aslinya,
+jadi biayanya hanya satu pengecekan boolean. Aktifkan dengan environment
+variable PENSIUN_INSTRUMENT=1, `enable()`, atau opsi CLI `--instrument`.
+
+Modul ini hanya memakai standard library agar bisa di-import oleh
+`pensiun.mortality` tanpa memperlambat start-up.
+"""
+
+import contextlib
+import functools
+import io
+import json
+import math
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("PENSIUN_INSTRUMENT", "") not in ("", "0")
+
+# Bucket ke-k berisi durasi [2^(k-1), 2^k) mikrodetik; bucket 0 = < 1 µs
+JUMLAH_BUCKET = 32
+
+_lock = threading.Lock()
+_tahap = {}
+_counter = {}
+_cache = {}
+
+
+class _Statistik:
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets = [0] * JUMLAH_BUCKET
+
+    def add(self, detik):
+        self.count += 1
+        self.total += detik
+        self.min = min(self.min, detik)
+        self.max = max(self.max, detik)
+        mikro = detik * 1e6
+        k = 0 if mikro < 1 else min(int(math.log2(mikro)) + 1, JUMLAH_BUCKET - 1)
+        self.buckets[k] += 1
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1e3,
+            "mean_us": self.total / self.count * 1e6 if self.count else 0.0,
+            "min_us": self.min * 1e6 if self.count else 0.0,
+            "max_us": self.max * 1e6,
+            # {batas atas bucket (µs): jumlah}, hanya bucket yang terisi
+            "histogram_us": {str(2 ** k): n for k, n in enumerate(self.buckets) if n},
+        }
+
+
+# ==============================================================================
+# SAKLAR & PENCATATAN
+# ==============================================================================
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+
+def reset():
+    """Menghapus semua catatan (saklar tidak berubah)."""
+    with _lock:
+        _tahap.clear()
+        _counter.clear()
+        _cache.clear()
+
+
+def record(stage, seconds):
+    with _lock:
+        stat = _tahap.get(stage)
+        if stat is None:
+            stat = _tahap[stage] = _Statistik()
+        stat.add(seconds)
+
+
+def count(name, n=1):
+    if not ENABLED:
+        return
+    with _lock:
+        _counter[name] = _counter.get(name, 0) + n
+
+
+def cache_event(name, hit):
+    if not ENABLED:
+        return
+    with _lock:
+        hits_misses = _cache.setdefault(name, [0, 0])
+        hits_misses[0 if hit else 1] += 1
+
+
+class _Timer:
+    __slots__ = ("stage", "mulai")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.mulai = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.stage, time.perf_counter() - self.mulai)
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+_NOOP = _NoopTimer()
+
+
+def timer(stage):
+    """Context manager pencatat latensi satu tahap (no-op jika instrumentasi mati)."""
+    return _Timer(stage) if ENABLED else _NOOP
+
+
+def timed(stage):
+    """Decorator versi `timer` untuk satu fungsi."""
+    def dekorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            mulai = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(stage, time.perf_counter() - mulai)
+        return wrapper
+    return dekorator
+
+
+# ==============================================================================
+# LAPORAN
+# ==============================================================================
+
+def report():
+    """Snapshot semua catatan sebagai dict (siap di-JSON-kan)."""
+    with _lock:
+        return {
+            "stages": {nama: stat.as_dict() for nama, stat in sorted(_tahap.items())},
+            "counters": dict(sorted(_counter.items())),
+            "caches": {
+                nama: {"hits": h, "misses": m, "hit_rate": h / (h + m) if h + m else 0.0}
+                for nama, (h, m) in sorted(_cache.items())
+            },
+        }
+
+
+def export(path):
+    """Menulis `report()` ke file JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report(), f, indent=2)
+    return path
+
+
+def print_report(file=None):
+    r = report()
+    print(f"{'Tahap':<32} | {'Jumlah':>8} | {'Total (ms)':>11} | {'Rata2 (µs)':>11} | {'Maks (µs)':>11}",
+          file=file)
+    print("-" * 84, file=file)
+    for nama, s in r["stages"].items():
+        print(f"{nama:<32} | {s['count']:>8,} | {s['total_ms']:>11.3f} | {s['mean_us']:>11.1f} | "
+              f"{s['max_us']:>11.1f}", file=file)
+    for nama, nilai in r["counters"].items():
+        print(f"  counter {nama:<30}: {nilai:,}", file=file)
+    for nama, c in r["caches"].items():
+        print(f"  cache   {nama:<30}: {c['hits']} hit / {c['misses']} miss ({c['hit_rate']:.0%})", file=file)
+
+
+@contextlib.contextmanager
+def profile(path, sort="cumulative", limit=40):
+    """
+    Menjalankan blok di bawah cProfile.
+
+    Menulis data mentah ke `path` (bisa dibuka dengan pstats/snakeviz) dan
+    statistik teks terurut ke `path` + '.txt'.
+    """
+    # Di-import di sini: pstats menarik dataclasses/inspect (~25 ms start-up)
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        teks = io.StringIO()
+        pstats.Stats(profiler, stream=teks).sort_stats(sort).print_stats(limit)
+        with open(f"{path}.txt", "w", encoding="utf-8") as f:
+            f.write(teks.getvalue())
@@ -0,0 +1,151 @@
+"""
+Solver Invers: Apa yang Dicapai oleh Anggaran Iuran DPLK Tertentu?
+
+`kalkulator2.py` menjawab "berapa iuran DPLK agar IRR 80%". Modul ini
+menjawab kebalikannya untuk banyak peserta sekaligus, dengan iuran DPLK
+bulanan (level, akhir bulan) sebagai input:
+
+  - `replacement_ratio`   : IRR yang tercapai (bentuk tertutup: FV iuran)
+  - `retirement_age`      : usia pensiun terkecil yang mencapai target IRR
+                            (grid peserta x usia kandidat, tanpa loop Python)
+  - `required_return`     : imbal hasil investasi yang dibutuhkan
+                            (bisection tervektorisasi, `pensiun.roots.bisect`)
+
+`balance_replacement_ratio` adalah rumus `analisis_hasil.py` (saldo akhir dari
+spreadsheet -> pensiun bulanan -> IRR) untuk banyak skenario sekaligus.
+"""
+
+import numpy as np
+
+from pensiun import finmath
+from pensiun.annuity import annuity_due
+from pensiun.dplk import existing_benefits, final_wage
+from pensiun.roots import bisect
+
+# Usia pensiun maksimum yang dicoba oleh `retirement_age`
+USIA_PENSIUN_MAKS = 70
+# Toleransi pembulatan saat membandingkan IRR dengan target
+TOLERANSI_IRR = 1e-9
+
+
+def _as_output(hasil):
+    return {k: float(v) if np.ndim(v) == 0 else v for k, v in hasil.items()}
+
+
+def replacement_ratio(monthly_contribution, start_wage, start_age, retirement_age,
+                      salary_increase_rate=0.05, invest_return_rate=0.06, gender="m", table="tmi_4",
+                      include_jp=True):
+    """
+    IRR yang dicapai dengan iuran DPLK bulanan tertentu.
+
+    Dana DPLK = FV iuran bulanan selama masa kerja pada bunga bulanan
+    (1+i)^(1/12) - 1, lalu bersama JHT + Pesangon + JP dikonversi menjadi
+    pensiun bulanan lewat ä_x (sama seperti `analisis_hasil.py`).
+
+    Returns:
+        dict: final_wage, existing_pension, dplk_fund, dplk_pension,
+        monthly_pension, replacement_ratio (desimal, 0.8 = 80%)
+    """
+    masa_kerja = np.asarray(retirement_age) - np.asarray(start_age)
+    i = np.asarray(invest_return_rate, dtype=float)
+    ada = existing_benefits(start_wage, start_age, retirement_age, salary_increase_rate, i, gender,
+                            table, include_jp)
+
+    r = (1 + i) ** (1 / 12) - 1
+    dana_dplk = finmath.fv(r, masa_kerja * 12, -np.asarray(monthly_contribution, dtype=float), 0.0)
+    pensiun_dplk = dana_dplk / (ada["annuity_factor"] * 12)
+    pensiun_total = ada["existing_pension"] + pensiun_dplk
+
+    return _as_output({
+        "final_wage": ada["final_wage"],
+        "existing_pension": ada["existing_pension"],
+        "dplk_fund": dana_dplk,
+        "dplk_pension": pensiun_dplk,
+        "monthly_pension": pensiun_total,
+        "replacement_ratio": pensiun_total / ada["final_wage"],
+    })
+
+
+def retirement_age(monthly_contribution, start_wage, start_age, target_irr=0.80,
+                   salary_increase_rate=0.05, invest_return_rate=0.06, gender="m", table="tmi_4",
+                   include_jp=True, max_age=USIA_PENSIUN_MAKS):
+    """
+    Usia pensiun terkecil (bilangan bulat) yang mencapai `target_irr`.
+
+    Semua usia kandidat start_age+1 .. max_age dievaluasi sekaligus sebagai
+    grid (peserta x usia). Elemen yang tidak mencapai target sampai `max_age`
+    bernilai NaN. Untuk usia di atas usia JP (60), PV JP hanya memuat anuitas
+    sisa sejak usia pensiun (lihat `pensiun.dplk.pv_jp_benefit`).
+    """
+    args = np.broadcast_arrays(
+        np.asarray(monthly_contribution, dtype=float), np.asarray(start_wage, dtype=float),
+        np.asarray(start_age), np.asarray(target_irr, dtype=float),
+        np.asarray(salary_increase_rate, dtype=float), np.asarray(invest_return_rate, dtype=float),
+        np.asarray(gender),
+    )
+    iuran, gaji, usia_awal, target, s, i, g = (a[..., None] for a in args)
+
+    kandidat = np.arange(int(np.min(usia_awal)) + 1, max_age + 1)
+    if kandidat.size == 0:
+        raise ValueError(f"Usia awal harus lebih kecil dari usia pensiun maksimum ({max_age}).")
+    # Usia kandidat yang <= usia awal diganti sementara agar masa kerja >= 1
+    usia = np.maximum(kandidat, usia_awal + 1)
+    rasio = replacement_ratio(iuran, gaji, usia_awal, usia, s, i, g, table, include_jp)["replacement_ratio"]
+
+    tercapai = (rasio >= target - TOLERANSI_IRR) & (kandidat > usia_awal)
+    hasil = np.where(tercapai.any(axis=-1), kandidat[np.argmax(tercapai, axis=-1)], np.nan)
+    return hasil if hasil.ndim else float(hasil)
+
+
+def required_return(monthly_contribution, start_wage, start_age, retirement_age, target_irr=0.80,
+                    salary_increase_rate=0.05, gender="m", table="tmi_4", include_jp=True,
+                    lower=0.0, upper=0.20):
+    """
+    Imbal hasil investasi tahunan agar iuran DPLK tertentu mencapai `target_irr`.
+
+    IRR tidak punya bentuk tertutup terhadap imbal hasil (ä_x juga ikut
+    berubah), sehingga dicari dengan bisection untuk semua peserta sekaligus
+    di interval [lower, upper]. NaN jika akar tidak ada di interval itu (target
+    tidak tercapai, atau sudah terlampaui bahkan pada `lower`).
+    """
+    def selisih(i):
+        return replacement_ratio(monthly_contribution, start_wage, start_age, retirement_age,
+                                 salary_increase_rate, i, gender, table,
+                                 include_jp)["replacement_ratio"] - target_irr
+
+    bentuk = np.broadcast(
+        np.asarray(monthly_contribution), np.asarray(start_wage), np.asarray(start_age),
+        np.asarray(retirement_age), np.asarray(target_irr), np.asarray(salary_increase_rate),
+        np.asarray(gender),
+    ).shape
+    return bisect(selisih, np.full(bentuk, lower), np.full(bentuk, upper), xtol=1e-8)
+
+
+def balance_replacement_ratio(balance, start_wage, start_age, retirement_age, salary_increase_rate,
+                              annuity_factor=None, annuity_rate=0.06, gender="m", table="tmi_4"):
+    """
+    IRR dari saldo akhir yang sudah diketahui (alur `analisis_hasil.py`).
+
+    Args:
+        balance: Total akumulasi dana di usia pensiun (angka 'Balance' Excel)
+        annuity_factor: ä_x yang sudah diketahui. None (atau NaN per elemen)
+            berarti dihitung dari registri tabel mortalita pada `annuity_rate`.
+
+    Returns:
+        dict: final_wage, annuity_factor, monthly_pension, replacement_ratio
+    """
+    masa_kerja = np.asarray(retirement_age) - np.asarray(start_age)
+    gaji_akhir = final_wage(start_wage, salary_increase_rate, masa_kerja)
+
+    faktor = annuity_due(retirement_age, annuity_rate, gender, table)
+    if annuity_factor is not None:
+        diketahui = np.asarray(annuity_factor, dtype=float)
+        faktor = np.where(np.isnan(diketahui), faktor, diketahui)
+
+    manfaat = np.asarray(balance, dtype=float) / (faktor * 12)
+    return _as_output({
+        "final_wage": gaji_akhir,
+        "annuity_factor": faktor,
+        "monthly_pension": manfaat,
+        "replacement_ratio": manfaat / gaji_akhir,
+    })
@@ -0,0 +1,299 @@
+"""
+Mesin Manfaat Jaminan Pensiun (JP) BPJS Ketenagakerjaan dari Riwayat Upah.
+
+`hitung_pv_manfaat_jp` (kalkulator2.py) memakai pendekatan
+0.01 x bulan iur x gaji AKHIR dengan batas atas global, dan
+`simulate_jp_deficit` memakai rata-rata upah nominal. Modul ini menghitung
+rumus PP 45/2015 untuk jutaan peserta sekaligus:
+
+  - iuran 3% dari upah yang dibatasi upah batas atas (per tahun kalender)
+  - manfaat bulanan = 1% x masa iur (tahun) x rata-rata upah tertimbang,
+    yaitu upah tiap tahun diindeksasi ke tahun terakhir iur
+  - manfaat minimum & maksimum; masa iur < 15 tahun -> lump sum iuran +
+    hasil pengembangan (bukan manfaat bulanan)
+  - liabilitas: manfaat peserta + janda/duda 50% + anak 50% (sampai usia 23,
+    setelah peserta & pasangan meninggal), dengan indeksasi manfaat
+
+Riwayat upah berupa matriks (peserta x tahun kalender) dengan jendela iur
+[entry, end) per peserta. Karena indeks upah dan return sama untuk semua
+peserta di tahun kalender yang sama, jumlah tertimbang per jendela cukup
+dihitung dari SATU cumsum per baris: SUM_{t in [s, e)} w_t / P_t =
+C[e] - C[s], tanpa loop per peserta.
+
+    python -m pensiun.jp    # contoh + perbandingan dengan pendekatan kalkulator2.py
+"""
+
+import numpy as np
+
+from pensiun.annuity import KOREKSI_BULANAN, joint_life_factors
+from pensiun.curve import YieldCurve
+from pensiun.mortality import load_table
+
+# ==============================================================================
+# KETENTUAN PROGRAM (per regulasi; angka nominal tahun dasar, diindeksasi tahunan)
+# ==============================================================================
+KETENTUAN = {
+    "pp45_2015": {
+        "contribution_rate": 0.03,     # 2% pemberi kerja + 1% pekerja
+        "wage_cap": 7_000_000,         # upah batas atas iuran (2015)
+        "benefit_floor": 300_000,      # manfaat pensiun minimum per bulan (2015)
+        "benefit_cap": 3_600_000,      # manfaat pensiun maksimum per bulan (2015)
+        "accrual_rate": 0.01,          # 1% x masa iur x rata-rata upah tertimbang
+        "min_years": 15,               # masa iur minimum untuk manfaat bulanan
+        "survivor_pct": 0.5,           # janda/duda
+        "orphan_pct": 0.5,             # anak
+        "orphan_age_limit": 23,
+    },
+}
+KETENTUAN_BAWAAN = "pp45_2015"
+UKURAN_CHUNK = 65_536
+
+
+def rules(name=KETENTUAN_BAWAAN, **overrides):
+    """Salinan ketentuan `name` dengan nilai yang ditimpa (misal batas atas tahun berjalan)."""
+    if name not in KETENTUAN:
+        raise KeyError(f"Ketentuan '{name}' tidak dikenal. Pilihan: {', '.join(KETENTUAN)}")
+    return {**KETENTUAN[name], **overrides}
+
+
+def _per_tahun(nilai, n_tahun):
+    """Skalar atau array (tahun,) -> array (tahun,) float."""
+    return np.broadcast_to(np.asarray(nilai, dtype=float), (n_tahun,))
+
+
+def _kumulatif(laju):
+    """P[t] = PRODUK_{k<t} (1 + laju_k), t = 0 .. T (P[0] = 1)."""
+    return np.concatenate([[1.0], np.cumprod(1 + laju)])
+
+
+# ==============================================================================
+# RIWAYAT UPAH
+# ==============================================================================
+
+def wage_history(start_wage, salary_increase_rate, entry, end, n_years, entry_age=None):
+    """
+    Matriks upah bulanan (peserta x tahun kalender) dari upah awal & kenaikan gaji.
+
+    Upah di tahun `entry` = start_wage, naik (1 + s) per tahun; nol di luar
+    jendela [entry, end). Jika `salary_increase_rate` berupa
+    `pensiun.salary.SalaryScale`, upah tahun ke-k = start_wage * S[entry_age, k].
+    """
+    from pensiun.salary import SalaryScale
+
+    skala = isinstance(salary_increase_rate, SalaryScale)
+    if skala and entry_age is None:
+        raise ValueError("wage_history dengan SalaryScale membutuhkan entry_age.")
+    w, s, e0, e1, usia = (np.asarray(a).reshape(-1, 1) for a in np.broadcast_arrays(
+        np.asarray(start_wage, dtype=float), 0.0 if skala else np.asarray(salary_increase_rate, dtype=float),
+        np.asarray(entry), np.asarray(end), 0 if entry_age is None else np.asarray(entry_age)))
+    t = np.arange(n_years)[None, :]
+    aktif = (t >= e0) & (t < e1)
+    k = np.clip(t - e0, 0, np.maximum(e1 - e0 - 1, 0))
+    if skala:
+        return np.where(aktif, w * salary_increase_rate.index(usia, k), 0.0)
+    return np.where(aktif, w * (1 + s) ** k, 0.0)
+
+
+# ==============================================================================
+# MANFAAT
+# ==============================================================================
+
+def jp_benefit(wages, entry, end, wage_index=0.0, invest_return_rate=0.0, wage_cap_growth=0.0,
+               benefit_index=0.0, regulation=KETENTUAN_BAWAAN, **overrides):
+    """
+    Manfaat JP per peserta dari riwayat upah.
+
+    Args:
+        wages (array): Upah bulanan, shape (peserta, tahun kalender).
+        entry, end (array-like of int): Jendela iur [entry, end) per peserta
+            (indeks kolom); end = tahun pertama setelah berhenti iur.
+        wage_index (float | array (tahun,)): Indeks upah tahun t -> t+1 untuk
+            rata-rata upah tertimbang.
+        invest_return_rate (float | array (tahun,)): Hasil pengembangan iuran
+            (untuk lump sum masa iur < 15 tahun).
+        wage_cap_growth (float | array (tahun,)): Kenaikan upah batas atas per tahun.
+        benefit_index (float | array (tahun,)): Indeksasi batas min/maks manfaat per tahun.
+        regulation (str): Kunci `KETENTUAN`; `overrides` menimpa nilainya.
+
+    Returns:
+        dict array per peserta: years, average_indexed_wage, contributions,
+        fund (iuran + pengembangan), eligible, monthly_benefit, lump_sum
+    """
+    k = rules(regulation, **overrides)
+    wages = np.asarray(wages, dtype=float)
+    if wages.ndim == 1:
+        wages = wages[None, :]
+    n, T = wages.shape
+    entry, end = (np.broadcast_to(np.asarray(a, dtype=int), (n,)) for a in (entry, end))
+    if np.any(entry < 0) or np.any(end > T) or np.any(end < entry):
+        raise ValueError(f"Jendela iur harus 0 <= entry <= end <= {T}.")
+
+    batas_upah = k["wage_cap"] * _kumulatif(_per_tahun(wage_cap_growth, T))[:T]
+    P = _kumulatif(_per_tahun(wage_index, T))           # indeks upah kumulatif
+    G = _kumulatif(_per_tahun(invest_return_rate, T))   # pengembangan kumulatif
+    M = _kumulatif(_per_tahun(benefit_index, T))        # indeksasi batas manfaat
+
+    jumlah_upah = np.empty(n)
+    jumlah_iuran = np.empty(n)
+    jumlah_dana = np.empty(n)
+    for awal in range(0, n, UKURAN_CHUNK):
+        s = slice(awal, awal + UKURAN_CHUNK)
+        upah = np.minimum(wages[s], batas_upah[None, :])
+        nol = np.zeros((upah.shape[0], 1))
+        # C[:, t] = SUM_{k<t} ...; jumlah di jendela [e0, e1) = C[e1] - C[e0]
+        for tujuan, bobot in ((jumlah_upah, 1 / P[:T]), (jumlah_iuran, 1.0), (jumlah_dana, 1 / G[:T])):
+            C = np.concatenate([nol, np.cumsum(upah * bobot, axis=1)], axis=1)
+            baris = np.arange(upah.shape[0])
+            tujuan[s] = C[baris, end[s]] - C[baris, entry[s]]
+
+    tahun = (end - entry).astype(float)
+    akhir = np.maximum(end - 1, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rata_tertimbang = np.where(tahun > 0, P[akhir] * jumlah_upah / tahun, 0.0)
+    iuran = k["contribution_rate"] * 12 * jumlah_iuran
+    # Iuran dibayar awal tahun t dan berkembang sampai akhir tahun end-1: G[end] / G[t]
+    dana = k["contribution_rate"] * 12 * G[end] * jumlah_dana
+
+    layak = tahun >= k["min_years"]
+    manfaat = k["accrual_rate"] * tahun * rata_tertimbang
+    manfaat = np.clip(manfaat, k["benefit_floor"] * M[akhir], k["benefit_cap"] * M[akhir])
+    return {
+        "years": tahun,
+        "average_indexed_wage": rata_tertimbang,
+        "contributions": iuran,
+        "fund": dana,
+        "eligible": layak,
+        "monthly_benefit": np.where(layak, manfaat, 0.0),
+        "lump_sum": np.where(layak, 0.0, dana),
+    }
+
+
+# ==============================================================================
+# LIABILITAS (PESERTA + JANDA/DUDA + ANAK)
+# ==============================================================================
+
+def _anuitas_yatim(age_x, age_y, punya_pasangan, n, rates, growth, table, gender_x, gender_y):
+    """SUM_{t<n} v^t (1+g)^t (1 - tpx)(1 - tpy): anak menerima setelah peserta (& pasangan) meninggal."""
+    kurva = rates if isinstance(rates, YieldCurve) else None
+    lx = np.nan_to_num(load_table(table, gender_x).lx_by_age, nan=0.0)
+    ly = np.nan_to_num(load_table(table, gender_y).lx_by_age, nan=0.0)
+    T = int(n.max()) if n.size else 0
+    t = np.arange(T)[None, :]
+    tpx = lx[np.minimum(age_x[:, None] + t, len(lx) - 1)] / lx[age_x, None]
+    tpy = ly[np.minimum(age_y[:, None] + t, len(ly) - 1)] / ly[age_y, None]
+    tpy = np.where(punya_pasangan[:, None], tpy, 0.0)
+    if kurva:
+        bobot = kurva.discount_factors[:T][None, :] * (1 + growth[:, None]) ** t
+    else:
+        bobot = ((1 + growth[:, None]) / (1 + rates[:, None])) ** t
+    return np.sum(np.where(t < n[:, None], bobot * (1 - tpx) * (1 - tpy), 0.0), axis=1)
+
+
+def jp_liability(monthly_benefit, retirement_age, spouse_age=None, child_age=None, discount_rate=0.057,
+                 benefit_indexation=0.0, table="tmi_4", gender="m", spouse_gender="f",
+                 regulation=KETENTUAN_BAWAAN, **overrides):
+    """
+    PV di usia pensiun dari manfaat JP bulanan beserta manfaat ahli warisnya.
+
+    Args:
+        spouse_age, child_age (array-like | None): Usia pasangan / anak bungsu saat
+            peserta pensiun; NaN atau None = tidak ada.
+        discount_rate (float | array | YieldCurve)
+        benefit_indexation (float | array): Indeksasi manfaat per tahun (inflasi).
+
+    Returns:
+        dict array: member, survivor, orphan, total (PV rupiah) dan annuity_factor
+        (total / manfaat tahunan)
+    """
+    k = rules(regulation, **overrides)
+    kurva = discount_rate if isinstance(discount_rate, YieldCurve) else None
+    nan = np.nan
+    B, x, y, c, i, g = np.broadcast_arrays(
+        np.asarray(monthly_benefit, dtype=float), np.asarray(retirement_age, dtype=float),
+        np.asarray(nan if spouse_age is None else spouse_age, dtype=float),
+        np.asarray(nan if child_age is None else child_age, dtype=float),
+        np.asarray(0.0 if kurva else discount_rate, dtype=float), np.asarray(benefit_indexation, dtype=float),
+    )
+    bentuk = B.shape
+    B, x, y, c, i, g = (a.reshape(-1) for a in (B, x, y, c, i, g))
+    x = x.astype(int)
+    punya_pasangan = ~np.isnan(y)
+    y_aman = np.where(punya_pasangan, y, x).astype(int)
+    laju = kurva or i
+
+    ax, ay, axy = joint_life_factors(x, y_aman, laju, g, gender, spouse_gender, table)
+    peserta = ax - KOREKSI_BULANAN
+    janda = np.where(punya_pasangan, k["survivor_pct"] * (ay - axy), 0.0)
+    n_anak = np.where(np.isnan(c), 0, np.maximum(k["orphan_age_limit"] - np.nan_to_num(c), 0)).astype(int)
+    anak = k["orphan_pct"] * _anuitas_yatim(x, y_aman, punya_pasangan, n_anak, laju, g, table, gender,
+                                            spouse_gender)
+
+    tahunan = 12 * B
+    hasil = {
+        "member": tahunan * peserta,
+        "survivor": tahunan * janda,
+        "orphan": tahunan * anak,
+        "annuity_factor": peserta + janda + anak,
+    }
+    hasil["total"] = hasil["member"] + hasil["survivor"] + hasil["orphan"]
+    return {key: (v.reshape(bentuk) if bentuk else float(v[0])) for key, v in hasil.items()}
+
+
+# ==============================================================================
+# DEMO
+# ==============================================================================
+if __name__ == "__main__":
+    import time
+
+    from pensiun.dplk import pv_jp_benefit
+
+    # Satu peserta: mulai iur 2015 di usia 25, upah Rp 5 juta naik 7%, berhenti di usia 57 (2047)
+    T = 40
+    upah = wage_history(5_000_000, 0.07, 0, 32, T)
+    m = jp_benefit(upah, 0, 32, wage_index=0.04, invest_return_rate=0.065, wage_cap_growth=0.05,
+                   benefit_index=0.03)
+    print("=== MANFAAT JP PP 45/2015 (satu peserta) ===")
+    print(f"Masa iur                  : {m['years'][0]:.0f} tahun")
+    print(f"Upah akhir (nominal)      : Rp {upah[0, 31]:,.0f}")
+    print(f"Rata-rata upah tertimbang : Rp {m['average_indexed_wage'][0]:,.0f}")
+    print(f"Manfaat bulanan           : Rp {m['monthly_benefit'][0]:,.0f}")
+    liab = jp_liability(m["monthly_benefit"][0], 57, spouse_age=52, child_age=18, discount_rate=0.057,
+                        benefit_indexation=0.03)
+    for nama, label in (("member", "Peserta"), ("survivor", "Janda/duda 50%"), ("orphan", "Anak 50%"),
+                        ("total", "Total")):
+        print(f"  PV {label:<22}: Rp {liab[nama]:,.0f}")
+
+    gaji_akhir = upah[0, 31]
+    _, kasar, _ = pv_jp_benefit(gaji_akhir, 57, 0.065)
+    print(f"Pendekatan kalkulator2.py : Rp {kasar:,.0f} / bulan (0.01 x bulan iur x gaji akhir, dibatasi)")
+
+    # Skala: 1 juta peserta dengan jendela iur berbeda-beda
+    N = 1_000_000
+    rng = np.random.default_rng(41)
+    masuk = rng.integers(0, 20, N)
+    keluar = np.minimum(masuk + rng.integers(5, 36, N), T)
+    mulai = time.perf_counter()
+    upah = wage_history(rng.uniform(2e6, 2e7, N), rng.uniform(0.03, 0.09, N), masuk, keluar, T)
+    t_upah = time.perf_counter() - mulai
+    mulai = time.perf_counter()
+    m = jp_benefit(upah, masuk, keluar, wage_index=0.04, invest_return_rate=0.065, wage_cap_growth=0.05,
+                   benefit_index=0.03)
+    t_manfaat = time.perf_counter() - mulai
+    usia = np.minimum(25 + keluar - masuk + rng.integers(0, 10, N), 65)
+    mulai = time.perf_counter()
+    liab = jp_liability(m["monthly_benefit"], usia, usia - rng.integers(0, 8, N),
+                        np.where(rng.random(N) < 0.3, rng.integers(10, 23, N), np.nan), 0.057, 0.03)
+    t_liab = time.perf_counter() - mulai
+    print(f"\n{N:,} peserta: riwayat upah {t_upah:.2f} dtk, manfaat {t_manfaat:.2f} dtk, "
+          f"liabilitas {t_liab:.2f} dtk")
+    print(f"  layak manfaat bulanan : {m['eligible'].mean():.1%}")
+    print(f"  total liabilitas      : Rp {liab['total'].sum() / 1e12:,.2f} triliun")
+
+    # Cek cumsum vs loop langsung untuk 200 peserta
+    P = _kumulatif(np.full(T, 0.04))
+    for j in range(200):
+        e0, e1 = masuk[j], keluar[j]
+        w = np.minimum(upah[j, e0:e1], 7e6 * 1.05 ** np.arange(e0, e1))
+        rata = np.mean(w * P[e1 - 1] / P[e0:e1])
+        assert np.isclose(rata, m["average_indexed_wage"][j], rtol=1e-12)
+    print("  cek rata-rata upah tertimbang vs loop langsung: OK")
@@ -0,0 +1,280 @@
+"""
+Kompresi Portofolio Peserta menjadi Model Point.
+
+File kepesertaan riil berisi banyak sekali peserta dengan kunci (gender,
+usia, masa kerja, pita gaji) yang identik atau hampir identik, padahal
+mesin valuasi menghitung setiap peserta secara terpisah. `compress`
+mengelompokkan peserta menjadi model point berbobot:
+
+  - kolom tanpa pita (gender, tabel, usia bulat, ...) menjadi kunci eksak
+  - kolom dengan `bands` dikelompokkan per lebar absolut (misal usia 5 tahun)
+  - kolom dengan `log_bands` dikelompokkan per lebar relatif (misal gaji 5%)
+  - nilai wakil = rata-rata tertimbang anggota kelompok (dibulatkan untuk
+    kolom integer), bobot = jumlah peserta (atau bobot input)
+
+Pengelompokan memakai kode integer per kolom yang digabung menjadi satu
+kunci int64, lalu `np.unique` + `np.bincount`, tanpa loop per peserta.
+
+`ModelPoints.value` hanya memvaluasi model point lalu menskalakan hasilnya
+kembali (total tertimbang, atau per peserta lewat `expand`).
+`compress_to_tolerance` menyempitkan pita sampai galat total terhadap run
+penuh (pada sampel) di bawah toleransi, lalu melaporkan rasio kompresi.
+
+    mp = compress(peserta, bands={"age": 5}, log_bands={"start_wage": 0.05})
+    hasil = mp.value(dplk_contribution, {"start_age": "age", "start_wage": "start_wage"}, retirement_age=55)
+    mp.total(hasil)
+    python -m pensiun.model_points    # contoh 2 juta peserta
+"""
+
+import numpy as np
+
+
+# Batas aman kunci gabungan mixed radix (di bawah 2^63 - 1)
+BATAS_KUNCI = 2**62
+
+
+def _kode(kolom, lebar=None, log_lebar=None):
+    """Kode integer per peserta untuk satu kolom (eksak, pita absolut atau pita relatif)."""
+    if log_lebar is not None:
+        kolom = np.asarray(kolom, dtype=float)
+        if np.any(kolom <= 0):
+            raise ValueError("Kolom dengan pita relatif (log_bands) harus bernilai positif.")
+        return np.floor(np.log(kolom) / np.log1p(log_lebar)).astype(np.int64)
+    if lebar is not None:
+        return np.floor(np.asarray(kolom, dtype=float) / lebar).astype(np.int64)
+    return np.unique(kolom, return_inverse=True)[1].reshape(-1).astype(np.int64)
+
+
+def _padatkan(kunci):
+    """Kode padat 0..u-1 dengan urutan yang sama."""
+    return np.unique(kunci, return_inverse=True)[1].reshape(-1).astype(np.int64)
+
+
+def _gabung(kode):
+    """Gabungkan kode beberapa kolom menjadi satu kunci int64 (mixed radix)."""
+    kunci = np.zeros(len(kode[0]), dtype=np.int64)
+    for k in kode:
+        k = k - k.min()
+        basis = int(k.max()) + 1
+        # Cek overflow int64 SEBELUM mengalikan (aritmetika int Python): padatkan kunci dulu,
+        # lalu kolomnya juga bila radix sendiri terlalu besar (kolom eksak / pita sangat halus)
+        if (int(kunci.max()) + 1) * basis > BATAS_KUNCI:
+            kunci = _padatkan(kunci)
+            if (int(kunci.max()) + 1) * basis > BATAS_KUNCI:
+                k = _padatkan(k)
+                basis = int(k.max()) + 1
+        kunci = kunci * basis + k
+    return kunci
+
+
+class ModelPoints:
+    """
+    Model point berbobot hasil `compress`.
+
+    Attributes:
+        columns (dict): Nilai wakil per model point.
+        weights (np.ndarray): Bobot (jumlah peserta) per model point.
+        index (np.ndarray): Model point milik setiap peserta asli.
+    """
+
+    def __init__(self, columns, weights, index):
+        self.columns = columns
+        self.weights = weights
+        self.index = index
+
+    def __len__(self):
+        return len(self.weights)
+
+    def __repr__(self):
+        return f"ModelPoints({self.n_members:,} peserta -> {len(self):,} model point, rasio {self.ratio:,.0f}x)"
+
+    @property
+    def n_members(self):
+        return len(self.index)
+
+    @property
+    def ratio(self):
+        """Rasio kompresi: peserta per model point."""
+        return self.n_members / max(len(self), 1)
+
+    def value(self, fn, columns=None, **kwargs):
+        """
+        Menjalankan `fn` hanya pada model point.
+
+        Args:
+            fn (callable): Fungsi valuasi tervektorisasi yang mengembalikan dict array.
+            columns (dict): Nama argumen `fn` -> nama kolom model point (bawaan:
+                kolom dengan nama yang sama dengan argumen).
+            **kwargs: Argumen tetap lain untuk `fn`.
+
+        Returns:
+            dict array per model point
+        """
+        peta = columns or {k: k for k in self.columns}
+        return fn(**{arg: self.columns[kol] for arg, kol in peta.items()}, **kwargs)
+
+    def total(self, results):
+        """Jumlah tertimbang setiap kolom hasil (nilai portofolio)."""
+        return {k: float(np.dot(self.weights, np.asarray(v, dtype=float))) for k, v in results.items()
+                if np.ndim(v) == 1 and len(v) == len(self)}
+
+    def expand(self, results):
+        """Hasil per peserta asli (nilai model point milik masing-masing)."""
+        return {k: np.asarray(v)[self.index] for k, v in results.items()}
+
+
+def compress(columns, bands=None, log_bands=None, weights=None):
+    """
+    Mengelompokkan peserta menjadi model point.
+
+    Args:
+        columns (dict): Kolom peserta (array dengan panjang sama).
+        bands (dict): Kolom -> lebar pita absolut.
+        log_bands (dict): Kolom -> lebar pita relatif (0.05 = gaji dalam pita 5%).
+        weights (array-like): Bobot peserta (bawaan 1).
+
+    Returns:
+        ModelPoints
+    """
+    bands, log_bands = bands or {}, log_bands or {}
+    tidak_dikenal = (set(bands) | set(log_bands)) - set(columns)
+    if tidak_dikenal:
+        raise KeyError(f"Kolom pita tidak dikenal: {', '.join(sorted(tidak_dikenal))}")
+    columns = {k: np.asarray(v).reshape(-1) for k, v in columns.items()}
+    n = len(next(iter(columns.values())))
+    bobot = np.ones(n) if weights is None else np.asarray(weights, dtype=float).reshape(-1)
+
+    kode = [_kode(v, bands.get(k), log_bands.get(k)) for k, v in columns.items()]
+    _, awal, indeks = np.unique(_gabung(kode), return_index=True, return_inverse=True)
+    indeks = indeks.reshape(-1)
+    m = len(awal)
+    bobot_mp = np.bincount(indeks, weights=bobot, minlength=m)
+
+    wakil = {}
+    for k, v in columns.items():
+        if k not in bands and k not in log_bands:
+            wakil[k] = v[awal]  # kunci eksak: semua anggota bernilai sama
+            continue
+        rata = np.bincount(indeks, weights=bobot * v, minlength=m) / bobot_mp
+        wakil[k] = np.rint(rata).astype(v.dtype) if np.issubdtype(v.dtype, np.integer) else rata
+    return ModelPoints(wakil, bobot_mp, indeks)
+
+
+def valuation_error(model_points, full_results, mp_results):
+    """Galat relatif total model point vs total run penuh, per kolom hasil."""
+    total_mp = model_points.total(mp_results)
+    galat = {}
+    for k, penuh in full_results.items():
+        if k in total_mp:
+            acuan = float(np.sum(penuh))
+            galat[k] = abs(total_mp[k] - acuan) / abs(acuan) if acuan else abs(total_mp[k])
+    return galat
+
+
+def compress_to_tolerance(columns, fn, tolerance=1e-3, bands=None, log_bands=None, mapping=None, outputs=None,
+                          sample=200_000, seed=0, max_refine=8, **kwargs):
+    """
+    Menyempitkan pita (lebar dibagi dua) sampai galat relatif total <= `tolerance`.
+
+    Galat diukur terhadap run penuh pada sampel acak `sample` peserta (run
+    penuh dihitung sekali), lalu pita yang lolos dipakai untuk seluruh
+    portofolio. `outputs` membatasi kolom hasil yang diperiksa.
+
+    Returns:
+        tuple: (ModelPoints, laporan dict: bands, log_bands, sample_error, ratio, refinements, ...)
+    """
+    bands, log_bands = dict(bands or {}), dict(log_bands or {})
+    columns = {k: np.asarray(v).reshape(-1) for k, v in columns.items()}
+    n = len(next(iter(columns.values())))
+    pilih = np.sort(np.random.default_rng(seed).choice(n, min(sample, n), replace=False))
+    contoh = {k: v[pilih] for k, v in columns.items()}
+    peta = mapping or {k: k for k in columns}
+    penuh = fn(**{arg: contoh[kol] for arg, kol in peta.items()}, **kwargs)
+    if outputs:
+        penuh = {k: penuh[k] for k in outputs}
+
+    for langkah in range(max_refine + 1):
+        mp = compress(contoh, bands, log_bands)
+        galat = valuation_error(mp, penuh, mp.value(fn, peta, **kwargs))
+        if max(galat.values()) <= tolerance:
+            break
+        if langkah < max_refine:
+            bands = {k: w / 2 for k, w in bands.items()}
+            log_bands = {k: w / 2 for k, w in log_bands.items()}
+
+    hasil = compress(columns, bands, log_bands)
+    laporan = {
+        "bands": bands,
+        "log_bands": log_bands,
+        "sample_error": galat,
+        "tolerance": tolerance,
+        "within_tolerance": max(galat.values()) <= tolerance,
+        "refinements": langkah,
+        "members": hasil.n_members,
+        "model_points": len(hasil),
+        "ratio": hasil.ratio,
+    }
+    return hasil, laporan
+
+
+def print_report(laporan, full_error=None):
+    print(f"Peserta        : {laporan['members']:,}")
+    print(f"Model point    : {laporan['model_points']:,} (rasio {laporan['ratio']:,.0f}x, "
+          f"{laporan['refinements']} kali penyempitan pita)")
+    pita = {**laporan["bands"], **{k: f"{w:.2%} (relatif)" for k, w in laporan["log_bands"].items()}}
+    print(f"Pita           : {', '.join(f'{k}={v}' for k, v in pita.items()) or '-'}")
+    for judul, galat in (("Galat sampel", laporan["sample_error"]), ("Galat penuh", full_error)):
+        if galat:
+            print(f"{judul:<15}: " + ", ".join(f"{k} {v:.2e}" for k, v in galat.items()))
+    status = "OK" if laporan["within_tolerance"] else "TIDAK TERCAPAI"
+    print(f"Toleransi      : {laporan['tolerance']:.1e} -> {status}")
+
+
+# ==============================================================================
+# DEMO: 2 JUTA PESERTA DPLK
+# ==============================================================================
+if __name__ == "__main__":
+    import time
+
+    from pensiun.dplk import dplk_contribution
+
+    N = 2_000_000
+    rng = np.random.default_rng(43)
+    usia = rng.integers(22, 55, N)
+    peserta = {
+        "gender": rng.choice(["m", "f"], N),
+        "start_age": usia,
+        "retirement_age": np.where(rng.random(N) < 0.8, 55, 58),
+        "start_wage": np.round(rng.lognormal(np.log(6e6), 0.6, N), -4),
+    }
+    argumen = {"start_wage": "start_wage", "start_age": "start_age", "retirement_age": "retirement_age",
+               "gender": "gender"}
+    asumsi = {"salary_increase_rate": 0.05, "invest_return_rate": 0.06}
+    kolom_hasil = ("dplk_contribution", "dplk_fund", "pv_jp")
+
+    def valuasi(**kw):
+        hasil = dplk_contribution(**kw)
+        return {k: hasil[k] for k in kolom_hasil}
+
+    mulai = time.perf_counter()
+    mp, laporan = compress_to_tolerance(peserta, valuasi, tolerance=5e-4, log_bands={"start_wage": 0.20},
+                                        mapping=argumen, **asumsi)
+    t_kalibrasi = time.perf_counter() - mulai
+    mulai = time.perf_counter()
+    mp = compress(peserta, laporan["bands"], laporan["log_bands"])
+    t_kompresi = time.perf_counter() - mulai
+    mulai = time.perf_counter()
+    hasil_mp = mp.value(valuasi, argumen, **asumsi)
+    t_mp = time.perf_counter() - mulai
+
+    mulai = time.perf_counter()
+    penuh = valuasi(**{a: peserta[k] for a, k in argumen.items()}, **asumsi)
+    t_penuh = time.perf_counter() - mulai
+
+    print(f"{mp}\n")
+    print_report(laporan, valuation_error(mp, penuh, hasil_mp))
+    print(f"\nWaktu: kalibrasi pita {t_kalibrasi:.2f} dtk (sekali), kompresi {t_kompresi:.2f} dtk, "
+          f"valuasi model point {t_mp * 1e3:.1f} ms vs run penuh {t_penuh * 1e3:,.0f} ms")
+    total = mp.total(hasil_mp)
+    print(f"Total iuran DPLK bulanan: model point Rp {total['dplk_contribution'] / 1e9:,.3f} M vs "
+          f"penuh Rp {penuh['dplk_contribution'].sum() / 1e9:,.3f} M")
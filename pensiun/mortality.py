@@ -0,0 +1,163 @@
+"""
+Registri Tabel Mortalita.
+
+Semua tabel yang ada di `case_study_IRR_rate/data/` (TMI 4, GAM 71, GAM 83)
+didaftarkan di sini sehingga skrip lain tidak perlu lagi menulis path CSV
+sendiri-sendiri. File hanya dibaca saat pertama kali dibutuhkan, lalu disimpan
+di cache selama proses berjalan.
+
+Modul ini sengaja tidak meng-import pandas/numpy di level atas supaya query
+sederhana (satu faktor anuitas) tetap cepat dijalankan dari command line.
+"""
+
+import csv
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from pensiun import instrument
+
+# ==============================================================================
+# REGISTRI TABEL
+# ==============================================================================
+
+# Folder data bawaan; bisa diganti lewat environment variable PENSIUN_DATA_DIR
+DATA_DIR = Path(os.environ.get(
+    "PENSIUN_DATA_DIR",
+    Path(__file__).resolve().parent.parent / "case_study_IRR_rate" / "data",
+))
+
+# Nama tabel -> label tampilan. File: data/<nama>_<gender>.csv
+TABEL_MORTALITA = {
+    "tmi_4": "TMI 4",
+    "gam_71": "GAM 71",
+    "gam_83": "GAM 83",
+}
+
+GENDER = ("m", "f")
+
+# Tabel yang dipasang langsung dari memori (misal shared memory di worker
+# `pensiun.parallel`); didahulukan di atas pembacaan CSV.
+_TERPASANG = {}
+
+
+class MortalityTable:
+    """
+    Satu tabel mortalita (satu jenis kelamin) dengan kolom usia, qx dan lx.
+
+    Data disimpan sebagai list Python biasa; versi numpy (`lx_by_age`) dibuat
+    saat pertama kali diminta oleh mesin tervektorisasi.
+    """
+
+    def __init__(self, name, gender, ages, qx, lx):
+        self.name = name
+        self.gender = gender
+        self.ages = ages
+        self.qx = qx
+        self.lx = lx
+        self.min_age = ages[0]
+        self.max_age = ages[-1]
+        self._lx_by_age = None
+
+    @property
+    def label(self):
+        return f"{TABEL_MORTALITA.get(self.name, self.name)} {self.gender.upper()}"
+
+    def lx_at(self, usia):
+        """Mengambil l_x untuk usia bulat; 0 jika usia di luar ujung tabel."""
+        if usia < self.min_age:
+            raise KeyError(f"Usia {usia} tidak ditemukan di tabel {self.label}.")
+        if usia > self.max_age:
+            return 0.0
+        return self.lx[usia - self.min_age]
+
+    def annuity_due(self, usia, imbal_hasil, durasi=None):
+        """
+        Faktor anuitas hidup awal (ä_x atau ä_x:n|) versi skalar, tanpa numpy.
+
+        Rumus sama dengan `hitung_faktor_anuitas` di kalkulator2.py:
+        SUM [ v^t * l_{x+t} / l_x ], t = 0 .. (n-1) atau sampai akhir tabel.
+        """
+        lx_awal = self.lx_at(usia)
+        akhir = self.max_age - usia + 1 if durasi is None else durasi
+        v = 1 / (1 + imbal_hasil)
+        faktor_anuitas = 0.0
+        for t in range(akhir):
+            faktor_anuitas += self.lx_at(usia + t) / lx_awal * v**t
+        return faktor_anuitas
+
+    @property
+    def lx_by_age(self):
+        """
+        Array numpy l_x yang diindeks langsung dengan usia (indeks 0 = usia 0).
+
+        Usia di bawah awal tabel diisi NaN, dan satu slot ekstra setelah usia
+        maksimum diisi 0 supaya penjumlahan sampai akhir tabel tidak perlu
+        pengecekan batas.
+        """
+        if self._lx_by_age is None:
+            import numpy as np
+
+            arr = np.full(self.max_age + 2, np.nan)
+            arr[self.min_age:self.max_age + 1] = self.lx
+            arr[-1] = 0.0
+            self._lx_by_age = arr
+        return self._lx_by_age
+
+
+def path_tabel(name, gender):
+    """Path file CSV untuk tabel terdaftar."""
+    if name not in TABEL_MORTALITA:
+        raise KeyError(f"Tabel '{name}' tidak terdaftar. Pilihan: {', '.join(TABEL_MORTALITA)}")
+    if gender not in GENDER:
+        raise KeyError(f"Gender '{gender}' tidak dikenal. Gunakan 'm' atau 'f'.")
+    return DATA_DIR / f"{name}_{gender}.csv"
+
+
+def load_table(name="tmi_4", gender="m"):
+    """
+    Memuat tabel mortalita terdaftar (di-cache per proses).
+
+    Raises:
+        KeyError: nama tabel/gender tidak dikenal atau kolom 'usia'/'lx' tidak ada.
+        FileNotFoundError: file CSV tidak ditemukan.
+    """
+    terpasang = _TERPASANG.get((name, gender))
+    if terpasang is not None:
+        return terpasang
+    if not instrument.ENABLED:
+        return _load_table(name, gender)
+    miss_awal = _load_table.cache_info().misses
+    tabel = _load_table(name, gender)
+    instrument.cache_event("mortality.load_table", _load_table.cache_info().misses == miss_awal)
+    return tabel
+
+
+def install_table(name, gender, lx_by_age, qx_by_age):
+    """
+    Memasang tabel dari array l_x & q_x per usia yang sudah ada di memori
+    (format `lx_by_age`: indeks = usia, NaN di bawah usia awal, slot terakhir 0).
+    """
+    import numpy as np
+
+    usia = np.flatnonzero(~np.isnan(lx_by_age[:-1]))
+    awal, akhir = int(usia[0]), int(usia[-1])
+    tabel = MortalityTable(name, gender, list(range(awal, akhir + 1)), qx_by_age[awal:akhir + 1],
+                           lx_by_age[awal:akhir + 1])
+    tabel._lx_by_age = lx_by_age
+    _TERPASANG[(name, gender)] = tabel
+    return tabel
+
+
+@lru_cache(maxsize=None)
+@instrument.timed("mortality.read_csv")
+def _load_table(name, gender):
+    path = path_tabel(name, gender)
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        ages, qx, lx = [], [], []
+        for row in reader:
+            ages.append(int(float(row["usia"])))
+            qx.append(float(row["qx"]))
+            lx.append(float(row["lx"]))
+    return MortalityTable(name, gender, ages, qx, lx)
@@ -0,0 +1,265 @@
+"""
+Valuasi Batch Paralel Multi-Core dengan Tabel di Shared Memory.
+
+Meskipun sudah tervektorisasi, run skala nasional (puluhan juta peserta x
+beberapa tabel x beberapa bunga) tetap terikat pada satu core. `run`:
+
+  - menaruh array peserta, array hasil, tabel mortalita (l_x, q_x per usia)
+    dan vektor faktor diskonto kurva di `multiprocessing.shared_memory`
+  - setiap worker menempel (attach) ke blok-blok itu SEKALI saat start dan
+    memasang tabelnya lewat `mortality.install_table`, sehingga task hanya
+    berisi (kernel, awal, akhir): tidak ada array yang di-pickle per task
+  - setiap task menulis hasilnya langsung ke slice [awal:akhir] array hasil,
+    sehingga urutan hasil deterministik (sama dengan urutan input) berapa pun
+    jumlah worker dan urutan selesainya task
+  - melaporkan throughput per worker (baris, waktu sibuk, baris/detik)
+
+Kernel adalah fungsi level-modul `kernel(inputs, params) -> dict array`
+(lihat `kernel_annuity`, `kernel_jp`). `params` (skalar, `YieldCurve`)
+dikirim sekali per worker lewat initializer.
+
+    python -m pensiun.parallel --peserta 2000000 --workers 1 2 4
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from pensiun.mortality import GENDER, TABEL_MORTALITA, install_table, load_table
+
+TASK_PER_WORKER = 4
+UKURAN_CHUNK_MIN = 10_000
+
+
+# ==============================================================================
+# SHARED MEMORY
+# ==============================================================================
+
+class SharedArrays:
+    """Kumpulan array bernama di shared memory milik proses induk (context manager)."""
+
+    def __init__(self):
+        self._blok = {}
+        self.arrays = {}
+
+    def add(self, nama, array):
+        array = np.ascontiguousarray(array)
+        blok = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        view = np.ndarray(array.shape, dtype=array.dtype, buffer=blok.buf)
+        view[...] = array
+        self._blok[nama] = blok
+        self.arrays[nama] = view
+        return view
+
+    def empty(self, nama, shape, dtype):
+        return self.add(nama, np.zeros(shape, dtype=dtype))
+
+    @property
+    def descriptor(self):
+        """Deskripsi kecil (nama blok, shape, dtype) yang dikirim ke worker."""
+        return {nama: (self._blok[nama].name, a.shape, a.dtype.str) for nama, a in self.arrays.items()}
+
+    def close(self):
+        self.arrays.clear()
+        for blok in self._blok.values():
+            blok.close()
+            blok.unlink()
+        self._blok.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _attach(descriptor):
+    # Worker pool mewarisi resource tracker proses induk (fork maupun spawn), sehingga
+    # blok yang di-attach tidak perlu di-unregister: induk yang memanggil unlink.
+    blok, arrays = [], {}
+    for nama, (nama_blok, shape, dtype) in descriptor.items():
+        b = shared_memory.SharedMemory(name=nama_blok)
+        blok.append(b)
+        arrays[nama] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=b.buf)
+    return blok, arrays
+
+
+# ==============================================================================
+# WORKER
+# ==============================================================================
+
+_WORKER = {}
+
+
+def _init_worker(descriptor, params):
+    from pensiun.curve import YieldCurve
+
+    blok, arrays = _attach(descriptor)
+    for nama, array in arrays.items():
+        if nama.startswith("mortality/") and nama.endswith("/lx"):
+            _, tabel, gender, _ = nama.split("/")
+            install_table(tabel, gender, array, arrays[f"mortality/{tabel}/{gender}/qx"])
+    params = dict(params)
+    for nama, array in arrays.items():
+        if nama.startswith("curve/"):
+            params[nama[len("curve/"):]] = YieldCurve.from_discount_factors(array, name=nama)
+    _WORKER.update(blok=blok, arrays=arrays, params=params)
+
+
+def _task(kernel, awal, akhir):
+    mulai = time.perf_counter()
+    arrays = _WORKER["arrays"]
+    inputs = {k[len("in/"):]: v[awal:akhir] for k, v in arrays.items() if k.startswith("in/")}
+    hasil = kernel(inputs, _WORKER["params"])
+    for k, v in hasil.items():
+        arrays[f"out/{k}"][awal:akhir] = v
+    return os.getpid(), akhir - awal, time.perf_counter() - mulai
+
+
+# ==============================================================================
+# KERNEL BAWAAN
+# ==============================================================================
+
+def kernel_annuity(inputs, params):
+    """ä_x per peserta: inputs age, gender, table (+ rate jika params tidak berisi `rate`)."""
+    from pensiun.annuity import annuity_due
+
+    rate = params.get("rate", inputs.get("rate"))
+    return {"annuity": annuity_due(inputs["age"], rate, inputs["gender"], inputs["table"],
+                                   frequency=params.get("frequency", 1))}
+
+
+def kernel_jp(inputs, params):
+    """`simulate_jp_deficit` per peserta (kolom input = nama argumen, sisanya dari params)."""
+    from pensiun.valuation import simulate_jp_deficit
+
+    hasil = simulate_jp_deficit(**{**params, **inputs})
+    return {k: np.broadcast_to(v, len(next(iter(inputs.values())))) for k, v in hasil.items()}
+
+
+# ==============================================================================
+# EXECUTOR
+# ==============================================================================
+
+def _bagi(n, workers, chunk_size=None):
+    if chunk_size is None:
+        chunk_size = max(UKURAN_CHUNK_MIN, -(-n // (workers * TASK_PER_WORKER)))
+    return [(a, min(a + chunk_size, n)) for a in range(0, n, chunk_size)]
+
+
+def run(kernel, inputs, params=None, workers=None, chunk_size=None, tables=None):
+    """
+    Menjalankan `kernel` atas semua peserta secara paralel.
+
+    Args:
+        kernel (callable): Fungsi level-modul (inputs, params) -> dict array per baris.
+        inputs (dict): Kolom peserta (array dengan panjang sama).
+        params (dict): Parameter bersama; `YieldCurve` dikirim sebagai vektor DF di shared memory.
+        workers (int): Jumlah proses (bawaan: jumlah core yang tersedia).
+        tables (iterable): Nama tabel mortalita yang dibagikan (bawaan: semua terdaftar).
+
+    Returns:
+        tuple: (hasil dict array urut sesuai input, laporan dict)
+    """
+    from pensiun.curve import YieldCurve
+
+    if workers is None:
+        workers = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    params = dict(params or {})
+    inputs = {k: np.asarray(v) for k, v in inputs.items()}
+    n = len(next(iter(inputs.values())))
+
+    # Probe 1 baris di proses induk untuk mengetahui kolom & dtype hasil
+    contoh = kernel({k: v[:1] for k, v in inputs.items()}, params)
+
+    with SharedArrays() as shm:
+        for k, v in inputs.items():
+            shm.add(f"in/{k}", v)
+        for k, v in contoh.items():
+            v = np.asarray(v)
+            shm.empty(f"out/{k}", (n,) + v.shape[1:], v.dtype)
+        for nama in tables or TABEL_MORTALITA:
+            for g in GENDER:
+                tabel = load_table(nama, g)
+                qx = np.full(len(tabel.lx_by_age), np.nan)
+                qx[tabel.min_age:tabel.max_age + 1] = tabel.qx
+                shm.add(f"mortality/{nama}/{g}/lx", tabel.lx_by_age)
+                shm.add(f"mortality/{nama}/{g}/qx", qx)
+        for k in [k for k, v in params.items() if isinstance(v, YieldCurve)]:
+            shm.add(f"curve/{k}", params.pop(k).discount_factors)
+
+        tugas = _bagi(n, workers, chunk_size)
+        mulai = time.perf_counter()
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(shm.descriptor, params)) as pool:
+            catatan = list(pool.map(_task, [kernel] * len(tugas), *zip(*tugas)))
+        durasi = time.perf_counter() - mulai
+        hasil = {k[len("out/"):]: v.copy() for k, v in shm.arrays.items() if k.startswith("out/")}
+
+    per_worker = {}
+    for pid, baris, detik in catatan:
+        w = per_worker.setdefault(pid, {"tasks": 0, "rows": 0, "busy_s": 0.0})
+        w["tasks"] += 1
+        w["rows"] += baris
+        w["busy_s"] += detik
+    for w in per_worker.values():
+        w["rows_per_s"] = w["rows"] / w["busy_s"] if w["busy_s"] else 0.0
+    laporan = {
+        "rows": n,
+        "workers": workers,
+        "tasks": len(tugas),
+        "wall_s": durasi,
+        "rows_per_s": n / durasi if durasi else 0.0,
+        "per_worker": per_worker,
+    }
+    return hasil, laporan
+
+
+def print_report(laporan):
+    print(f"{laporan['rows']:,} baris, {laporan['workers']} worker, {laporan['tasks']} task: "
+          f"{laporan['wall_s']:.2f} dtk ({laporan['rows_per_s']:,.0f} baris/dtk)")
+    for pid, w in sorted(laporan["per_worker"].items()):
+        print(f"  pid {pid:<8} {w['tasks']:>3} task | {w['rows']:>12,} baris | "
+              f"sibuk {w['busy_s']:>7.2f} dtk | {w['rows_per_s']:>12,.0f} baris/dtk")
+
+
+# ==============================================================================
+# DEMO SKALABILITAS
+# ==============================================================================
+if __name__ == "__main__":
+    import argparse
+
+    from pensiun import parallel  # kernel harus direferensikan lewat modul, bukan __main__
+    from pensiun.valuation import simulate_jp_deficit
+
+    parser = argparse.ArgumentParser(description="Skalabilitas valuasi JP paralel")
+    parser.add_argument("--peserta", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(39)
+    n = args.peserta
+    kolom = {
+        "start_wage": rng.uniform(2e6, 2e7, n),
+        "years_of_service": rng.integers(10, 36, n),
+        "salary_increase_rate": rng.uniform(0.03, 0.10, n),
+        "invest_return_rate": rng.uniform(0.04, 0.09, n),
+        "spouse_age_diff": rng.integers(0, 8, n),
+    }
+    params = {"discount_rate": 0.057, "retirement_age": 56}
+    print(f"Core tersedia: {os.cpu_count()}")
+
+    acuan = None
+    for w in args.workers:
+        hasil, laporan = run(parallel.kernel_jp, kolom, params, workers=w)
+        print_report(laporan)
+        if acuan is None:
+            cek = simulate_jp_deficit(**{k: v[:1000] for k, v in kolom.items()}, **params)
+            assert np.allclose(hasil["funding_ratio"][:1000], cek["funding_ratio"], rtol=1e-12)
+            acuan = (laporan["wall_s"], hasil["funding_ratio"])
+        else:
+            assert np.array_equal(hasil["funding_ratio"], acuan[1])  # urutan & nilai deterministik
+            print(f"  speedup vs {args.workers[0]} worker: {acuan[0] / laporan['wall_s']:.2f}x")
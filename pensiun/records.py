@@ -0,0 +1,248 @@
+"""
+Wadah Hasil Berbasis Array (Structured Array & Record `__slots__`).
+
+`PensionValidator.simulate_jp_deficit` mengembalikan dict bersarang berisi
+string yang sudah diformat (`f"{salary_increase_rate:.1%}"`), dan
+`calculate_projection` / `run_visualization` membangun list dict per tahun
+lalu DataFrame. Untuk satu peserta tidak masalah, tetapi untuk satu juta
+baris overhead objek Python-nya bisa mencapai GB. Modul ini menyediakan:
+
+  - `ResultTable`  : satu structured array numpy (kolom input + hasil) per run.
+                     Uang & rasio float64, usia/masa kerja int16, tanpa objek
+                     Python per baris: 1 juta baris valuasi JP ~ 100 MB.
+  - `JPResult`     : record `__slots__` untuk hasil satu peserta.
+  - `PROJECTION_DTYPE`: tabel proyeksi per tahun (pengganti list dict).
+
+Nilai disimpan mentah (float) dan baru diformat saat ditampilkan lewat
+`format_value`, `ResultTable.print_rows` atau `JPResult.report`.
+
+    tabel = jp_table(2_500_000, 32, s, i, 0.057)    # s, i array 1 juta skenario
+    tabel["funding_ratio"].mean(), tabel.nbytes
+    tabel.row(0).report()                           # dict berlabel siap cetak
+"""
+
+import numpy as np
+
+# ==============================================================================
+# SKEMA KOLOM
+# ==============================================================================
+JP_INPUT_FIELDS = ("start_wage", "years_of_service", "salary_increase_rate", "invest_return_rate",
+                   "discount_rate", "benefit_indexation", "retirement_age", "spouse_age_diff")
+JP_RESULT_FIELDS = ("avg_wage", "monthly_benefit", "annuity_factor", "asset", "liability", "gap",
+                    "funding_ratio")
+
+# Kolom bilangan bulat (usia, tahun) disimpan sebagai int16
+KOLOM_BULAT = {"years_of_service", "retirement_age", "spouse_age_diff", "year", "age"}
+
+# Label & jenis format untuk tampilan (label mengikuti PensionValidator)
+LABEL = {
+    "start_wage": ("Gaji Awal", "rp"),
+    "years_of_service": ("Masa Kerja", "thn"),
+    "salary_increase_rate": ("Kenaikan Gaji", "pct"),
+    "invest_return_rate": ("Return Investasi", "pct"),
+    "discount_rate": ("Diskon Liabilitas", "pct"),
+    "benefit_indexation": ("Indexasi Manfaat", "pct"),
+    "retirement_age": ("Usia Pensiun", "thn"),
+    "spouse_age_diff": ("Beda Usia Istri", "thn"),
+    "avg_wage": ("Rata-rata Gaji", "rp"),
+    "monthly_benefit": ("Manfaat/Bulan Awal", "rp"),
+    "annuity_factor": ("Faktor Anuitas (Joint)", "faktor"),
+    "asset": ("Total Aset (Akumulasi)", "rp"),
+    "liability": ("Total Liabilitas (PV)", "rp"),
+    "gap": ("Gap (Unfunded)", "rp"),
+    "funding_ratio": ("Funding Ratio", "persen"),
+    "year": ("Tahun", "bulat"),
+    "wage": ("Gaji Bulanan", "rp"),
+    "contribution": ("Iuran Tahunan", "rp"),
+}
+
+PROJECTION_DTYPE = np.dtype([("year", "i2"), ("wage", "f8"), ("contribution", "f8"), ("asset", "f8")])
+
+
+def record_dtype(fields, float_dtype="f8"):
+    """Structured dtype untuk kolom `fields` (int16 untuk usia/tahun, `float_dtype` sisanya)."""
+    return np.dtype([(f, "i2" if f in KOLOM_BULAT else float_dtype) for f in fields])
+
+
+def format_value(field, value):
+    """Format satu nilai mentah untuk tampilan sesuai jenis kolomnya."""
+    jenis = LABEL.get(field, (field, None))[1]
+    if jenis == "rp":
+        return f"Rp {value:,.0f}"
+    if jenis == "pct":
+        return f"{value:.1%}"
+    if jenis == "persen":
+        return f"{value:.1f}%"
+    if jenis == "thn":
+        return f"{int(value)} thn"
+    if jenis == "bulat":
+        return f"{int(value)}"
+    if jenis == "faktor":
+        return f"{value:.4f}"
+    return f"{value}"
+
+
+# ==============================================================================
+# TABEL HASIL
+# ==============================================================================
+
+class ResultTable:
+    """
+    Hasil banyak baris sebagai satu structured array.
+
+    `tabel["kolom"]` mengembalikan view kolom (tanpa salinan), `tabel.row(i)`
+    satu record, `tabel[mask]` sub-tabel.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+    @classmethod
+    def from_columns(cls, columns, float_dtype="f8"):
+        """Membangun tabel dari dict kolom (skalar ikut di-broadcast ke jumlah baris)."""
+        nilai = np.broadcast_arrays(*(np.asarray(v) for v in columns.values()))
+        bentuk = nilai[0].shape
+        data = np.empty(int(np.prod(bentuk)), dtype=record_dtype(columns, float_dtype))
+        for nama, kolom in zip(columns, nilai):
+            data[nama] = kolom.ravel()
+        return cls(data)
+
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        """Membaca tabel dari file .npy (memory map bawaan: tidak dimuat ke RAM)."""
+        return cls(np.load(path, mmap_mode=mmap_mode))
+
+    def save(self, path):
+        np.save(path, self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return f"ResultTable({len(self):,} baris, {len(self.fields)} kolom, {self.nbytes / 1e6:,.1f} MB)"
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.data[key]
+        return ResultTable(np.atleast_1d(self.data[key]))
+
+    @property
+    def fields(self):
+        return self.data.dtype.names
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def row(self, i):
+        """Baris ke-i sebagai `JPResult` (kolom yang tidak ada bernilai None)."""
+        baris = self.data[i]
+        return JPResult(**{f: baris[f].item() for f in self.fields if f in JPResult.__slots__})
+
+    def to_frame(self):
+        """DataFrame pandas (hanya untuk tampilan/ekspor; import pandas ditunda)."""
+        import pandas as pd
+
+        return pd.DataFrame(self.data)
+
+    def print_rows(self, rows=slice(0, 10), fields=None):
+        """Cetak beberapa baris dengan format tampilan."""
+        fields = fields or self.fields
+        judul = [LABEL.get(f, (f,))[0] for f in fields]
+        lebar = [max(len(j), 14) for j in judul]
+        print(" | ".join(f"{j:>{w}}" for j, w in zip(judul, lebar)))
+        print("-+-".join("-" * w for w in lebar))
+        for baris in np.atleast_1d(self.data[rows]):
+            print(" | ".join(f"{format_value(f, baris[f]):>{w}}" for f, w in zip(fields, lebar)))
+
+
+# ==============================================================================
+# RECORD SATU PESERTA
+# ==============================================================================
+
+class JPResult:
+    """Hasil valuasi JP satu peserta: atribut float mentah, tanpa dict per objek."""
+
+    __slots__ = JP_INPUT_FIELDS + JP_RESULT_FIELDS
+
+    def __init__(self, **values):
+        for nama in self.__slots__:
+            setattr(self, nama, values.pop(nama, None))
+        if values:
+            raise TypeError(f"Kolom tidak dikenal: {', '.join(values)}")
+
+    def __repr__(self):
+        isi = ", ".join(f"{n}={getattr(self, n):.6g}" for n in self.__slots__ if getattr(self, n) is not None)
+        return f"JPResult({isi})"
+
+    def as_dict(self):
+        return {n: getattr(self, n) for n in self.__slots__}
+
+    def report(self):
+        """Dict bersarang berlabel seperti `PensionValidator` (string dibuat di sini, saat tampil)."""
+        def bagian(fields):
+            return {LABEL[f][0]: format_value(f, getattr(self, f)) for f in fields if getattr(self, f) is not None}
+
+        return {"Asumsi": bagian(JP_INPUT_FIELDS), "Hasil": bagian(JP_RESULT_FIELDS)}
+
+
+# ==============================================================================
+# KONSTRUKTOR
+# ==============================================================================
+
+def jp_table(start_wage, years_of_service, salary_increase_rate, invest_return_rate, discount_rate,
+             benefit_indexation=0.0, retirement_age=56, spouse_age_diff=3, float_dtype="f8", **kwargs):
+    """
+    `simulate_jp_deficit` yang dikemas sebagai `ResultTable` (kolom input + hasil).
+
+    `discount_rate` berupa `YieldCurve` tidak disimpan sebagai kolom.
+    """
+    from pensiun.curve import YieldCurve
+    from pensiun.valuation import simulate_jp_deficit
+
+    masukan = dict(zip(JP_INPUT_FIELDS, (start_wage, years_of_service, salary_increase_rate, invest_return_rate,
+                                         discount_rate, benefit_indexation, retirement_age, spouse_age_diff)))
+    hasil = simulate_jp_deficit(**masukan, **kwargs)
+    if isinstance(discount_rate, YieldCurve):
+        del masukan["discount_rate"]
+    return ResultTable.from_columns({**masukan, **hasil}, float_dtype)
+
+
+def jp_result(*args, **kwargs):
+    """Satu peserta sebagai `JPResult`."""
+    return jp_table(*args, **kwargs).row(0)
+
+
+# ==============================================================================
+# DEMO: MEMORI DICT vs STRUCTURED ARRAY
+# ==============================================================================
+if __name__ == "__main__":
+    import sys
+    import time
+
+
+    hasil = jp_result(2_500_000, 32, 0.0787, 0.0653, 0.057)
+    for judul, isi in hasil.report().items():
+        print(f"--- {judul} ---")
+        for k, v in isi.items():
+            print(f"{k:<24}: {v}")
+
+    N = 1_000_000
+    rng = np.random.default_rng(40)
+    s, i = rng.uniform(0.03, 0.10, N), rng.uniform(0.04, 0.09, N)
+    mulai = time.perf_counter()
+    tabel = jp_table(2_500_000, 32, s, i, 0.057)
+    print(f"\n{tabel} dalam {time.perf_counter() - mulai:.2f} dtk")
+
+    # Perkiraan memori bentuk lama (dict bersarang + string terformat) dari 1.000 sampel
+    contoh = [tabel.row(k).report() for k in range(1000)]
+    per_baris = sum(sys.getsizeof(d) + sum(sys.getsizeof(b) + sum(sys.getsizeof(k) + sys.getsizeof(v)
+                                                                  for k, v in b.items()) for b in d.values())
+                    for d in contoh) / len(contoh)
+    print(f"Bentuk dict terformat : ~{per_baris * N / 1e9:,.2f} GB untuk {N:,} baris")
+    print(f"Structured array      : {tabel.nbytes / 1e6:,.1f} MB ({tabel.nbytes / N:.0f} byte/baris)")
+    print()
+    tabel[:3].print_rows(fields=("salary_increase_rate", "invest_return_rate", "asset", "liability",
+                                 "funding_ratio"))
@@ -0,0 +1,51 @@
+"""
+Pencarian Akar Tervektorisasi.
+
+`brentq` di skrip cek-balance mencari SATU akar per panggilan. Untuk ribuan
+peserta, `bisect` di sini menjalankan bisection pada semua elemen sekaligus:
+setiap iterasi memanggil fungsi satu kali dengan array titik tengah, lalu
+memperbarui batas bawah/atas per elemen.
+"""
+
+import numpy as np
+
+from pensiun import instrument
+
+
+@instrument.timed("solver.bisect")
+def bisect(fn, lo, hi, xtol=1e-10, maxiter=100):
+    """
+    Akar f(x) = 0 untuk banyak persamaan sekaligus dengan metode bisection.
+
+    Args:
+        fn (callable): Menerima array x (shape sama dengan hasil broadcast
+            `lo`/`hi`) dan mengembalikan array f(x) dengan shape yang sama.
+        lo, hi (float | array-like): Batas interval per elemen.
+        xtol (float): Toleransi lebar interval.
+        maxiter (int): Batas iterasi (100 iterasi cukup untuk presisi double).
+
+    Returns:
+        np.ndarray (atau float): Akar per elemen; NaN jika f(lo) dan f(hi)
+        bertanda sama (tidak ada akar di dalam interval).
+    """
+    lo, hi = np.broadcast_arrays(np.asarray(lo, dtype=float), np.asarray(hi, dtype=float))
+    lo, hi = lo.copy(), hi.copy()
+    f_lo = np.asarray(fn(lo), dtype=float)
+    f_hi = np.asarray(fn(hi), dtype=float)
+    valid = np.sign(f_lo) * np.sign(f_hi) <= 0
+    instrument.count("solver.bisect.calls")
+    instrument.count("solver.bisect.evaluations", 2)
+
+    for _ in range(maxiter):
+        tengah = (lo + hi) / 2
+        if np.all(hi - lo < xtol):
+            break
+        f_tengah = np.asarray(fn(tengah), dtype=float)
+        instrument.count("solver.bisect.evaluations")
+        kiri = np.sign(f_tengah) == np.sign(f_lo)
+        lo = np.where(kiri, tengah, lo)
+        f_lo = np.where(kiri, f_tengah, f_lo)
+        hi = np.where(kiri, hi, tengah)
+
+    akar = np.where(valid, (lo + hi) / 2, np.nan)
+    return akar if akar.ndim else float(akar)
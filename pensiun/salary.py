@@ -0,0 +1,219 @@
+"""
+Skala Gaji Berbasis Usia & Masa Kerja dengan Indeks Gaji Kumulatif Pra-Hitung.
+
+Kenaikan gaji di seluruh repositori berupa satu laju datar
+(`kenaikan_gaji_pa`, `SALARY_INC_RATE`, `s_rate`), bahkan reverse engineer
+mencari satu angka implisit 7.87%. Skala gaji riil berbeda menurut usia dan
+masa kerja. `SalaryScale` menggabungkan:
+
+    (1 + s_{e,k}) = (1 + inflasi) * (1 + merit_usia(e + k)) * (1 + merit_masa_kerja(k))
+
+untuk peserta dengan usia masuk e pada masa kerja ke-k, lalu menyimpan
+indeks kumulatif per (usia masuk, masa kerja) SEKALI:
+
+    S[e, k]     = PROD_{u<k} (1 + s_{e,u})          (S[e, 0] = 1)
+    S_sum[e, k] = SUM_{t<k} S[e, t]
+
+Gaji proyeksi peserta mana pun di usia berapa pun cukup satu gather dan satu
+perkalian: w_x = w_c * S[e, x - e] / S[e, c - e]. Laju datar s adalah kasus
+khusus (`SalaryScale.flat(s)`, S[e, k] = (1 + s)^k) dan memberi hasil yang
+sama dengan rumus tertutup lama.
+
+Objek `SalaryScale` bisa diberikan sebagai `salary_increase_rate` pada
+`simulate_jp_deficit` (pensiun.valuation), `existing_benefits` /
+`dplk_contribution` (pensiun.dplk), `wage_history` (pensiun.jp) dan
+`ServiceTable.accumulation_factor` (pensiun.decrement). Usia masuk diambil
+dari usia pensiun - masa kerja (atau `start_age`).
+
+Format file CSV (merit desimal, diinterpolasi linear & datar di luar titik):
+
+    usia,merit              masa_kerja,merit
+    20,0.060                0,0.020
+    55,0.010                15,0.000
+"""
+
+import csv
+from pathlib import Path
+
+import numpy as np
+
+from pensiun.mortality import DATA_DIR
+
+# Rentang indeks: usia masuk 0..USIA_MAKS, masa kerja 0..MASA_KERJA_MAKS
+USIA_MAKS = 110
+MASA_KERJA_MAKS = 70
+
+# Contoh skala merit (angka ilustrasi, bukan hasil studi pengalaman)
+SKALA_USIA_CONTOH = DATA_DIR / "skala_gaji_contoh.csv"
+SKALA_MASA_KERJA_CONTOH = DATA_DIR / "skala_masa_kerja_contoh.csv"
+
+
+def _baca_skala(path, kolom):
+    """Titik (x, merit) dari CSV, terurut menurut x."""
+    with open(path, newline="") as f:
+        baris = sorted((float(r[kolom]), float(r["merit"])) for r in csv.DictReader(f))
+    return np.array([b[0] for b in baris]), np.array([b[1] for b in baris])
+
+
+def _per_titik(skala, n):
+    """Merit per usia/masa kerja 0..n-1 dari skalar, array per indeks, atau titik (x, merit)."""
+    if skala is None:
+        return np.zeros(n)
+    if isinstance(skala, tuple):
+        return np.interp(np.arange(n), *skala)
+    skala = np.asarray(skala, dtype=float)
+    if skala.ndim == 0:
+        return np.full(n, float(skala))
+    hasil = np.full(n, skala[-1])
+    hasil[:min(n, len(skala))] = skala[:n]
+    return hasil
+
+
+class SalaryScale:
+    """
+    Skala gaji (inflasi + merit usia + merit masa kerja) dengan indeks kumulatif pra-hitung.
+
+    Args:
+        age_merit: Merit per usia: skalar, array (indeks = usia) atau titik `(usia, merit)`.
+        service_merit: Merit per masa kerja, format sama.
+        inflation (float): Komponen inflasi / kenaikan umum.
+        name (str): Label untuk laporan.
+    """
+
+    def __init__(self, age_merit=None, service_merit=None, inflation=0.0, name="skala gaji"):
+        self.name = name
+        self.inflation = float(inflation)
+        self.age_merit = _per_titik(age_merit, USIA_MAKS + MASA_KERJA_MAKS + 1)
+        self.service_merit = _per_titik(service_merit, MASA_KERJA_MAKS)
+
+        e = np.arange(USIA_MAKS + 1)[:, None]
+        k = np.arange(MASA_KERJA_MAKS)[None, :]
+        laju = (1 + self.inflation) * (1 + self.age_merit[e + k]) * (1 + self.service_merit[k]) - 1
+        self.rates = laju
+        nol = np.zeros((USIA_MAKS + 1, 1))
+        self.index_table = np.hstack([nol + 1, np.cumprod(1 + laju, axis=1)])
+        self.index_sum = np.hstack([nol, np.cumsum(self.index_table[:, :-1], axis=1)])
+        for arr in (self.rates, self.index_table, self.index_sum):
+            arr.setflags(write=False)
+
+    @classmethod
+    def flat(cls, rate):
+        """Laju datar (kasus khusus: S[e, k] = (1 + rate)^k)."""
+        return cls(inflation=rate, name=f"datar {rate:.2%}")
+
+    @classmethod
+    def from_csv(cls, age_path=SKALA_USIA_CONTOH, service_path=None, inflation=0.0, name=None):
+        """Membaca merit usia ('usia','merit') dan/atau masa kerja ('masa_kerja','merit') dari CSV."""
+        usia = _baca_skala(age_path, "usia") if age_path else None
+        masa = _baca_skala(service_path, "masa_kerja") if service_path else None
+        return cls(usia, masa, inflation, name=name or (Path(age_path).stem if age_path else "skala gaji"))
+
+    def __repr__(self):
+        return f"SalaryScale({self.name}, inflasi {self.inflation:.2%})"
+
+    # --- Gather dasar ---
+
+    def _cek(self, entry_ages, years):
+        entry_ages, years = np.asarray(entry_ages).astype(int), np.asarray(years).astype(int)
+        if np.any(entry_ages < 0) or np.any(entry_ages > USIA_MAKS):
+            raise ValueError(f"Usia masuk harus di antara 0 dan {USIA_MAKS}.")
+        if np.any(years < 0) or np.any(years > MASA_KERJA_MAKS):
+            raise ValueError(f"Masa kerja harus di antara 0 dan {MASA_KERJA_MAKS} tahun.")
+        return entry_ages, years
+
+    def index(self, entry_ages, years):
+        """S[e, k]: pengali gaji setelah `years` tahun sejak masuk di usia `entry_ages`."""
+        e, k = self._cek(entry_ages, years)
+        hasil = self.index_table[e, k]
+        return hasil if np.ndim(hasil) else float(hasil)
+
+    def path(self, entry_ages, years):
+        """S[e, t] untuk t = 0..years-1, shape entry_ages.shape + (years,)."""
+        e, _ = self._cek(entry_ages, years)
+        return self.index_table[e[..., None], np.arange(int(years))]
+
+    # --- Padanan rumus laju datar ---
+
+    def project(self, wage, entry_ages, current_ages, target_ages):
+        """Gaji di usia `target_ages` dari gaji sekarang di usia `current_ages` (satu perkalian)."""
+        e = np.asarray(entry_ages)
+        hasil = (np.asarray(wage, dtype=float) * self.index(e, np.asarray(target_ages) - e)
+                 / self.index(e, np.asarray(current_ages) - e))
+        return hasil if np.ndim(hasil) else float(hasil)
+
+    def final_wage(self, start_wage, entry_ages, years):
+        """Gaji bulanan di akhir masa kerja: padanan W * (1 + s)^n."""
+        return np.asarray(start_wage, dtype=float) * self.index(entry_ages, years)
+
+    def average_wage(self, start_wage, entry_ages, years):
+        """Rata-rata upah nominal selama masa kerja: padanan `valuation.average_wage`."""
+        e, k = self._cek(entry_ages, years)
+        hasil = np.asarray(start_wage, dtype=float) * self.index_sum[e, k] / k
+        return hasil if np.ndim(hasil) else float(hasil)
+
+    def accumulation_factor(self, entry_ages, years, invest_return_rate, survival=None):
+        """
+        SUM_t S[e, t] * (1+i)^(n-1-t), t = 0..n-1: padanan `growing_annuity_fv(s, i, n)`.
+
+        `survival` (opsional, shape entry_ages.shape + (T,)) membobot iuran
+        tahun ke-t, misal tpx^τ dari `pensiun.decrement.ServiceTable`.
+        """
+        e, n = self._cek(entry_ages, years)
+        i = np.asarray(invest_return_rate, dtype=float)
+        T = int(n.max()) if n.size else 0
+        c = self.index_table[e[..., None], np.arange(T)]
+        if survival is not None:
+            c = c * survival[..., :T]
+        if e.ndim == 0 and n.ndim == 0:
+            # Polinomial dalam v = 1/(1+i) dengan koefisien S[e, t]: Horner, O(T) operasi array
+            v = 1 / (1 + i)
+            hasil = np.zeros(v.shape)
+            for t in range(T - 1, -1, -1):
+                hasil = hasil * v + c[t]
+            hasil = hasil * (1 + i) ** (n - 1)
+            return hasil if hasil.ndim else float(hasil)
+        hasil = np.zeros(np.broadcast_shapes(e.shape, n.shape, i.shape))
+        bunga = (1 + i) ** (n - 1)
+        for t in range(T):
+            hasil += bunga * np.where(t < n, c[..., t], 0.0)
+            bunga = bunga / (1 + i)
+        return hasil if hasil.ndim else float(hasil)
+
+
+# ==============================================================================
+# DEMO: SKALA MERIT vs LAJU DATAR
+# ==============================================================================
+if __name__ == "__main__":
+    import time
+
+    from pensiun.finmath import growing_annuity_fv
+    from pensiun.salary import SalaryScale  # kelas yang sama dengan yang dikenali mesin valuasi
+    from pensiun.valuation import average_wage, simulate_jp_deficit
+
+    # Laju datar = kasus khusus
+    datar = SalaryScale.flat(0.0787)
+    assert np.isclose(datar.average_wage(2_500_000, 24, 32), average_wage(2_500_000, 32, 0.0787))
+    assert np.isclose(datar.accumulation_factor(24, 32, 0.0653), growing_annuity_fv(0.0787, 0.0653, 32))
+
+    skala = SalaryScale.from_csv(service_path=SKALA_MASA_KERJA_CONTOH, inflation=0.035)
+    print(f"{skala}: kenaikan per usia (masuk usia 24)")
+    for x in (24, 30, 40, 50, 55):
+        print(f"  usia {x}: {skala.rates[24, x - 24]:.2%} | indeks S = {skala.index(24, x - 24):.3f}")
+    ekuivalen = skala.index(24, 32) ** (1 / 32) - 1
+    print(f"Laju datar ekuivalen (gaji akhir sama): {ekuivalen:.2%}\n")
+
+    for judul, s in (("Datar 7.87%", 0.0787), ("Skala merit", skala), (f"Datar {ekuivalen:.2%}", ekuivalen)):
+        h = simulate_jp_deficit(2_500_000, 32, s, 0.0653, 0.057)
+        print(f"{judul:<14}: rata gaji Rp {h['avg_wage']:>12,.0f} | aset Rp {h['asset']:>14,.0f} | "
+              f"FR {h['funding_ratio']:.1f}%")
+
+    # Proyeksi satu juta peserta: satu gather + satu perkalian
+    N = 1_000_000
+    rng = np.random.default_rng(46)
+    masuk = rng.integers(20, 35, N)
+    sekarang = masuk + rng.integers(0, 15, N)
+    gaji = rng.lognormal(np.log(6e6), 0.5, N)
+    mulai = time.perf_counter()
+    proyeksi = skala.project(gaji, masuk, sekarang, 56)
+    print(f"\nProyeksi gaji usia 56 untuk {N:,} peserta: {(time.perf_counter() - mulai) * 1e3:.1f} ms "
+          f"(median Rp {np.median(proyeksi):,.0f})")
@@ -0,0 +1,229 @@
+"""
+Sensitivitas Analitik (Greeks) Aset & Liabilitas Program JP.
+
+Untuk menjelaskan Slide 17, `simulate_jp_deficit` biasanya dijalankan ulang
+dengan input yang digeser satu per satu (bump-and-revalue: N+1 run penuh).
+Modul ini menghitung nilai DAN turunannya dalam satu pass tervektorisasi:
+
+    Aset        A = 12 * c * w * G(s, i, n),  G = SUM_t (1+s)^t (1+i)^(n-1-t)
+    Rata2 upah  W = w / n * S(s, n),          S = SUM_t (1+s)^t
+    Liabilitas  L = 12 * accrual * n * W * a(r, g, d)
+    Anuitas     a = SUM_t v^t * P_t - 11/24,  v = (1+g)/(1+r),
+                P_t = tpx + tpy - tpxy (joint life last survivor)
+
+Turunan G dan S memakai bentuk tertutup deret geometri (expm1/log1p, deret
+Taylor saat rasio ~ 1); turunan a terhadap r dan g memakai momen
+SUM_t t^k v^t P_t dari `joint_life_moments`:
+
+    da/dr   = -M1 / (1+r)                 durasi termodifikasi = -(da/dr) / a
+    d2a/dr2 = (M2 + M1) / (1+r)^2         konveksitas          = (d2a/dr2) / a
+    da/dg   =  M1 / (1+g)
+
+Selisih usia pasangan bersifat diskret, sehingga turunannya adalah selisih
+pusat +-1 tahun (dihitung di pass yang sama dengan usia pasangan ditumpuk).
+
+Kunci hasil turunan berbentuk "<metrik>/<parameter>", misalnya
+hasil["liability/discount_rate"].
+
+    python -m pensiun.sensitivity    # cek vs bump-and-revalue + perbandingan waktu
+"""
+
+import numpy as np
+
+from pensiun.annuity import KOREKSI_BULANAN, joint_life_moments
+from pensiun.mortality import load_table
+from pensiun.valuation import ACCRUAL_RATE, CONTRIBUTION_RATE, _as_output
+
+PARAMETER = ("salary_increase_rate", "invest_return_rate", "discount_rate", "benefit_indexation",
+             "spouse_age_diff")
+METRIK = ("asset", "liability", "gap", "funding_ratio", "required_contribution")
+
+# Di bawah ambang ini turunan deret geometri memakai deret Taylor (hindari cancellation)
+AMBANG_TAYLOR = 1e-6
+
+
+def _geometri(delta, n):
+    """S = SUM_{t<n} (1+delta)^t dan dS/d(delta), stabil untuk delta ~ 0."""
+    kecil = np.abs(delta) < AMBANG_TAYLOR
+    aman = np.where(kecil, 1.0, delta)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pangkat_1 = np.expm1(n * np.log1p(delta))          # (1+delta)^n - 1 tanpa cancellation
+        S = np.where(kecil, n + delta * n * (n - 1) / 2, pangkat_1 / aman)
+        dS = np.where(kecil, n * (n - 1) / 2 + delta * n * (n - 1) * (n - 2) / 3,
+                      (n * (1 + delta) ** (n - 1) - S) / aman)
+    return S, dS
+
+
+def _deret_upah(s, i, n):
+    """
+    G, dG/ds, dG/di, S, dS/ds.
+
+    G = (1+i)^(n-1) * SUM_t q^t dengan q = (1+s)/(1+i), sehingga kasus i ~ s
+    tidak perlu cabang khusus.
+    """
+    a = 1 + i
+    S, dS_ds = _geometri(s, n)
+    Sq, dSq = _geometri((s - i) / a, n)
+    G = a ** (n - 1) * Sq
+    dG_ds = a ** (n - 2) * dSq
+    dG_di = a ** (n - 2) * ((n - 1) * Sq - (1 + s) / a * dSq)
+    return G, dG_ds, dG_di, S, dS_ds
+
+
+def jp_sensitivities(start_wage, years_of_service, salary_increase_rate, invest_return_rate,
+                     discount_rate, benefit_indexation=0.0, retirement_age=56, spouse_age_diff=3,
+                     table="tmi_4", contribution_rate=CONTRIBUTION_RATE, accrual_rate=ACCRUAL_RATE):
+    """
+    Nilai `simulate_jp_deficit` beserta turunan analitiknya dalam satu pass.
+
+    Parameter sama dengan `pensiun.valuation.simulate_jp_deficit`.
+
+    Returns:
+        dict: asset, liability, gap, funding_ratio (%), required_contribution (%),
+        annuity_factor, duration, convexity, dan "<metrik>/<parameter>" untuk
+        setiap metrik di METRIK dan parameter di PARAMETER.
+    """
+    w, n, s, i, r, g, x, d = np.broadcast_arrays(*(
+        np.asarray(v, dtype=float) for v in (start_wage, years_of_service, salary_increase_rate,
+                                             invest_return_rate, discount_rate, benefit_indexation,
+                                             retirement_age, spouse_age_diff)
+    ))
+
+    # --- Sisi aset & upah ---
+    G, dG_ds, dG_di, S, dS_ds = _deret_upah(s, i, n)
+    iuran_awal = w * 12 * np.asarray(contribution_rate)
+    aset = iuran_awal * G
+    rata_gaji = w / n * S
+    dasar_liab = np.asarray(accrual_rate) * n * 12
+
+    # --- Anuitas: usia pasangan y, y+1, y-1 dalam satu panggilan ---
+    tabel_f = load_table(table, "f")
+    y = (x - d).astype(int)
+    y_naik = np.minimum(y + 1, tabel_f.max_age)
+    y_turun = np.maximum(y - 1, tabel_f.min_age)
+    ax, ay, axy = joint_life_moments(x.astype(int), np.stack([y, y_naik, y_turun]), r, g, table=table,
+                                     order=2)
+    momen = ax + ay - axy
+    M0, M1, M2 = momen[0, 0], momen[1, 0], momen[2, 0]
+    faktor = M0 - KOREKSI_BULANAN
+    faktor_naik, faktor_turun = momen[0, 1] - KOREKSI_BULANAN, momen[0, 2] - KOREKSI_BULANAN
+
+    da_dr = -M1 / (1 + r)
+    d2a_dr2 = (M2 + M1) / (1 + r) ** 2
+    da_dg = M1 / (1 + g)
+    # d = x - y: pasangan lebih muda (d naik) berarti y turun
+    langkah_d = np.maximum(y_naik - y_turun, 1)
+
+    liabilitas = dasar_liab * rata_gaji * faktor
+    nol = np.zeros_like(aset)
+    turunan = {
+        "asset": {
+            "salary_increase_rate": iuran_awal * dG_ds,
+            "invest_return_rate": iuran_awal * dG_di,
+            "discount_rate": nol,
+            "benefit_indexation": nol,
+        },
+        "liability": {
+            "salary_increase_rate": dasar_liab * w / n * dS_ds * faktor,
+            "invest_return_rate": nol,
+            "discount_rate": dasar_liab * rata_gaji * da_dr,
+            "benefit_indexation": dasar_liab * rata_gaji * da_dg,
+        },
+    }
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        funding_ratio = np.where(liabilitas != 0, aset / liabilitas * 100, 0.0)
+        # Iuran wajar (%) = L / aset iuran 1%; aset 1% sebanding dengan G
+        iuran_wajar = liabilitas / (w * 12 * 0.01 * G)
+        hasil = {
+            "avg_wage": rata_gaji,
+            "monthly_benefit": dasar_liab / 12 * rata_gaji,
+            "annuity_factor": faktor,
+            "asset": aset,
+            "liability": liabilitas,
+            "gap": aset - liabilitas,
+            "funding_ratio": funding_ratio,
+            "required_contribution": iuran_wajar,
+            "duration": -da_dr / faktor,
+            "convexity": d2a_dr2 / faktor,
+        }
+        dG = {"salary_increase_rate": dG_ds, "invest_return_rate": dG_di}
+        for p in PARAMETER[:-1]:
+            dA, dL = turunan["asset"][p], turunan["liability"][p]
+            hasil[f"asset/{p}"] = dA
+            hasil[f"liability/{p}"] = dL
+            hasil[f"gap/{p}"] = dA - dL
+            # Aturan hasil bagi: d(A/L) = (A/L) * (A'/A - L'/L)
+            hasil[f"funding_ratio/{p}"] = funding_ratio * (dA / aset - dL / liabilitas)
+            hasil[f"required_contribution/{p}"] = iuran_wajar * (dL / liabilitas - dG.get(p, nol) / G)
+
+        # Selisih pusat diskret untuk selisih usia pasangan (aset tidak terpengaruh)
+        liab_turun = dasar_liab * rata_gaji * faktor_naik   # d - 1 -> pasangan 1 tahun lebih tua
+        liab_naik = dasar_liab * rata_gaji * faktor_turun
+        selisih_liab = (liab_naik - liab_turun) / langkah_d
+        hasil["asset/spouse_age_diff"] = nol
+        hasil["liability/spouse_age_diff"] = selisih_liab
+        hasil["gap/spouse_age_diff"] = -selisih_liab
+        hasil["funding_ratio/spouse_age_diff"] = (aset / liab_naik - aset / liab_turun) * 100 / langkah_d
+        hasil["required_contribution/spouse_age_diff"] = selisih_liab / (w * 12 * 0.01 * G)
+
+    return _as_output(hasil)
+
+
+# ==============================================================================
+# VERIFIKASI vs BUMP-AND-REVALUE
+# ==============================================================================
+if __name__ == "__main__":
+    import time
+
+    from pensiun.valuation import simulate_jp_deficit
+
+    N = 100_000
+    rng = np.random.default_rng(17)
+    dasar = {
+        "salary_increase_rate": rng.uniform(0.03, 0.10, N),
+        "invest_return_rate": rng.uniform(0.04, 0.09, N),
+        "discount_rate": rng.uniform(0.04, 0.08, N),
+        "benefit_indexation": rng.uniform(0.0, 0.03, N),
+        "spouse_age_diff": rng.integers(0, 8, N),
+    }
+
+    def revalue(**geser):
+        args = {**dasar, **geser}
+        hasil = simulate_jp_deficit(2_500_000, 32, args["salary_increase_rate"], args["invest_return_rate"],
+                                    args["discount_rate"], args["benefit_indexation"], 56,
+                                    args["spouse_age_diff"])
+        hasil["required_contribution"] = hasil["liability"] / simulate_jp_deficit(
+            2_500_000, 32, args["salary_increase_rate"], args["invest_return_rate"], args["discount_rate"],
+            args["benefit_indexation"], 56, args["spouse_age_diff"], contribution_rate=0.01)["asset"]
+        return hasil
+
+    jp_sensitivities(2_500_000, 32, **{k: v[:10] for k, v in dasar.items()})  # pemanasan cache tabel
+    mulai = time.perf_counter()
+    analitik = jp_sensitivities(2_500_000, 32, **dasar)
+    t_analitik = time.perf_counter() - mulai
+
+    h = 1e-5
+    mulai = time.perf_counter()
+    pusat = revalue()
+    print(f"{'Metrik / Parameter':<46} | {'Galat relatif maks':>18}")
+    print("-" * 68)
+    for p in PARAMETER:
+        langkah = 1 if p == "spouse_age_diff" else h
+        naik = revalue(**{p: dasar[p] + langkah})
+        turun = revalue(**{p: dasar[p] - langkah})
+        for m in METRIK:
+            numerik = (naik[m] - turun[m]) / (2 * langkah)
+            skala = np.maximum(np.abs(numerik), np.abs(pusat[m]) * 1e-6)
+            galat = np.max(np.abs(analitik[f"{m}/{p}"] - numerik) / skala)
+            print(f"{m + ' / ' + p:<46} | {galat:>18.2e}")
+    r_naik = revalue(discount_rate=dasar["discount_rate"] + h)
+    r_turun = revalue(discount_rate=dasar["discount_rate"] - h)
+    t_bump = time.perf_counter() - mulai
+    durasi = -(r_naik["liability"] - r_turun["liability"]) / (2 * h) / pusat["liability"]
+    konveksitas = (r_naik["liability"] - 2 * pusat["liability"] + r_turun["liability"]) / h ** 2 / pusat["liability"]
+    print(f"{'duration':<46} | {np.max(np.abs(analitik['duration'] / durasi - 1)):>18.2e}")
+    print(f"{'convexity':<46} | {np.max(np.abs(analitik['convexity'] / konveksitas - 1)):>18.2e}")
+    print(f"\n{N:,} skenario: analitik {t_analitik * 1e3:,.0f} ms (1 pass) vs "
+          f"bump-and-revalue {t_bump * 1e3:,.0f} ms ({2 * len(PARAMETER) + 3} run) -> "
+          f"{t_bump / t_analitik:.1f}x")
@@ -0,0 +1,257 @@
+"""
+Lapisan Solver `brentq` dengan Warm-Start & Telemetri Konvergensi.
+
+`PensionReverseEngineer.solve_assumptions` dan `PolicySolver.solve_required_return`
+memanggil `scipy.optimize.brentq` dari nol dengan bracket tetap (0-15%,
+0-20%, 6-10%). Saat banyak skenario bertetangga dikalibrasi, akar skenario
+sebelumnya adalah tebakan awal yang sangat baik. `WarmStartSolver`:
+
+  - mengingat akar setiap skenario yang sudah terpecahkan (kunci = tuple
+    parameter skenario) dan menebak akar baru dari tetangga terdekatnya
+  - membangun bracket kecil di sekitar tebakan itu; lebarnya menyesuaikan
+    jarak akar-ke-tebakan terakhir dan melebar 2x sampai tanda f berubah
+    (tidak pernah keluar dari bracket default)
+  - menghitung evaluasi fungsi dan merekam jejak (x, f(x)) tiap solve
+  - mengembalikan `SolveResult` (bukan print + None) saat gagal
+
+    python -m pensiun.solver    # bandingkan evaluasi cold vs warm pada grid
+"""
+
+import heapq
+import math
+
+from pensiun import instrument
+
+# Lebar setengah bracket awal di sekitar tebakan warm-start
+LANGKAH_AWAL = 0.005
+LANGKAH_MIN = 1e-7
+FAKTOR_LEBAR = 2.0
+# Prediksi Newton sengaja dilebihkan sedikit agar akar cenderung sudah terkurung
+LEBIH_PREDIKSI = 1.05
+
+
+class SolveResult:
+    """Hasil satu solve beserta telemetrinya."""
+
+    __slots__ = ("root", "converged", "nfev", "bracket", "trace", "warm_start", "message")
+
+    def __init__(self, root, converged, nfev, bracket, trace, warm_start, message=""):
+        self.root = root
+        self.converged = converged
+        self.nfev = nfev
+        self.bracket = bracket
+        self.trace = trace
+        self.warm_start = warm_start
+        self.message = message
+
+    def as_dict(self):
+        return {nama: getattr(self, nama) for nama in self.__slots__}
+
+    def __repr__(self):
+        status = "OK" if self.converged else f"GAGAL ({self.message})"
+        return (f"SolveResult(root={self.root!r}, {status}, nfev={self.nfev}, "
+                f"bracket={self.bracket}, warm_start={self.warm_start})")
+
+
+class WarmStartSolver:
+    """
+    Pencari akar 1 dimensi untuk rangkaian skenario yang mirip.
+
+    Args:
+        lower, upper (float): Bracket default (sama dengan bracket skrip lama).
+        xtol (float): Toleransi akar untuk `brentq`.
+        keep_trace (bool): Simpan jejak (x, f(x)) di setiap `SolveResult`.
+    """
+
+    def __init__(self, lower, upper, xtol=1e-10, keep_trace=True):
+        self.lower = lower
+        self.upper = upper
+        self.xtol = xtol
+        self.keep_trace = keep_trace
+        self.solved = {}
+        self.history = []
+        self._langkah = LANGKAH_AWAL
+        self._kemiringan = None
+
+    # --- Telemetri ---
+
+    @property
+    def stats(self):
+        n = len(self.history)
+        return {
+            "solves": n,
+            "converged": sum(r.converged for r in self.history),
+            "warm_starts": sum(r.warm_start for r in self.history),
+            "nfev": sum(r.nfev for r in self.history),
+            "mean_nfev": sum(r.nfev for r in self.history) / n if n else 0.0,
+        }
+
+    def reset(self):
+        self.solved.clear()
+        self.history.clear()
+        self._langkah = LANGKAH_AWAL
+        self._kemiringan = None
+
+    # --- Solve ---
+
+    def guess(self, key):
+        """
+        Tebakan akar untuk `key` dari skenario yang sudah terpecahkan (None jika belum ada).
+
+        Memakai regresi linear lokal atas (dimensi key + 2) tetangga terdekat;
+        dengan satu tetangga saja, akar tetangga itu dipakai apa adanya.
+        """
+        if key is None or not self.solved:
+            return None
+        key = tuple(float(k) for k in key)
+        skala = [max(abs(k), 1e-12) for k in key]
+        sejenis = [k for k in self.solved if len(k) == len(key)]
+        if not sejenis:
+            return None
+
+        def jarak(lain):
+            return sum(((a - b) / s) ** 2 for a, b, s in zip(lain, key, skala))
+
+        tetangga = heapq.nsmallest(len(key) + 2, sejenis, key=jarak)
+        x0 = self.solved[tetangga[0]]
+        if len(tetangga) >= 2:
+            import numpy as np
+
+            A = np.array([[1.0] + [(a - b) / s for a, b, s in zip(k, key, skala)] for k in tetangga])
+            y = np.array([self.solved[k] for k in tetangga])
+            koef, _, rank, _ = np.linalg.lstsq(A, y, rcond=None)
+            if rank >= 2 and np.isfinite(koef[0]):
+                x0 = float(koef[0])
+        return min(max(x0, self.lower), self.upper)
+
+    def _bracket_warm(self, f, x0):
+        """
+        Bracket sempit di sekitar tebakan x0.
+
+        Langkah pertama memakai prediksi Newton dari kemiringan akar sebelumnya
+        (atau `_langkah` jika belum ada), lalu melebar 2x ke arah yang sama
+        sampai tanda f berubah. Jika batas bracket default tercapai tanpa
+        perubahan tanda, ujung seberangnya diperiksa: bila tandanya juga sama,
+        hasilnya sama dengan cold `brentq` (tidak ada akar) -> return "gagal".
+        """
+        f0 = f(x0)
+        if f0 == 0:
+            return x0, x0
+        if self._kemiringan:
+            langkah = -f0 / self._kemiringan
+            langkah = math.copysign(max(abs(langkah) * LEBIH_PREDIKSI, LANGKAH_MIN), langkah)
+        else:
+            langkah = self._langkah
+        batas = self.upper if langkah > 0 else self.lower
+        seberang = self.lower if langkah > 0 else self.upper
+
+        titik = x0
+        while titik != batas:
+            baru = min(x0 + langkah, self.upper) if langkah > 0 else max(x0 + langkah, self.lower)
+            fb = f(baru)
+            if fb == 0 or (fb < 0) != (f0 < 0):
+                return (min(titik, baru), max(titik, baru))
+            titik = baru
+            langkah *= FAKTOR_LEBAR
+
+        fs = f(seberang)
+        if fs == 0 or (fs < 0) != (f0 < 0):
+            return (min(x0, seberang), max(x0, seberang))
+        return "gagal"
+
+    def solve(self, fn, key=None):
+        """
+        Mencari akar `fn` untuk skenario `key` (tuple parameter, boleh None).
+
+        Returns:
+            SolveResult: `root` bernilai None jika tidak ada akar di bracket default.
+        """
+        from scipy.optimize import brentq
+
+        trace = []
+        memo = {}
+
+        def f(x):
+            # brentq mengevaluasi ulang kedua ujung bracket; memo membuatnya gratis
+            if x not in memo:
+                memo[x] = fn(x)
+                if self.keep_trace:
+                    trace.append((x, memo[x]))
+            return memo[x]
+
+        x0 = self.guess(key)
+        warm = x0 is not None
+        bracket = self._bracket_warm(f, x0) if warm else (self.lower, self.upper)
+
+        with instrument.timer("solver.brentq"):
+            try:
+                if bracket == "gagal":
+                    raise ValueError("f(a) and f(b) must have different signs")
+                if bracket[0] == bracket[1]:
+                    root = bracket[0]
+                else:
+                    root = brentq(f, bracket[0], bracket[1], xtol=self.xtol)
+                hasil = SolveResult(root, True, len(memo), bracket, trace, warm)
+            except ValueError as e:
+                hasil = SolveResult(None, False, len(memo), None, trace, warm, str(e))
+
+        instrument.count("solver.brentq.evaluations", len(memo))
+        if hasil.converged:
+            self._perbarui_kemiringan(memo, hasil.root)
+            if warm:
+                # Bracket adaptif: ikuti jarak akar dari tebakan terakhir
+                self._langkah = max(2 * abs(hasil.root - x0), LANGKAH_MIN)
+            if key is not None:
+                self.solved[tuple(float(k) for k in key)] = hasil.root
+        self.history.append(hasil)
+        return hasil
+
+    def _perbarui_kemiringan(self, memo, root):
+        """Kemiringan sekan dari dua evaluasi terdekat dengan akar (untuk prediksi berikutnya)."""
+        titik = sorted(memo, key=lambda x: abs(x - root))[:2]
+        if len(titik) == 2 and titik[0] != titik[1]:
+            kemiringan = (memo[titik[0]] - memo[titik[1]]) / (titik[0] - titik[1])
+            if kemiringan != 0 and math.isfinite(kemiringan):
+                self._kemiringan = kemiringan
+
+    def solve_many(self, make_fn, keys):
+        """
+        Menyelesaikan banyak skenario berurutan (urutkan `keys` agar bertetangga).
+
+        Args:
+            make_fn (callable): key -> fungsi objektif untuk skenario itu.
+        """
+        return [self.solve(make_fn(k), k) for k in keys]
+
+
+# ==============================================================================
+# DEMO: EVALUASI COLD vs WARM PADA GRID KALIBRASI
+# ==============================================================================
+if __name__ == "__main__":
+    import numpy as np
+
+    from pensiun.valuation import policy_balance
+
+    iuran = np.round(np.arange(0.07, 0.1201, 0.0025), 4)
+    accrual = np.round(np.arange(0.010, 0.0201, 0.0005), 4)
+    grid = [(c, a) for c in iuran for a in (accrual if int(c * 400) % 2 == 0 else accrual[::-1])]
+
+    def buat_fungsi(key):
+        c, a = key
+        return lambda i: policy_balance(i, c, a)
+
+    cold = WarmStartSolver(0.06, 0.10)
+    for key in grid:
+        cold.solve(buat_fungsi(key))  # tanpa key -> selalu dari bracket 6%-10%
+    warm = WarmStartSolver(0.06, 0.10)
+    warm.solve_many(buat_fungsi, grid)
+
+    beda = max(abs(a.root - b.root) for a, b in zip(cold.history, warm.history) if a.converged and b.converged)
+    print(f"Grid iuran x accrual: {len(grid)} skenario (bracket 6% - 10%)")
+    print(f"{'':<6} | {'Konvergen':>9} | {'Total nfev':>10} | {'nfev/konvergen':>14}")
+    for nama, solver in (("cold", cold), ("warm", warm)):
+        s = solver.stats
+        nfev_ok = [r.nfev for r in solver.history if r.converged]
+        print(f"{nama:<6} | {s['converged']:>9} | {s['nfev']:>10} | {sum(nfev_ok) / len(nfev_ok):>14.2f}")
+    print(f"Evaluasi warm = {warm.stats['nfev'] / cold.stats['nfev']:.0%} dari cold; "
+          f"selisih akar maks {beda:.1e}")
@@ -0,0 +1,329 @@
+"""
+Uji Stres Regulator & Manajemen (Batch) untuk Analisis Defisit Slide 17.
+
+Analisis defisit gaya Slide 17 harus ditunjukkan di bawah guncangan yang
+ditetapkan: diskonto -100bp, gaji +1%, longevity (q_x -10%), return -2%,
+serta kombinasinya. Modul ini membaca katalog stres (CSV) lalu menerapkan
+setiap guncangan pada asumsi dasar seluruh portofolio sekaligus.
+
+Valuasi JP (`simulate_jp_deficit`) dipecah menjadi faktor yang hanya
+bergantung pada sebagian asumsi:
+
+    aset        = 12 * c * w * G(s, i, n)        -> (gaji, return)
+    rata2 upah  = w * S(s, n) / n                -> (gaji)
+    anuitas     = ä^LS(x, y, r, g, tabel q_x)    -> (diskonto, longevity)
+
+Setiap faktor dihitung SEKALI per kunci unik (kombinasi guncangan yang
+relevan x nilai unik kolom peserta), sehingga stres yang hanya menggeser
+diskonto memakai ulang G dan S dasar, dan stres gaji memakai ulang anuitas
+dasar. Tabel q_x yang diguncang dipasang sekali lewat
+`pensiun.mortality.install_table`. Hasilnya matriks stres (stres x metrik):
+total aset, liabilitas, gap, funding ratio dan perubahannya terhadap Dasar.
+
+Format katalog (kolom yang tidak ada = tanpa guncangan):
+
+    nama,discount_shift,salary_shift,qx_factor,return_shift
+    Diskonto -100bp,-0.01,0,1,0
+
+    python -m pensiun stress --katalog katalog.csv
+    python -m pensiun.stress     # 50 stres vs 50 run terpisah
+"""
+
+import csv
+from itertools import combinations
+
+import numpy as np
+
+from pensiun.mortality import DATA_DIR, GENDER, install_table, load_table
+
+GUNCANGAN = {"discount_shift": 0.0, "salary_shift": 0.0, "qx_factor": 1.0, "return_shift": 0.0}
+METRIK = ("asset", "liability", "gap", "funding_ratio", "delta_gap", "delta_funding_ratio")
+KATALOG_CONTOH = DATA_DIR / "katalog_stres_contoh.csv"
+
+# Asumsi dasar portofolio (Slide 17) bila tidak diberikan
+PORTOFOLIO_DASAR = {
+    "start_wage": 2_500_000,
+    "years_of_service": 32,
+    "salary_increase_rate": 0.0787,
+    "invest_return_rate": 0.0653,
+    "discount_rate": 0.057,
+    "benefit_indexation": 0.0,
+    "retirement_age": 56,
+    "spouse_age_diff": 3,
+}
+
+
+# ==============================================================================
+# KATALOG
+# ==============================================================================
+
+def load_catalogue(path=KATALOG_CONTOH):
+    """Membaca katalog stres: list dict {name, discount_shift, salary_shift, qx_factor, return_shift}."""
+    katalog = []
+    with open(path, newline="") as f:
+        for baris in csv.DictReader(f):
+            stres = {"name": baris.pop("nama", None) or baris.pop("name")}
+            tidak_dikenal = set(baris) - set(GUNCANGAN)
+            if tidak_dikenal:
+                raise KeyError(f"Kolom katalog tidak dikenal: {', '.join(sorted(tidak_dikenal))}")
+            for k, bawaan in GUNCANGAN.items():
+                nilai = baris.get(k, "")
+                stres[k] = float(nilai) if nilai.strip() else bawaan
+            katalog.append(stres)
+    return katalog
+
+
+def combine(*stresses, name=None):
+    """Gabungan beberapa stres: geseran dijumlahkan, faktor q_x dikalikan."""
+    gabung = {"name": name or " & ".join(s["name"] for s in stresses)}
+    for k, bawaan in GUNCANGAN.items():
+        nilai = [s.get(k, bawaan) for s in stresses]
+        gabung[k] = float(np.prod(nilai)) if k == "qx_factor" else float(sum(nilai))
+    return gabung
+
+
+def with_combinations(catalogue, order=2):
+    """
+    Katalog + semua kombinasi sampai `order` stres tunggal.
+
+    Hanya baris dengan tepat satu guncangan yang dikombinasikan; kombinasi
+    yang sudah ada di katalog (guncangan sama) tidak ditambahkan lagi.
+    """
+    tunggal = [s for s in catalogue if sum(s[k] != v for k, v in GUNCANGAN.items()) == 1]
+    hasil = list(catalogue)
+    ada = {tuple(s[k] for k in GUNCANGAN) for s in catalogue}
+    for r in range(2, order + 1):
+        for c in combinations(tunggal, r):
+            gabung = combine(*c)
+            kunci = tuple(gabung[k] for k in GUNCANGAN)
+            if kunci not in ada:
+                ada.add(kunci)
+                hasil.append(gabung)
+    return hasil
+
+
+def shocked_table(table, qx_factor):
+    """Nama tabel dengan q_x x `qx_factor` (dipasang sekali per proses untuk kedua gender)."""
+    if qx_factor == 1.0:
+        return table
+    nama = f"{table}@qx{qx_factor:g}"
+    for g in GENDER:
+        try:
+            load_table(nama, g)
+            continue
+        except KeyError:
+            pass
+        dasar = load_table(table, g)
+        qx = np.full(dasar.max_age + 2, np.nan)
+        qx[dasar.min_age:dasar.max_age + 1] = np.minimum(np.asarray(dasar.qx) * qx_factor, 1.0)
+        qx[dasar.max_age] = 1.0
+        lx = np.full(dasar.max_age + 2, np.nan)
+        lx[dasar.min_age:dasar.max_age + 1] = dasar.lx[0] * np.concatenate(
+            ([1.0], np.cumprod(1 - qx[dasar.min_age:dasar.max_age])))
+        lx[-1] = 0.0
+        install_table(nama, g, lx, qx)
+    return nama
+
+
+# ==============================================================================
+# MESIN
+# ==============================================================================
+
+def _unik(*kolom):
+    """
+    Baris unik dari beberapa kolom 1-D (panjang sama) lewat kunci integer
+    mixed-radix `pensiun.model_points._gabung` (dengan cek overflow int64;
+    jauh lebih cepat daripada `np.unique(axis=0)`).
+
+    Returns:
+        tuple: (list kolom unik, indeks balik per baris)
+    """
+    from pensiun.model_points import _gabung, _kode
+
+    if len(kolom[0]) == 0:
+        return [np.asarray(k) for k in kolom], np.zeros(0, dtype=np.int64)
+    kunci = _gabung([_kode(k) for k in kolom])
+    _, awal, balik = np.unique(kunci, return_index=True, return_inverse=True)
+    return [np.asarray(k)[awal] for k in kolom], balik.reshape(-1)
+
+
+class StressResult:
+    """Matriks stres: `names` (K,) dan `columns` metrik -> array (K,); `detail` per peserta (K, N) opsional."""
+
+    def __init__(self, catalogue, columns, detail=None, evaluations=None):
+        self.catalogue = catalogue
+        self.names = [s["name"] for s in catalogue]
+        self.columns = columns
+        self.detail = detail
+        self.evaluations = evaluations or {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f"StressResult({len(self)} stres)"
+
+    def __getitem__(self, key):
+        return self.columns[key]
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame({"stress": self.names, **self.columns}).set_index("stress")
+
+    def save_csv(self, path):
+        with open(path, "w", newline="") as f:
+            tulis = csv.writer(f)
+            tulis.writerow(["nama", *self.columns])
+            for k, nama in enumerate(self.names):
+                tulis.writerow([nama, *(f"{v[k]:.6f}" for v in self.columns.values())])
+
+    def print_matrix(self, scale=1e6, unit="Jt"):
+        lebar = max(12, max(len(n) for n in self.names))
+        print(f"{'Stres':<{lebar}} | {'Aset':>12} | {'Liabilitas':>12} | {'Gap':>12} | {'FR':>7} | "
+              f"{'ΔGap':>11} | {'ΔFR':>7}")
+        print("-" * (lebar + 81))
+        for k, nama in enumerate(self.names):
+            c = {m: v[k] for m, v in self.columns.items()}
+            print(f"{nama:<{lebar}} | {c['asset'] / scale:>9,.1f} {unit} | {c['liability'] / scale:>9,.1f} {unit} | "
+                  f"{c['gap'] / scale:>9,.1f} {unit} | {c['funding_ratio']:>6.1f}% | "
+                  f"{c['delta_gap'] / scale:>8,.1f} {unit} | {c['delta_funding_ratio']:>+6.1f}")
+
+
+def run_stresses(catalogue, portfolio=None, table="tmi_4", contribution_rate=None, accrual_rate=None,
+                 detail=False):
+    """
+    Menjalankan semua stres katalog pada seluruh portofolio dalam satu pass tervektorisasi.
+
+    Args:
+        catalogue (list): Hasil `load_catalogue` / `with_combinations`.
+        portfolio (dict): Kolom argumen `simulate_jp_deficit` per peserta (skalar di-broadcast);
+            kolom yang tidak ada memakai `PORTOFOLIO_DASAR`. `discount_rate` boleh `YieldCurve`.
+        detail (bool): Simpan juga hasil per peserta (aset, liabilitas, funding ratio) shape (K, N).
+
+    Returns:
+        StressResult (total portofolio per stres; delta terhadap stres pertama tanpa guncangan,
+        atau terhadap baris pertama bila tidak ada).
+    """
+    from pensiun.annuity import last_survivor_annuity
+    from pensiun.curve import YieldCurve
+    from pensiun.finmath import growing_annuity_fv
+    from pensiun.valuation import ACCRUAL_RATE, CONTRIBUTION_RATE, average_wage
+
+    c = CONTRIBUTION_RATE if contribution_rate is None else contribution_rate
+    accrual = ACCRUAL_RATE if accrual_rate is None else accrual_rate
+    data = {**PORTOFOLIO_DASAR, **(portfolio or {})}
+    kurva = data.pop("discount_rate") if isinstance(data["discount_rate"], YieldCurve) else None
+    if kurva is not None:
+        data["discount_rate"] = 0.0
+    p = dict(zip(data, (a.reshape(-1) for a in np.broadcast_arrays(*(np.asarray(v) for v in data.values())))))
+    p["retirement_age"] = p["retirement_age"].astype(int)
+    p["spouse_age_diff"] = p["spouse_age_diff"].astype(int)
+    w, n = p["start_wage"].astype(float), p["years_of_service"].astype(float)
+
+    geser = {k: np.array([st[k] for st in catalogue], dtype=float) for k in GUNCANGAN}
+    K = len(catalogue)
+    hitung = {}
+
+    # 1. Faktor aset G(s, i, n) & rata-rata upah: grid (guncangan unik) x (kunci peserta unik), lalu gather
+    (ds, di), stres_ai = _unik(geser["salary_shift"], geser["return_shift"])
+    (su, iu, nu), peserta_ai = _unik(p["salary_increase_rate"], p["invest_return_rate"], n)
+    G = growing_annuity_fv(su[None, :] + ds[:, None], iu[None, :] + di[:, None], nu[None, :])
+    G = G[stres_ai[:, None], peserta_ai[None, :]]
+    hitung["asset_factor"] = len(ds) * len(su)
+
+    (ds,), stres_w = _unik(geser["salary_shift"])
+    (su, nu), peserta_w = _unik(p["salary_increase_rate"], n)
+    rata = average_wage(1.0, nu[None, :], su[None, :] + ds[:, None])
+    rata = np.asarray(rata)[stres_w[:, None], peserta_w[None, :]]
+    hitung["wage_factor"] = len(ds) * len(su)
+
+    # 2. Anuitas last survivor: per faktor q_x unik, grid (diskonto unik) x (x, y, r, g peserta unik)
+    usia_y = p["retirement_age"] - p["spouse_age_diff"]
+    (xu, yu, ru, gu), peserta_a = _unik(p["retirement_age"], usia_y, p["discount_rate"], p["benefit_indexation"])
+    (dr, fq), stres_a = _unik(geser["discount_shift"], geser["qx_factor"])
+    grid = np.empty((len(dr), len(xu)))
+    for faktor in np.unique(fq):
+        baris = np.flatnonzero(fq == faktor)
+        nama_tabel = shocked_table(table, float(faktor))
+        if kurva is not None:
+            for k in baris:
+                grid[k] = last_survivor_annuity(xu, yu, kurva.shift(dr[k]), gu, table=nama_tabel)
+            continue
+        grid[baris] = last_survivor_annuity(xu[None, :], yu[None, :], ru[None, :] + dr[baris, None],
+                                            gu[None, :], table=nama_tabel)
+    anuitas = grid[stres_a[:, None], peserta_a[None, :]]
+    hitung["annuity"] = grid.size
+
+    # 3. Rakit per stres x peserta
+    aset = 12 * c * w * G
+    liabilitas = accrual * n * w * rata * 12 * anuitas
+    total_aset, total_liab = aset.sum(axis=1), liabilitas.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fr = np.where(total_liab != 0, total_aset / total_liab * 100, 0.0)
+    dasar = next((k for k, st in enumerate(catalogue) if all(st[g] == v for g, v in GUNCANGAN.items())), 0)
+    kolom = {
+        "asset": total_aset,
+        "liability": total_liab,
+        "gap": total_aset - total_liab,
+        "funding_ratio": fr,
+    }
+    kolom["delta_gap"] = kolom["gap"] - kolom["gap"][dasar]
+    kolom["delta_funding_ratio"] = fr - fr[dasar]
+    rinci = None
+    if detail:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rinci = {"asset": aset, "liability": liabilitas,
+                     "funding_ratio": np.where(liabilitas != 0, aset / liabilitas * 100, 0.0)}
+    return StressResult(catalogue, kolom, rinci, hitung)
+
+
+# ==============================================================================
+# DEMO: KATALOG CONTOH & 50 STRES vs 50 RUN TERPISAH
+# ==============================================================================
+if __name__ == "__main__":
+    import time
+
+    from pensiun.valuation import simulate_jp_deficit
+
+    katalog = load_catalogue()
+    hasil = run_stresses(katalog)
+    print("Katalog contoh, satu peserta Slide 17:\n")
+    hasil.print_matrix()
+
+    # Portofolio 200 ribu peserta & 50 stres (katalog + kombinasi + grid diskonto/gaji)
+    N = 200_000
+    rng = np.random.default_rng(48)
+    portofolio = {
+        "start_wage": np.round(rng.lognormal(np.log(4e6), 0.5, N), -4),
+        "years_of_service": rng.integers(15, 36, N),
+        "retirement_age": np.where(rng.random(N) < 0.7, 56, 58),
+        "spouse_age_diff": rng.integers(0, 8, N),
+    }
+    besar = with_combinations(katalog[:5], order=2)
+    besar += [{"name": f"Diskonto {d:+.2%} & gaji {g:+.2%}", "discount_shift": d, "salary_shift": g,
+               "qx_factor": 1.0, "return_shift": 0.0}
+              for d in (-0.015, -0.005, 0.005, 0.015) for g in (-0.01, -0.005, 0.005, 0.015, 0.02, 0.025, 0.03,
+                                                               0.035, 0.04, 0.045)][:50 - len(besar)]
+    mulai = time.perf_counter()
+    matriks = run_stresses(besar, portofolio)
+    t_batch = time.perf_counter() - mulai
+
+    # 50 run terpisah (simulate_jp_deficit penuh per stres)
+    mulai = time.perf_counter()
+    for k, st in enumerate(besar):
+        r = simulate_jp_deficit(portofolio["start_wage"], portofolio["years_of_service"],
+                                PORTOFOLIO_DASAR["salary_increase_rate"] + st["salary_shift"],
+                                PORTOFOLIO_DASAR["invest_return_rate"] + st["return_shift"],
+                                PORTOFOLIO_DASAR["discount_rate"] + st["discount_shift"], 0.0,
+                                portofolio["retirement_age"], portofolio["spouse_age_diff"],
+                                table=shocked_table("tmi_4", st["qx_factor"]))
+        assert np.isclose(r["liability"].sum(), matriks["liability"][k])
+        assert np.isclose(r["asset"].sum(), matriks["asset"][k])
+    t_terpisah = time.perf_counter() - mulai
+
+    print(f"\n{len(besar)} stres x {N:,} peserta: batch {t_batch:.2f} dtk vs {len(besar)} run terpisah "
+          f"{t_terpisah:.2f} dtk ({t_terpisah / t_batch:.0f}x, hasil identik)")
+    print("Evaluasi faktor unik: " + ", ".join(f"{k} {v:,}" for k, v in matriks.evaluations.items()))
+    print()
+    StressResult(besar[:12], {m: v[:12] for m, v in matriks.columns.items()}).print_matrix(scale=1e9, unit="M")
@@ -0,0 +1,175 @@
+"""
+PPh 21 Final atas Manfaat Sekaligus (Pesangon, JHT, Uang Pensiun) Tervektorisasi.
+
+`kalkulator2.py` menjumlahkan JHT, pesangon dan PV JP bruto sebagai "Total
+Dana Siap Pakai". Padahal pesangon dan manfaat pensiun/JHT yang dibayar
+sekaligus dikenai PPh 21 final dengan tarif progresif, sehingga dana neto dan
+iuran DPLK yang dibutuhkan ikut berubah.
+
+Tabel tarif disimpan per regulasi (`REGULASI`) dan per jenis penghasilan.
+Setiap `BracketTable` menyimpan pajak kumulatif di batas bawah lapisan,
+sehingga pajak array jumlah berapa pun cukup satu `searchsorted` dan satu
+perkalian:
+
+    k      = lapisan tempat jumlah x jatuh
+    pajak  = kumulatif[k] + tarif[k] * (x - batas_bawah[k])
+
+PP 68/2009 (tarif PPh 21 final atas penghasilan sekaligus):
+
+    Pesangon                          Uang pensiun / JHT / THT sekaligus
+    0 - 50 jt        0%               0 - 50 jt     0%
+    50 - 100 jt      5%               > 50 jt       5%
+    100 - 500 jt    15%
+    > 500 jt        25%
+
+Penerima tanpa NPWP dikenai tarif 20% lebih tinggi (UU PPh Pasal 21 ayat 5a).
+Regulasi baru cukup dipasang dengan `install_regulation`; mesin valuasi
+memilihnya lewat nama (`tax_regulation="pp68_2009"` pada
+`pensiun.dplk.dplk_contribution`).
+"""
+
+import numpy as np
+
+JENIS_PENGHASILAN = ("pesangon", "pension_lump_sum")
+REGULASI_BAWAAN = "pp68_2009"
+TAMBAHAN_TANPA_NPWP = 0.20
+
+
+class BracketTable:
+    """
+    Tabel tarif progresif dengan pajak kumulatif pra-hitung.
+
+    Args:
+        lower_bounds (array-like): Batas bawah tiap lapisan (Rp), dimulai dari 0, naik.
+        rates (array-like): Tarif marjinal tiap lapisan (desimal).
+        name (str): Label untuk laporan.
+    """
+
+    def __init__(self, lower_bounds, rates, name="tarif"):
+        self.name = name
+        self.lower_bounds = np.asarray(lower_bounds, dtype=float)
+        self.rates = np.asarray(rates, dtype=float)
+        if self.lower_bounds.shape != self.rates.shape or self.lower_bounds[0] != 0:
+            raise ValueError("Batas bawah harus dimulai dari 0 dan sepanjang daftar tarif.")
+        if np.any(np.diff(self.lower_bounds) <= 0):
+            raise ValueError("Batas bawah lapisan harus naik tegas.")
+        self.cumulative = np.concatenate([[0.0], np.cumsum(np.diff(self.lower_bounds) * self.rates[:-1])])
+        for arr in (self.lower_bounds, self.rates, self.cumulative):
+            arr.setflags(write=False)
+
+    def __repr__(self):
+        lapisan = ", ".join(f">{b / 1e6:g}jt {r:.0%}" for b, r in zip(self.lower_bounds, self.rates))
+        return f"BracketTable({self.name}: {lapisan})"
+
+    def tax(self, amounts):
+        """Pajak atas jumlah bruto (jumlah negatif dianggap 0)."""
+        x = np.maximum(np.asarray(amounts, dtype=float), 0.0)
+        k = np.searchsorted(self.lower_bounds, x, side="right") - 1
+        hasil = self.cumulative[k] + self.rates[k] * (x - self.lower_bounds[k])
+        return hasil if hasil.ndim else float(hasil)
+
+    def effective_rate(self, amounts):
+        """Tarif efektif pajak / bruto (0 untuk jumlah 0)."""
+        x = np.asarray(amounts, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hasil = np.where(x > 0, self.tax(x) / x, 0.0)
+        return hasil if hasil.ndim else float(hasil)
+
+
+# ==============================================================================
+# REGISTRI REGULASI
+# ==============================================================================
+
+REGULASI = {}
+
+
+def install_regulation(name, pesangon, pension_lump_sum):
+    """Memasang satu versi regulasi: `(batas_bawah, tarif)` atau `BracketTable` per jenis penghasilan."""
+    tabel = {}
+    for jenis, isi in (("pesangon", pesangon), ("pension_lump_sum", pension_lump_sum)):
+        tabel[jenis] = isi if isinstance(isi, BracketTable) else BracketTable(*isi, name=f"{name} {jenis}")
+    REGULASI[name] = tabel
+    return tabel
+
+
+def bracket_table(kind, regulation=REGULASI_BAWAAN):
+    """`BracketTable` untuk satu jenis penghasilan pada satu regulasi."""
+    if regulation not in REGULASI:
+        raise KeyError(f"Regulasi '{regulation}' tidak dikenal. Pilihan: {', '.join(REGULASI)}")
+    if kind not in JENIS_PENGHASILAN:
+        raise KeyError(f"Jenis penghasilan '{kind}' tidak dikenal. Pilihan: {', '.join(JENIS_PENGHASILAN)}")
+    return REGULASI[regulation][kind]
+
+
+install_regulation(
+    "pp68_2009",
+    pesangon=([0, 50e6, 100e6, 500e6], [0.0, 0.05, 0.15, 0.25]),
+    pension_lump_sum=([0, 50e6], [0.0, 0.05]),
+)
+
+
+# ==============================================================================
+# PAJAK MANFAAT
+# ==============================================================================
+
+def lump_sum_tax(amounts, kind="pesangon", regulation=REGULASI_BAWAAN, npwp=True):
+    """
+    PPh 21 final atas array manfaat sekaligus dalam satu panggilan.
+
+    `npwp` boleh array boolean; penerima tanpa NPWP dikenai tambahan 20%.
+    """
+    pajak = bracket_table(kind, regulation).tax(amounts)
+    if np.all(npwp):
+        return pajak
+    hasil = pajak * np.where(npwp, 1.0, 1 + TAMBAHAN_TANPA_NPWP)
+    return hasil if hasil.ndim else float(hasil)
+
+
+def benefit_taxes(jht, pesangon, regulation=REGULASI_BAWAAN, npwp=True):
+    """
+    Pajak JHT (tarif uang pensiun sekaligus) dan pesangon per peserta.
+
+    Returns:
+        dict: tax_jht, tax_pesangon, tax (total)
+    """
+    pajak_jht = lump_sum_tax(jht, "pension_lump_sum", regulation, npwp)
+    pajak_pesangon = lump_sum_tax(pesangon, "pesangon", regulation, npwp)
+    return {"tax_jht": pajak_jht, "tax_pesangon": pajak_pesangon, "tax": pajak_jht + pajak_pesangon}
+
+
+# ==============================================================================
+# DEMO: TARIF PP 68/2009 & IURAN DPLK NETO
+# ==============================================================================
+if __name__ == "__main__":
+    import time
+
+    from pensiun.dplk import dplk_contribution
+
+    pesangon = bracket_table("pesangon")
+    print(pesangon)
+    print(bracket_table("pension_lump_sum"))
+    print(f"\n{'Bruto':>16} | {'PPh pesangon':>14} | {'Efektif':>7} | {'PPh pensiun':>13}")
+    for x in (40e6, 50e6, 80e6, 100e6, 300e6, 500e6, 1e9):
+        print(f"Rp {x:>13,.0f} | Rp {pesangon.tax(x):>11,.0f} | {pesangon.effective_rate(x):>7.2%} | "
+              f"Rp {lump_sum_tax(x, 'pension_lump_sum'):>10,.0f}")
+    # Cek manual 300 jt: 5% x 50 jt + 15% x 200 jt = 32.5 jt
+    assert np.isclose(pesangon.tax(300e6), 32.5e6)
+
+    print("\nIuran DPLK bruto vs neto pajak (gaji awal Rp 8 jt, usia 40 -> 55):")
+    bruto = dplk_contribution(8_000_000, 40, 55)
+    neto = dplk_contribution(8_000_000, 40, 55, tax_regulation="pp68_2009")
+    for kunci in ("jht", "pesangon", "tax", "total_fund", "gap", "dplk_contribution"):
+        print(f"  {kunci:<18}: Rp {bruto[kunci]:>14,.0f} -> Rp {neto[kunci]:>14,.0f}")
+
+    N = 1_000_000
+    rng = np.random.default_rng(50)
+    gaji = rng.lognormal(np.log(8e6), 0.6, N)
+    usia = rng.integers(25, 50, N)
+    mulai = time.perf_counter()
+    dplk_contribution(gaji, usia, 55)
+    t_bruto = time.perf_counter() - mulai
+    mulai = time.perf_counter()
+    hasil = dplk_contribution(gaji, usia, 55, tax_regulation="pp68_2009", npwp=rng.random(N) < 0.9)
+    t_neto = time.perf_counter() - mulai
+    print(f"\n{N:,} peserta: bruto {t_bruto * 1e3:.0f} ms | neto pajak {t_neto * 1e3:.0f} ms | "
+          f"total PPh Rp {hasil['tax'].sum() / 1e9:,.1f} M")
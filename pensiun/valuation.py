@@ -0,0 +1,316 @@
+"""
+Valuasi Aset vs Liabilitas Program Jaminan Pensiun (Slide 17).
+
+Versi tervektorisasi dari mesin di `cek-balance/src/`:
+  - `PensionValidator.simulate_jp_deficit`  -> `simulate_jp_deficit`
+  - `calculate_actuarial_balance` (equilibrium_simulator.py) -> `actuarial_balance`
+  - `PolicySolver.calculate_balance` -> `policy_balance`
+
+`asset_projection` menggantikan list dict per tahun di `calculate_projection`
+(app.py) dan `run_visualization` dengan satu structured array
+(`pensiun.records.PROJECTION_DTYPE`).
+
+Versi `*_paths` memakai jalur gaji/return dari `pensiun.esg.ScenarioSet`.
+
+Semua parameter boleh berupa array sehingga satu panggilan menghitung banyak
+peserta atau banyak skenario asumsi sekaligus. Modul ini tidak membutuhkan
+Streamlit/Plotly, sehingga bisa dipakai dari CLI maupun skrip batch.
+"""
+
+import numpy as np
+
+from pensiun.annuity import last_survivor_annuity, reversionary_annuity
+from pensiun.finmath import growing_annuity_fv
+from pensiun.salary import SalaryScale
+
+# ==============================================================================
+# PARAMETER FORENSIK SLIDE 17
+# ==============================================================================
+CONTRIBUTION_RATE = 0.03   # 3% (1% Pekerja + 2% Pemberi Kerja)
+ACCRUAL_RATE = 0.01        # 1% x Masa Iur x Rata-rata Upah
+IMPLIED_ANNUITY_FACTOR = 14.32  # Kalibrasi hasil reverse engineer
+
+
+def _as_output(hasil):
+    """Array 0-dimensi dikembalikan sebagai float biasa (input skalar -> output skalar)."""
+    return {k: float(v) if np.ndim(v) == 0 else v for k, v in hasil.items()}
+
+
+# ==============================================================================
+# SISI ASET & BASIS MANFAAT
+# ==============================================================================
+
+def accumulated_asset(start_wage, years, salary_increase_rate, invest_return_rate,
+                      contribution_rate=CONTRIBUTION_RATE):
+    """Akumulasi iuran (FV) di akhir masa kerja."""
+    iuran_awal = np.asarray(start_wage, dtype=float) * 12 * np.asarray(contribution_rate)
+    return iuran_awal * growing_annuity_fv(salary_increase_rate, invest_return_rate, years)
+
+
+def average_wage(start_wage, years, salary_increase_rate):
+    """Rata-rata upah nominal selama masa kerja (deret geometri)."""
+    w, s, n = np.broadcast_arrays(
+        np.asarray(start_wage, dtype=float), np.asarray(salary_increase_rate, dtype=float),
+        np.asarray(years, dtype=float),
+    )
+    nol = np.isclose(s, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total = np.where(nol, w * n, w * ((1 + s) ** n - 1) / np.where(nol, 1.0, s))
+    hasil = total / n
+    return hasil if hasil.ndim else float(hasil)
+
+
+def asset_projection(start_wage, years, salary_increase_rate, invest_return_rate,
+                     contribution_rate=CONTRIBUTION_RATE):
+    """
+    Proyeksi per tahun (gaji bulanan, iuran tahunan, akumulasi aset) satu peserta.
+
+    Sama dengan rekursi `aset = (aset + iuran) * (1 + i)` di app.py, dihitung
+    dengan cumprod/cumsum ke structured array `PROJECTION_DTYPE`.
+    """
+    from pensiun.records import PROJECTION_DTYPE
+
+    t = np.arange(1, int(years) + 1)
+    tumbuh = (1 + invest_return_rate) ** t
+    proyeksi = np.empty(t.size, dtype=PROJECTION_DTYPE)
+    proyeksi["year"] = t
+    proyeksi["wage"] = start_wage * (1 + salary_increase_rate) ** (t - 1)
+    proyeksi["contribution"] = proyeksi["wage"] * 12 * contribution_rate
+    proyeksi["asset"] = tumbuh * np.cumsum(proyeksi["contribution"] / tumbuh * (1 + invest_return_rate))
+    return proyeksi
+
+
+# ==============================================================================
+# VALUASI
+# ==============================================================================
+
+def simulate_jp_deficit(start_wage, years_of_service, salary_increase_rate, invest_return_rate,
+                        discount_rate, benefit_indexation=0.0, retirement_age=56, spouse_age_diff=3,
+                        table="tmi_4", contribution_rate=CONTRIBUTION_RATE, accrual_rate=ACCRUAL_RATE,
+                        service=None):
+    """
+    Simulasi Aset vs Liabilitas (Joint Life Last Survivor) untuk banyak skenario.
+
+    Hasil identik dengan `PensionValidator.simulate_jp_deficit` tetapi
+    dikembalikan sebagai dict array mentah (belum diformat). `discount_rate`
+    boleh berupa `pensiun.curve.YieldCurve` untuk diskonto per tenor.
+
+    `service` (`pensiun.decrement.ServiceTable`) memasukkan decrement sebelum
+    pensiun: peserta yang keluar (meninggal, mengundurkan diri, cacat) dibayar
+    sekaligus sebesar iuran + hasil pengembangan (aturan JP untuk masa iur di
+    bawah 15 tahun, dipakai juga untuk masa iur lebih panjang), sehingga aset
+    dan liabilitas sama-sama dibobot peluang mencapai pensiun dan nilai
+    pembayaran itu dilaporkan sebagai `exit_benefit`. Tanpa `service` peserta
+    dianggap bertahan penuh seperti semula.
+    `salary_increase_rate` boleh berupa `pensiun.salary.SalaryScale`. Usia
+    masuk untuk keduanya = usia pensiun - masa kerja. `retirement_age` harus
+    sama dengan usia pensiun tabel layanan (ValueError bila tidak).
+    """
+    if service is not None and np.any(np.asarray(retirement_age) != service.retirement_age):
+        raise ValueError(f"Usia pensiun {retirement_age} tidak sama dengan usia pensiun tabel layanan "
+                         f"({service.retirement_age}).")
+    usia_masuk = np.asarray(retirement_age) - np.asarray(years_of_service)
+    iuran_awal = np.asarray(start_wage, dtype=float) * 12 * np.asarray(contribution_rate)
+    skala = isinstance(salary_increase_rate, SalaryScale)
+    if skala:
+        aset = iuran_awal * salary_increase_rate.accumulation_factor(usia_masuk, years_of_service,
+                                                                     invest_return_rate)
+        rata_gaji = salary_increase_rate.average_wage(start_wage, usia_masuk, years_of_service)
+    else:
+        aset = accumulated_asset(start_wage, years_of_service, salary_increase_rate, invest_return_rate,
+                                 contribution_rate)
+        rata_gaji = average_wage(start_wage, years_of_service, salary_increase_rate)
+    hasil = _neraca_jp(aset, rata_gaji, years_of_service, discount_rate, benefit_indexation, retirement_age,
+                       spouse_age_diff, table, accrual_rate)
+    if service is None:
+        return hasil
+    # Iuran bruto harapan (semua yang masih dalam layanan) dikurangi dana yang dibayarkan kembali
+    # ke peserta keluar = dana milik peserta yang mencapai pensiun
+    bruto = iuran_awal * service.accumulation_factor(usia_masuk, years_of_service, salary_increase_rate,
+                                                     invest_return_rate)
+    bertahan = service.in_service(usia_masuk, retirement_age)
+    return _timbang_layanan(hasil, bertahan, bruto)
+
+
+def simulate_jp_deficit_paths(scenarios, start_wage, years_of_service, discount_rate, benefit_indexation=0.0,
+                              retirement_age=56, spouse_age_diff=3, table="tmi_4",
+                              contribution_rate=CONTRIBUTION_RATE, accrual_rate=ACCRUAL_RATE):
+    """
+    `simulate_jp_deficit` dengan jalur kenaikan gaji & return dari `pensiun.esg.ScenarioSet`.
+
+    Hasil ter-broadcast dengan sumbu skenario (satu nilai per skenario).
+    """
+    aset = (np.asarray(start_wage, dtype=float) * 12 * np.asarray(contribution_rate)
+            * scenarios.accumulation_factor(years_of_service))
+    rata_gaji = scenarios.average_wage(start_wage, years_of_service)
+    return _neraca_jp(aset, rata_gaji, years_of_service, discount_rate, benefit_indexation, retirement_age,
+                      spouse_age_diff, table, accrual_rate)
+
+
+def _neraca_jp(aset, rata_gaji, years_of_service, discount_rate, benefit_indexation, retirement_age,
+               spouse_age_diff, table, accrual_rate):
+    manfaat_bulanan = accrual_rate * np.asarray(years_of_service) * rata_gaji
+
+    faktor_anuitas = last_survivor_annuity(
+        retirement_age,
+        np.asarray(retirement_age) - np.asarray(spouse_age_diff),
+        discount_rate,
+        benefit_indexation,
+        table=table,
+    )
+    liabilitas = manfaat_bulanan * 12 * faktor_anuitas
+    with np.errstate(divide="ignore", invalid="ignore"):
+        funding_ratio = np.where(liabilitas != 0, aset / liabilitas * 100, 0.0)
+
+    return _as_output({
+        "avg_wage": rata_gaji,
+        "monthly_benefit": manfaat_bulanan,
+        "annuity_factor": faktor_anuitas,
+        "asset": aset,
+        "liability": liabilitas,
+        "gap": aset - liabilitas,
+        "funding_ratio": funding_ratio,
+    })
+
+
+def _timbang_layanan(hasil, bertahan, iuran_bruto):
+    """
+    Aset & liabilitas harapan per peserta baru dengan decrement sebelum pensiun.
+
+    Peserta yang keluar menerima kembali iuran beserta hasil pengembangannya,
+    sehingga aset = dana penuh x peluang mencapai pensiun dan liabilitas =
+    liabilitas saat pensiun x peluang yang sama. `exit_benefit` adalah nilai
+    manfaat keluar itu pada usia pensiun (iuran bruto harapan - aset).
+    """
+    liabilitas = np.asarray(hasil["liability"] * bertahan, dtype=float)
+    aset = np.asarray(hasil["asset"] * bertahan, dtype=float)
+    aset, liabilitas = np.broadcast_arrays(aset, liabilitas)
+    funding_ratio = np.divide(aset * 100, liabilitas, out=np.zeros(aset.shape), where=liabilitas != 0)
+    return _as_output({**hasil, "asset": aset, "liability": liabilitas, "gap": aset - liabilitas,
+                       "funding_ratio": funding_ratio, "exit_benefit": iuran_bruto - aset})
+
+
+def reversionary_liability(start_wage, years, salary_increase_rate, discount_rate, indexation=0.0,
+                           survivor_pct=0.5, retirement_age=56, spouse_age_diff=5, table="tmi_4",
+                           accrual_rate=ACCRUAL_RATE):
+    """
+    Liabilitas dengan anuitas reversioner (rumus `PensionReverseEngineer.calculate_liability`).
+    """
+    rata_gaji = average_wage(start_wage, years, salary_increase_rate)
+    manfaat_tahunan = accrual_rate * np.asarray(years) * rata_gaji * 12
+    faktor = reversionary_annuity(
+        retirement_age,
+        np.asarray(retirement_age) - np.asarray(spouse_age_diff),
+        discount_rate,
+        survivor_pct,
+        indexation,
+        table=table,
+    )
+    return manfaat_tahunan * faktor
+
+
+def actuarial_balance(contribution_rate, accrual_rate, start_wage=2_500_000, years=32,
+                      salary_increase_rate=0.0787, invest_return_rate=0.0653,
+                      annuity_factor=IMPLIED_ANNUITY_FACTOR):
+    """
+    Neraca aktuaria equilibrium_simulator.py: aset, liabilitas dan iuran wajar.
+
+    Returns:
+        dict: asset, liability, gap, funding_ratio (%), required_contribution (%)
+    """
+    aset_1pct = accumulated_asset(start_wage, years, salary_increase_rate, invest_return_rate, 0.01)
+    rata_gaji = average_wage(start_wage, years, salary_increase_rate)
+    return _neraca_aktuaria(aset_1pct, rata_gaji, contribution_rate, accrual_rate, years, annuity_factor)
+
+
+def actuarial_balance_paths(scenarios, contribution_rate, accrual_rate, start_wage=2_500_000, years=32,
+                            annuity_factor=IMPLIED_ANNUITY_FACTOR):
+    """`actuarial_balance` dengan jalur gaji & return dari `pensiun.esg.ScenarioSet`."""
+    aset_1pct = np.asarray(start_wage, dtype=float) * 12 * 0.01 * scenarios.accumulation_factor(years)
+    rata_gaji = scenarios.average_wage(start_wage, years)
+    return _neraca_aktuaria(aset_1pct, rata_gaji, contribution_rate, accrual_rate, years, annuity_factor)
+
+
+def _neraca_aktuaria(aset_1pct, rata_gaji, contribution_rate, accrual_rate, years, annuity_factor):
+    # Aset sebanding dengan tingkat iuran: aset = aset iuran 1% x (iuran / 1%)
+    aset = aset_1pct * np.asarray(contribution_rate) / 0.01
+    liabilitas = np.asarray(accrual_rate) * years * rata_gaji * 12 * annuity_factor
+    with np.errstate(divide="ignore", invalid="ignore"):
+        funding_ratio = np.where(liabilitas > 0, aset / liabilitas * 100, 0.0)
+        iuran_wajar = np.where(aset_1pct > 0, liabilitas / aset_1pct, 0.0)
+    return _as_output({
+        "asset": aset,
+        "liability": liabilitas,
+        "gap": aset - liabilitas,
+        "funding_ratio": funding_ratio,
+        "required_contribution": iuran_wajar,
+    })
+
+
+def policy_balance(invest_return_rate, contribution_rate=0.09, accrual_rate=0.015, start_wage=2_500_000,
+                   years=32, salary_increase_rate=0.0787, annuity_factor=IMPLIED_ANNUITY_FACTOR):
+    """Aset - Liabilitas untuk usulan Slide 22 (`PolicySolver.calculate_balance`)."""
+    hasil = actuarial_balance(contribution_rate, accrual_rate, start_wage, years, salary_increase_rate,
+                              invest_return_rate, annuity_factor)
+    return hasil["gap"]
+
+
+# ==============================================================================
+# SOLVER ASUMSI IMPLISIT (BANYAK SKENARIO SEKALIGUS)
+# ==============================================================================
+
+def implied_assumptions(target_asset, target_liability, start_wage=2_500_000, years=32,
+                        discount_rate=0.057, survivor_pct=0.5, indexation=0.0, retirement_age=56,
+                        spouse_age_diff=5, table="tmi_4", salary_bounds=(0.0, 0.15),
+                        return_bounds=(0.0, 0.20)):
+    """
+    Versi batch `PensionReverseEngineer.solve_assumptions`.
+
+    Fase 1 mencari kenaikan gaji agar liabilitas reversioner = target, fase 2
+    mencari return investasi agar aset = target. Faktor anuitas tidak
+    bergantung pada kenaikan gaji sehingga dihitung sekali di luar iterasi.
+    Skenario tanpa akar di dalam bracket bernilai NaN.
+
+    Returns:
+        dict: salary_inc, invest_ret, spread
+    """
+    from pensiun.roots import bisect
+
+    faktor = reversionary_annuity(
+        retirement_age, np.asarray(retirement_age) - np.asarray(spouse_age_diff), discount_rate,
+        survivor_pct, indexation, table=table,
+    )
+    target_asset, target_liability = np.broadcast_arrays(
+        np.asarray(target_asset, dtype=float), np.asarray(target_liability, dtype=float)
+    )
+
+    def liab_error(s_inc):
+        rata_gaji = average_wage(start_wage, years, s_inc)
+        return ACCRUAL_RATE * years * rata_gaji * 12 * faktor - target_liability
+
+    s_inc = bisect(liab_error, np.full(target_liability.shape, salary_bounds[0]), salary_bounds[1])
+
+    def asset_error(i_ret):
+        return accumulated_asset(start_wage, years, s_inc, i_ret) - target_asset
+
+    i_ret = bisect(asset_error, np.full(target_asset.shape, return_bounds[0]), return_bounds[1])
+    return _as_output({"salary_inc": s_inc, "invest_ret": i_ret, "spread": np.asarray(i_ret) - s_inc})
+
+
+def implied_return(contribution_rate=0.09, accrual_rate=0.015, start_wage=2_500_000, years=32,
+                   salary_increase_rate=0.0787, annuity_factor=IMPLIED_ANNUITY_FACTOR, bounds=(0.06, 0.10)):
+    """
+    Versi batch `PolicySolver.solve_required_return`: return investasi agar
+    aset = liabilitas untuk setiap kombinasi iuran/accrual. NaN jika tidak ada
+    solusi di dalam `bounds`.
+    """
+    from pensiun.roots import bisect
+
+    bentuk = np.broadcast(np.asarray(contribution_rate), np.asarray(accrual_rate),
+                          np.asarray(salary_increase_rate)).shape
+
+    def selisih(i_rate):
+        return policy_balance(i_rate, contribution_rate, accrual_rate, start_wage, years,
+                              salary_increase_rate, annuity_factor)
+
+    return bisect(selisih, np.full(bentuk, bounds[0]), bounds[1])